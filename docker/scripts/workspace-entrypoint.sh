@@ -8,54 +8,145 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
-echo "Creating non-root container '${USERNAME}' for host user uid=${HOST_USER_UID}:gid=${HOST_USER_GID}"
+# Files shared with the CLI. Not in /tmp, which is shared with the host and every other dev
+# container on aarch64.
+ISAAC_ROS_RUNTIME_DIR=/run/isaac-ros-cli
+# Start and end of every step, in seconds of the monotonic /proc/uptime clock, as lines of
+# "<start> <end> <step>". Read by 'isaac-ros status --timings'.
+ENTRYPOINT_PROFILE_FILE=${ISAAC_ROS_RUNTIME_DIR}/entrypoint_profile
+# Created by the background container of 'isaac-ros exec' once this entrypoint is done
+EXEC_READY_FILE=${ISAAC_ROS_RUNTIME_DIR}/exec_ready
+# Written once the user is set up, so that restarting the container skips the setup
+USER_SETUP_MARKER_FILE=/etc/isaac-ros-cli/.entrypoint_user_setup
+# Entrypoint additions containing this line do not depend on the environment of the others and
+# run in parallel with them
+INDEPENDENT_ADDITION_MARKER="# isaac-ros-entrypoint: independent"
 
-if [ ! $(getent group ${HOST_USER_GID}) ]; then
-  groupadd --gid ${HOST_USER_GID} ${USERNAME} &>/dev/null
-else
-  CONFLICTING_GROUP_NAME=`getent group ${HOST_USER_GID} | cut -d: -f1`
-  groupmod -o --gid ${HOST_USER_GID} -n ${USERNAME} ${CONFLICTING_GROUP_NAME}
-fi
+read -r ENTRYPOINT_START _ < /proc/uptime
+mkdir -p ${ISAAC_ROS_RUNTIME_DIR}
+# Left behind when the container is restarted
+rm -f ${EXEC_READY_FILE}
+: > ${ENTRYPOINT_PROFILE_FILE}
+chmod 0644 ${ENTRYPOINT_PROFILE_FILE}
 
-if [ ! $(getent passwd ${HOST_USER_UID}) ]; then
-  useradd --no-log-init --uid ${HOST_USER_UID} --gid ${HOST_USER_GID} -m ${USERNAME} &>/dev/null
-else
-  CONFLICTING_USER_NAME=`getent passwd ${HOST_USER_UID} | cut -d: -f1`
-  usermod -l ${USERNAME} -u ${HOST_USER_UID} -m -d /home/${USERNAME} ${CONFLICTING_USER_NAME} &>/dev/null
-  mkdir -p /home/${USERNAME}
-  # Add default user bash files (ensures shell works properly and autocompletes)
-  cp /etc/skel/.[^.]* /home/${USERNAME}/
-  chown ${USERNAME}:${USERNAME} /home/${USERNAME}/.bashrc /home/${USERNAME}/.profile \
-    /home/${USERNAME}/.bash_logout
-  # Wipe files that may create issues for users with large uid numbers.
-  rm -f /var/log/lastlog /var/log/faillog
-fi
+# Record a named step that started at the given uptime and ends now
+function record_step {
+  local _step_end _
+  read -r _step_end _ < /proc/uptime
+  echo "$2 ${_step_end} $1" >> ${ENTRYPOINT_PROFILE_FILE}
+}
+
+# Run a command as a named step, recording its start and end time. The locals are prefixed so
+# that sourced additions do not shadow them.
+function run_step {
+  local _step_name="$1" _step_start _step_status _
+  shift
+  read -r _step_start _ < /proc/uptime
+  "$@"
+  _step_status=$?
+  record_step "${_step_name}" ${_step_start}
+  return ${_step_status}
+}
+
+function setup_group {
+  if [ ! $(getent group ${HOST_USER_GID}) ]; then
+    groupadd --gid ${HOST_USER_GID} ${USERNAME} &>/dev/null
+  else
+    CONFLICTING_GROUP_NAME=`getent group ${HOST_USER_GID} | cut -d: -f1`
+    groupmod -o --gid ${HOST_USER_GID} -n ${USERNAME} ${CONFLICTING_GROUP_NAME}
+  fi
+}
+
+function setup_user {
+  if [ ! $(getent passwd ${HOST_USER_UID}) ]; then
+    useradd --no-log-init --uid ${HOST_USER_UID} --gid ${HOST_USER_GID} -m ${USERNAME} &>/dev/null
+  else
+    CONFLICTING_USER_NAME=`getent passwd ${HOST_USER_UID} | cut -d: -f1`
+    usermod -l ${USERNAME} -u ${HOST_USER_UID} -m -d /home/${USERNAME} ${CONFLICTING_USER_NAME} &>/dev/null
+    mkdir -p /home/${USERNAME}
+    # Add default user bash files (ensures shell works properly and autocompletes)
+    cp /etc/skel/.[^.]* /home/${USERNAME}/
+    chown ${USERNAME}:${USERNAME} /home/${USERNAME}/.bashrc /home/${USERNAME}/.profile \
+      /home/${USERNAME}/.bash_logout
+    # Wipe files that may create issues for users with large uid numbers.
+    rm -f /var/log/lastlog /var/log/faillog
+  fi
+}
 
 # Update 'admin' user
-chown ${USERNAME}:${USERNAME} /home/${USERNAME}
-echo ${USERNAME} ALL=\(root\) NOPASSWD:ALL > /etc/sudoers.d/${USERNAME}
-chmod 0440 /etc/sudoers.d/${USERNAME}
-adduser ${USERNAME} video >/dev/null
-adduser ${USERNAME} plugdev >/dev/null
-adduser ${USERNAME} sudo  >/dev/null
+function setup_admin {
+  chown ${USERNAME}:${USERNAME} /home/${USERNAME}
+  echo ${USERNAME} ALL=\(root\) NOPASSWD:ALL > /etc/sudoers.d/${USERNAME}
+  chmod 0440 /etc/sudoers.d/${USERNAME}
+  adduser ${USERNAME} video >/dev/null
+  adduser ${USERNAME} plugdev >/dev/null
+  adduser ${USERNAME} sudo  >/dev/null
+}
 
 # If jtop present, give the user access
-if [ -S /run/jtop.sock ]; then
+function setup_jtop {
   JETSON_STATS_GID="$(stat -c %g /run/jtop.sock)"
   addgroup --gid ${JETSON_STATS_GID} jtop >/dev/null
   adduser ${USERNAME} jtop >/dev/null
+}
+
+USER_SETUP="${USERNAME}:${HOST_USER_UID}:${HOST_USER_GID}"
+if [ -f ${USER_SETUP_MARKER_FILE} ] && [ "$(cat ${USER_SETUP_MARKER_FILE})" == "${USER_SETUP}" ] \
+    && [ "$(id -u ${USERNAME} 2>/dev/null)" == "${HOST_USER_UID}" ] && [ -d /home/${USERNAME} ]; then
+  echo "Using existing non-root container user '${USERNAME}' uid=${HOST_USER_UID}:gid=${HOST_USER_GID}"
+else
+  echo "Creating non-root container '${USERNAME}' for host user uid=${HOST_USER_UID}:gid=${HOST_USER_GID}"
+  run_step group setup_group
+  run_step user setup_user
+  run_step admin setup_admin
+  mkdir -p $(dirname ${USER_SETUP_MARKER_FILE})
+  echo "${USER_SETUP}" > ${USER_SETUP_MARKER_FILE}
+fi
+# The ready file is created as the user
+chown ${USERNAME} ${ISAAC_ROS_RUNTIME_DIR}
+
+# Set when building an image with the user already set up, see run_dev's --user-layer
+if [ -n "${ISAAC_ROS_ENTRYPOINT_USER_SETUP_ONLY}" ]; then
+  rm -f ${ENTRYPOINT_PROFILE_FILE}
+  exit 0
+fi
+
+if [ -S /run/jtop.sock ]; then
+  run_step jtop setup_jtop
 fi
 
 # Run all entrypoint additions
 shopt -s nullglob
+INDEPENDENT_PIDS=()
 for addition in /usr/local/bin/scripts/entrypoint_additions/*.sh; do
-  if [[ "${addition}" =~ ".user." ]]; then
+  name=$(basename ${addition})
+  if grep -qxF "${INDEPENDENT_ADDITION_MARKER}" ${addition}; then
+    if [[ "${addition}" =~ ".user." ]]; then
+      echo "Running independent entrypoint extension: ${addition} as user ${USERNAME}"
+      run_step "addition ${name}" gosu ${USERNAME} ${addition} &
+    else
+      echo "Running independent entrypoint extension: ${addition}"
+      run_step "addition ${name}" bash ${addition} &
+    fi
+    INDEPENDENT_PIDS+=($!)
+  elif [[ "${addition}" =~ ".user." ]]; then
     echo "Running entryrypoint extension: ${addition} as user ${USERNAME}"
-    gosu ${USERNAME} ${addition}
+    run_step "addition ${name}" gosu ${USERNAME} ${addition}
   else
     echo "Sourcing entryrypoint extension: ${addition}"
+    # Sourced at the top level, inside a function its declare statements would be local. The
+    # step name is saved first, the addition may overwrite the loop variables.
+    _sourced_step_name="addition ${name}"
+    read -r _sourced_step_start _ < /proc/uptime
     source ${addition}
+    record_step "${_sourced_step_name}" ${_sourced_step_start}
   fi
 done
+if [ ${#INDEPENDENT_PIDS[@]} -gt 0 ]; then
+  wait ${INDEPENDENT_PIDS[@]}
+fi
+
+read -r ENTRYPOINT_END _ < /proc/uptime
+echo "${ENTRYPOINT_START} ${ENTRYPOINT_END} entrypoint" >> ${ENTRYPOINT_PROFILE_FILE}
 
 exec gosu ${USERNAME} "$@"
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Stress the locked, atomic config writes with concurrent writer and reader processes.
+
+Writers add their own keys to a workspace config and flip the environment mode, readers parse
+the config file, the merged config cache and the environment mode file the whole time. Every
+update must be kept, no reader may see a partially written file, and the config file must keep
+its mode. Run with 'make check-config-concurrency'.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import stat
+import sys
+import tempfile
+
+from isaac_ros_cli import config_loader
+
+CONFIG_MODE = 0o640
+ENVIRONMENT_MODES = ("docker", "venv")
+
+
+def _setup(root: Path):
+    os.environ["HOME"] = str(root / "home")
+    os.environ["XDG_CACHE_HOME"] = str(root / "cache")
+    os.environ["ISAAC_ROS_WS"] = str(root / "ws")
+    config_loader.ENVIRONMENT_MODE_CONFIG_PATH = root / "etc" / "environment.conf"
+    config_loader._memoized_config = None
+    config_loader._memoized_environment_mode = None
+
+
+def _write(root: Path, writer: int, updates: int):
+    _setup(root)
+    for update in range(updates):
+        config_loader.update_config({"stress": {f"w{writer}_{update}": update}},
+                                    config_loader.ConfigScope.WORKSPACE)
+        config_loader.update_environment_mode(ENVIRONMENT_MODES[update % 2])
+
+
+def _read(root: Path, stop, errors):
+    import yaml
+
+    _setup(root)
+    config_path = config_loader._get_config_source_candidates()[
+        config_loader.ConfigScope.WORKSPACE]
+    cache_path = config_loader._get_config_cache_path()
+    reads = 0
+    while not stop.is_set():
+        try:
+            with config_path.open("r") as f:
+                if not isinstance(yaml.safe_load(f), dict):
+                    raise ValueError(f"{config_path} is not a mapping")
+            if cache_path.exists():
+                json.loads(cache_path.read_text())
+            config_loader._memoized_config = None
+            if "stress" not in config_loader.load_config():
+                raise ValueError("The merged config lost the stress keys")
+            config_loader._memoized_environment_mode = None
+            mode = config_loader.load_environment_mode()
+            if mode not in ENVIRONMENT_MODES:
+                raise ValueError(f"Read environment mode {mode!r}")
+            reads += 1
+        except Exception as e:
+            errors.put(f"{type(e).__name__}: {e}")
+            return
+    if not reads:
+        errors.put("A reader did not complete a single read")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--updates", type=int, default=20, help="Updates per writer")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        root = Path(tempdir)
+        _setup(root)
+        config_loader.ENVIRONMENT_MODE_CONFIG_PATH.parent.mkdir(parents=True)
+        config_loader.ENVIRONMENT_MODE_CONFIG_PATH.write_text(
+            f"ISAAC_ROS_ENVIRONMENT={ENVIRONMENT_MODES[0]}\n")
+        config_path = config_loader.update_config({"stress": {}},
+                                                  config_loader.ConfigScope.WORKSPACE)
+        os.chmod(config_path, CONFIG_MODE)
+
+        context = multiprocessing.get_context("fork")
+        stop = context.Event()
+        errors = context.Queue()
+        readers = [context.Process(target=_read, args=(root, stop, errors))
+                   for _ in range(args.readers)]
+        writers = [context.Process(target=_write, args=(root, writer, args.updates))
+                   for writer in range(args.writers)]
+        for process in readers + writers:
+            process.start()
+        for process in writers:
+            process.join()
+        stop.set()
+        for process in readers:
+            process.join()
+
+        problems = []
+        while not errors.empty():
+            problems.append(errors.get())
+        problems.extend(f"Writer {i} exited with {process.exitcode}"
+                        for i, process in enumerate(writers) if process.exitcode)
+
+        config_loader._memoized_config = None
+        kept = config_loader.load_config()["stress"]
+        expected = args.writers * args.updates
+        if len(kept) != expected:
+            problems.append(f"{len(kept)} of {expected} updates were kept")
+        mode = stat.S_IMODE(config_path.stat().st_mode)
+        if mode != CONFIG_MODE:
+            problems.append(f"{config_path} has mode {oct(mode)} instead of {oct(CONFIG_MODE)}")
+        leftovers = [path.name for path in config_path.parent.iterdir()
+                     if path.name.startswith(".")]
+        if leftovers:
+            problems.append(f"Temporary files were left behind: {', '.join(leftovers)}")
+
+    for problem in problems:
+        print(f"Error: {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+    print(f"{args.writers} writers and {args.readers} readers: all {expected} updates kept, "
+          "no partial reads")
+
+
+if __name__ == "__main__":
+    main()
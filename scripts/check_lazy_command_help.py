@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Check that the short help of the lazily loaded commands matches the commands themselves.
+
+'isaac-ros --help' lists the short help recorded next to each command's import path instead
+of importing the command. Run with 'make check-startup'.
+"""
+
+import sys
+
+from isaac_ros_cli.cli import cli
+
+# Long enough that click returns the whole first sentence instead of truncating it
+SHORT_HELP_LIMIT = 1000
+
+
+def main():
+    problems = []
+    for cmd_name, (import_path, short_help) in sorted(cli.lazy_subcommands.items()):
+        command = cli._load_command(cmd_name)
+        actual = command.get_short_help_str(SHORT_HELP_LIMIT)
+        if actual != short_help:
+            problems.append(f"{cmd_name} ({import_path}): short help is {short_help!r} but the "
+                            f"command's is {actual!r}")
+        if command.hidden:
+            problems.append(f"{cmd_name} ({import_path}) is hidden but listed by --help")
+
+    for problem in problems:
+        print(f"Error: {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+    print(f"Short help of {len(cli.lazy_subcommands)} lazily loaded commands is up to date")
+
+
+if __name__ == "__main__":
+    main()
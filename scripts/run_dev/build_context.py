@@ -0,0 +1,141 @@
+# Copyright (c) 2026, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Minimal build contexts holding only the files a Dockerfile references.
+
+Buildx uploads the whole context directory of a target before building it, which for the targets
+whose context is the parent of the docker directory means unrelated files on every build. Each
+target instead gets a staged context with the COPY and ADD sources of its Dockerfile.
+"""
+
+import functools
+import os
+from pathlib import Path
+import shutil
+from typing import Dict, List, Optional
+
+from dockerfile_cache_analyzer import parse_dockerfile
+
+# Files of the context docker reads itself rather than through an instruction
+CONTEXT_CONTROL_FILES = ['.dockerignore']
+
+
+def get_context_sources(dockerfile_path: Path) -> Optional[List[str]]:
+    """Return the context paths and globs a Dockerfile copies from.
+
+    Returns None if a source cannot be known without building, e.g. when it uses a variable or
+    a bind mount of the context, in which case the Dockerfile needs its full context.
+    """
+    sources = []
+    for instruction in parse_dockerfile(dockerfile_path):
+        flags = instruction.flags()
+        if instruction.keyword_ == 'RUN':
+            for flag in flags:
+                options = flag[len('--mount='):].split(',') if flag.startswith('--mount=') else []
+                if 'type=bind' not in options or any(
+                        option.startswith('from=') for option in options):
+                    continue
+                source = next((option.split('=', 1)[1] for option in options
+                               if option.startswith(('source=', 'src='))), '.')
+                sources.append(source)
+            continue
+        if not instruction.is_copy_from_context():
+            continue
+        for source in instruction.copy_sources():
+            # Heredocs are part of the Dockerfile and URLs are fetched by the builder
+            if source.startswith('<<') or '://' in source:
+                continue
+            sources.append(source)
+
+    normalized = []
+    for source in sources:
+        if '$' in source:
+            return None
+        source = os.path.normpath(source.lstrip('/')) if source.strip('/') else '.'
+        if source == '.' or source.startswith('..'):
+            return None
+        normalized.append(source)
+    return normalized
+
+
+def _link_or_copy(source: str, destination: str):
+    # Hard links are free when the staging directory shares the file system of the context
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def stage_build_context(context_dir: Path, sources: List[str], staging_dir: Path) -> Path:
+    """Populate staging_dir with the files of context_dir matching the sources."""
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    for pattern in sources + CONTEXT_CONTROL_FILES:
+        # Sources matching nothing are left to docker, which reports them as it would anyway
+        for path in sorted(context_dir.glob(pattern)):
+            destination = staging_dir / path.relative_to(context_dir)
+            if destination.exists():
+                continue
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            if path.is_dir():
+                shutil.copytree(path, destination, copy_function=_link_or_copy)
+            else:
+                _link_or_copy(str(path), str(destination))
+    return staging_dir
+
+
+@functools.lru_cache(maxsize=None)
+def get_directory_size(path: Path) -> int:
+    """Return the total size of the files under path, without following symlinks."""
+    size = 0
+    for directory, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                size += os.lstat(os.path.join(directory, filename)).st_size
+            except OSError:
+                pass
+    return size
+
+
+def format_size(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def minimize_build_contexts(bake_dict: Dict, staging_dir: Path, verbose: bool = False) -> None:
+    """Point each target of a bake configuration at a minimal context and report its size.
+
+    Targets whose Dockerfile needs the full context keep it. The size of the full contexts is
+    only measured when verbose, walking a large context costs more than the staging.
+    """
+    total_before = 0
+    total_after = 0
+    for target_name, target in bake_dict['targets'].items():
+        if 'context' not in target or 'dockerfile' not in target:
+            continue
+        context_dir = Path(target['context']).resolve()
+        size_before = get_directory_size(context_dir) if verbose else 0
+        sources = get_context_sources(Path(target['dockerfile']))
+        if sources is None:
+            size = f" ({format_size(size_before)})" if verbose else ""
+            print(f"Build context of {target_name}: {context_dir}{size}, kept in full")
+            total_before += size_before
+            total_after += size_before
+            continue
+        minimal_dir = stage_build_context(context_dir, sources, staging_dir / target_name)
+        size_after = get_directory_size(minimal_dir)
+        size = f" ({format_size(size_before)})" if verbose else ""
+        print(f"Build context of {target_name}: {context_dir}{size} -> "
+              f"{len(sources)} sources ({format_size(size_after)})")
+        target['context'] = str(minimal_dir)
+        total_before += size_before
+        total_after += size_after
+    if verbose:
+        print(f"Build contexts: {format_size(total_before)} -> {format_size(total_after)}")
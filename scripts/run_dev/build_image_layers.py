@@ -8,6 +8,7 @@
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
 import argparse
+import functools
 import hashlib
 import os
 import platform
@@ -22,6 +23,24 @@ from typing import Dict, List, Tuple
 import termcolor
 import yaml
 
+from build_context import minimize_build_contexts
+from dockerfile_cache_analyzer import analyze_dockerfiles, print_report
+from host_profile import DEFAULT_MEMORY_PER_JOB_MB, get_host_profile
+import trace_events
+
+# Registry holding the intermediate images of local builds, see start_local_registry()
+LOCAL_REGISTRY_CONTAINER_NAME = 'isaac_ros_build_registry'
+LOCAL_REGISTRY_IMAGE = 'registry:2'
+LOCAL_REGISTRY_PORT = 5000
+
+# Parallel compile jobs reach the Dockerfiles as a build secret, which unlike a build arg is not
+# part of the cache key, so layers stay shared between hosts and between builds on one host
+BUILD_JOBS_SECRET_ID = 'build_jobs'
+BUILD_JOBS_ENV_VAR = 'ISAAC_ROS_BUILD_JOBS'
+
+# Layer compressions of pushed images, gzip is the only one every registry accepts
+OUTPUT_COMPRESSIONS = ('gzip', 'zstd', 'estargz')
+
 
 # -----------------------------------------------------------------------------
 # Utility functions
@@ -206,6 +225,10 @@ class Config:
         self.common_config_file_ = None
         self.context_overrides_ = {}
         self.s3_cache_ = None
+        self.memory_per_job_mb_ = DEFAULT_MEMORY_PER_JOB_MB
+        self.minimal_context_ = True
+        self.local_registry_ = False
+        self.output_compression_ = {}
 
     def load_shell_common_config(self):
         """
@@ -305,6 +328,10 @@ class Config:
         )
         override_value('context_overrides')
         override_value('s3_cache')
+        override_value('memory_per_job_mb')
+        override_value('minimal_context')
+        override_value('local_registry')
+        override_value('output_compression')
 
         return True
 
@@ -340,8 +367,14 @@ class ImageBuildPlan:
         self.dockerfiles_ = dockerfiles
         self.image_key_ = image_key
         self.build_variables_ = {}
+        self.md5_hash_ = None
 
     def md5hash(self) -> str:
+        if not self.md5_hash_:
+            self.md5_hash_ = self._calculate_md5hash()
+        return self.md5_hash_
+
+    def _calculate_md5hash(self) -> str:
         tmp_file = "/tmp/dockerhash.tmp"
         subprocess.getoutput(f'rm -Rf {tmp_file}')
         subprocess.getoutput(f'touch {tmp_file}')
@@ -554,6 +587,7 @@ class ImageBuildPlan:
             write_target_attr('cache-from', lambda x: quoted_list(x))
             write_target_attr('cache-to', lambda x: quoted_list(x))
             write_target_attr('inherits', lambda x: quoted_list(x))
+            write_target_attr('secret', lambda x: quoted_list(x))
             if 'args' in target:
                 f.write('  args       = {\n')
                 items = list(target['args'].items())
@@ -623,10 +657,11 @@ def resolve_dockerfiles(
     return ImageBuildPlan(dockerfiles, image_key)
 
 
-def check_docker_image_exists(image):
+def check_docker_image_exists(image, insecure=False):
+    insecure_flag = '--insecure ' if insecure else ''
     try:
         run_shell(
-            f'docker manifest inspect {image}',
+            f'docker manifest inspect {insecure_flag}{image}',
             capture_output=True,
             check=True
         )
@@ -635,6 +670,116 @@ def check_docker_image_exists(image):
         return False
 
 
+def start_local_registry(port=LOCAL_REGISTRY_PORT) -> str:
+    """Start the local registry container if it is not running and return its name."""
+    success, stdout, _ = run_shell(
+        f"docker inspect --format '{{{{.State.Running}}}}' {LOCAL_REGISTRY_CONTAINER_NAME}"
+    )
+    if not success:
+        # Images are kept in a volume so that they survive restarts of the registry
+        run_shell(
+            f'docker run --detach --name {LOCAL_REGISTRY_CONTAINER_NAME} '
+            f'--publish 127.0.0.1:{port}:5000 '
+            f'--volume {LOCAL_REGISTRY_CONTAINER_NAME}:/var/lib/registry '
+            f'{LOCAL_REGISTRY_IMAGE}',
+            verbose=True,
+            check=True
+        )
+    elif stdout.strip() != 'true':
+        run_shell(f'docker start {LOCAL_REGISTRY_CONTAINER_NAME}', verbose=True, check=True)
+    return f'localhost:{port}'
+
+
+def get_local_registry_tag(registry_name, tag) -> str:
+    return f"{registry_name}/{tag.rsplit('/', 1)[-1]}"
+
+
+def make_available_in_local_registry(tag, registry_name) -> bool:
+    """
+    Return whether an image is in the local registry, pushing it there from the Docker daemon.
+
+    The builder of a local registry build cannot see the images of the Docker daemon.
+    """
+    local_tag = get_local_registry_tag(registry_name, tag)
+    if check_docker_image_exists(local_tag, insecure=True):
+        return True
+    in_daemon, _, _ = run_shell(f'docker image inspect {tag}')
+    if not in_daemon:
+        return False
+    run_shell(f'docker tag {tag} {local_tag}', check=True)
+    run_shell(f'docker push {local_tag}', verbose=True, check=True)
+    run_shell(f'docker rmi {local_tag}')
+    return True
+
+
+def route_through_local_registry(docker_bake_dict, build_target_names, registry_name,
+                                 target_image_name=None, local_tags=None) -> List[str]:
+    """
+    Tag the intermediate targets for the local registry instead of the Docker daemon.
+
+    Every built target but the one loaded at the end is pushed to the registry, and the targets
+    built on top of it take their BASE_IMAGE from there, as do the targets built on top of the
+    skipped ones already in the registry.
+
+    :param local_tags: Local registry tags of the skipped targets by their tags.
+    :return: Names of the targets to push to the local registry.
+    """
+    targets = docker_bake_dict['targets']
+    loaded_target_name = 'final_target' if target_image_name else build_target_names[-1]
+    pushed_target_names = [name for name in build_target_names if name != loaded_target_name]
+    local_tags = dict(local_tags or {})
+    for target_name in pushed_target_names:
+        tag = targets[target_name]['tags'][0]
+        local_tags[tag] = get_local_registry_tag(registry_name, tag)
+        targets[target_name]['tags'] = [local_tags[tag]]
+    for target in targets.values():
+        base_image = target.get('args', {}).get('BASE_IMAGE')
+        if base_image in local_tags:
+            target['args']['BASE_IMAGE'] = local_tags[base_image]
+        if 'dockerfile-inline' in target:
+            _, _, base_image = target['dockerfile-inline'].partition('FROM ')
+            if base_image in local_tags:
+                target['dockerfile-inline'] = f"FROM {local_tags[base_image]}"
+    return pushed_target_names
+
+
+def get_output_compression(tags: List[str], output_compression) -> Dict:
+    """
+    Return the compression settings of the registry the tags are pushed to.
+
+    Settings are looked up by the longest registry prefix of each tag, falling back to the
+    'default' entry. Tags pushed to registries with different settings use gzip.
+    """
+    output_compression = output_compression or {}
+    settings = []
+    for tag in tags:
+        prefixes = [prefix for prefix in output_compression
+                    if prefix != 'default' and tag.startswith(prefix)]
+        key = max(prefixes, key=len) if prefixes else 'default'
+        settings.append(output_compression.get(key) or {})
+    if not settings or any(setting != settings[0] for setting in settings):
+        return {}
+    return settings[0]
+
+
+def get_push_output_flag(target_name: str, compression_settings: Dict) -> str:
+    """Return the bake flag pushing a target with the given compression settings."""
+    compression = compression_settings.get('compression', 'gzip')
+    if compression not in OUTPUT_COMPRESSIONS:
+        print(f"Error: Unknown output compression {compression} for {target_name}, "
+              f"expected one of {', '.join(OUTPUT_COMPRESSIONS)}.")
+        sys.exit(1)
+    if compression == 'gzip' and 'level' not in compression_settings:
+        return '--push'
+    output = f'type=registry,compression={compression}'
+    if 'level' in compression_settings:
+        output += f",compression-level={compression_settings['level']}"
+    if compression != 'gzip':
+        # Layers pulled from the cache keep their compression unless it is forced
+        output += ',force-compression=true,oci-mediatypes=true'
+    return f'--set {target_name}.output={output}'
+
+
 def countdown_warning(message, seconds=5):
     """Display a countdown warning message with the option to cancel."""
     print(f"\n{message}")
@@ -649,6 +794,39 @@ def countdown_warning(message, seconds=5):
         sys.exit(1)
 
 
+@functools.lru_cache(maxsize=None)
+def _resolve_image_build_plan(env_key_set: Tuple[str, ...], isaac_ros_platform: str):
+    """Resolve the build plan for an environment key set, memoized per process."""
+    # Derive coarse architecture for Config (remote builder selection, etc.)
+    config = Config(
+        platform_="x86_64" if isaac_ros_platform == "amd64"
+        else "aarch64" if isaac_ros_platform.startswith("arm64")
+        else platform.uname().machine
+    )
+    config.load_shell_common_config()
+    image_key = ImageKey.from_key_set(env_key_set, key_order=config.image_key_order_)
+    build_plan = resolve_dockerfiles(
+        image_key,
+        config.docker_search_dirs_,
+        context_overrides=config.context_overrides_
+    )
+    return config, image_key, build_plan
+
+
+def get_build_plan_fingerprint(env_list, isaac_ros_platform):
+    """Get the content hash of the Dockerfiles making up an image.
+
+    Args:
+        env_list (List[str]): List of environment components
+        isaac_ros_platform (str): Isaac ROS platform identifier
+
+    Returns:
+        str: MD5 hash over the resolved Dockerfiles, or None if they could not be resolved
+    """
+    _, _, build_plan = _resolve_image_build_plan(tuple(env_list), isaac_ros_platform)
+    return build_plan.md5hash() if build_plan else None
+
+
 def get_image_name(cache_from_registry_name, env_list, isaac_ros_platform, include_hash=False):
     """Get the full image name for a given environment list and platform.
 
@@ -667,24 +845,13 @@ def get_image_name(cache_from_registry_name, env_list, isaac_ros_platform, inclu
     if os.getenv("CONFIG_CONTAINER_NAME_SUFFIX"):
         base_name += f"-{os.getenv('CONFIG_CONTAINER_NAME_SUFFIX')}"
 
-    # Derive coarse architecture for Config (remote builder selection, etc.)
-    config = Config(
-        platform_="x86_64" if isaac_ros_platform == "amd64"
-        else "aarch64" if isaac_ros_platform.startswith("arm64")
-        else platform.uname().machine
-    )
-    config.load_shell_common_config()
     # Create ImageBuildPlan to get the hash
-    image_key = ImageKey.from_key_set(env_list, key_order=config.image_key_order_)
-    build_plan = resolve_dockerfiles(
-        image_key,
-        config.docker_search_dirs_,
-        context_overrides=config.context_overrides_
-    )
+    config, image_key, build_plan = _resolve_image_build_plan(
+        tuple(env_list), isaac_ros_platform)
 
     if include_hash:
         if build_plan:
-            base_name += f"_{build_plan.md5hash()}"
+            base_name += f"_{get_build_plan_fingerprint(env_list, isaac_ros_platform)}"
         else:
             print("Error: Could not resolve all Dockerfiles.")
             print(f"Image key: {image_key}")
@@ -718,7 +885,9 @@ def main(image_key_set: List[str],
          build_local: bool = False,
          push: bool = False,
          use_kubernetes_driver: bool = False,
-         isaac_ros_platform: str = None):
+         isaac_ros_platform: str = None,
+         full_context: bool = False,
+         local_registry: bool = False):
 
     platform_ = platform_ if platform_ else platform.uname().machine
 
@@ -766,6 +935,17 @@ def main(image_key_set: List[str],
 
     print(f"cache_from_registry_name: {cache_from_registry_name}")
 
+    # Size source builds to this host when building locally. Remote builders keep the
+    # Dockerfile defaults since the local host says nothing about their capacity.
+    host_profile = None
+    # An explicit BUILD_JOBS build arg takes precedence over the host-derived one
+    build_jobs = config.build_args_.pop('BUILD_JOBS', None)
+    if build_local or not (use_kubernetes_driver or config.remote_builder_):
+        host_profile = get_host_profile()
+        print(f"Host profile: {host_profile}")
+        host_profile.warn_if_low_disk()
+        build_jobs = build_jobs or str(host_profile.build_jobs(config.memory_per_job_mb_))
+
     # Pass base_image, context_dir and extra build args (if any) to the bake dict generation.
     docker_bake_dict = build_plan.generate_bake_dict(
         config.platform_,
@@ -780,16 +960,33 @@ def main(image_key_set: List[str],
         use_kubernetes_driver=use_kubernetes_driver,
         isaac_ros_platform=isaac_ros_platform,
     )
+    if build_jobs:
+        for target in docker_bake_dict['targets'].values():
+            target['secret'] = [f'id={BUILD_JOBS_SECRET_ID},env={BUILD_JOBS_ENV_VAR}']
+
     docker_bake = ImageBuildPlan.as_hcl_str(docker_bake_dict)
     print(redact_bake_hcl(docker_bake))
 
+    # Keep intermediate images out of the Docker daemon, only the last image is loaded into it.
+    # Pushed builds never load images, so they are left as they are.
+    local_registry_name = None
+    if (local_registry or config.local_registry_) and not push:
+        local_registry_name = start_local_registry()
+
     build_target_names = []
+    skipped_local_tags = {}
     for target_name in build_plan.target_names():
         target = docker_bake_dict['targets'][target_name]
         tag = target['tags'][0]
-        if (not skip_registry_check) and (check_docker_image_exists(tag) and not no_cache):
-            print(f"Tag: {tag} exists, skipping")
-            continue
+        if not skip_registry_check and not no_cache:
+            # Intermediate images of earlier local registry builds are only in the registry
+            if local_registry_name and make_available_in_local_registry(tag, local_registry_name):
+                skipped_local_tags[tag] = get_local_registry_tag(local_registry_name, tag)
+                print(f"Tag: {skipped_local_tags[tag]} exists, skipping")
+                continue
+            if check_docker_image_exists(tag):
+                print(f"Tag: {tag} exists, skipping")
+                continue
         build_target_names.append(target_name)
 
     # Exit early if all tags exist and there's nothing to build
@@ -797,11 +994,27 @@ def main(image_key_set: List[str],
         print("All target images already exist. Nothing to build.")
         return
 
+    local_registry_target_names = []
+    if local_registry_name:
+        local_registry_target_names = route_through_local_registry(
+            docker_bake_dict, build_target_names, local_registry_name,
+            config.target_image_name_, skipped_local_tags
+        )
+        docker_bake = ImageBuildPlan.as_hcl_str(docker_bake_dict)
+        print(f"Pushing intermediate images to the local registry {local_registry_name}: "
+              f"{', '.join(local_registry_target_names) or 'none'}")
+
     with tempfile.TemporaryDirectory() as tempdir:
+        # Only upload the files each Dockerfile copies instead of its whole context directory
+        if config.minimal_context_ and not full_context:
+            minimize_build_contexts(docker_bake_dict, Path(tempdir) / 'contexts', verbose)
+            docker_bake = ImageBuildPlan.as_hcl_str(docker_bake_dict)
         bake_filepath = os.path.join(tempdir, 'docker-bake.hcl')
         with open(bake_filepath, mode='wt') as f:
             f.write(docker_bake)
         env_dict = {'BUILDX_BAKE_ENTITLEMENTS_FS': '0'}
+        if build_jobs:
+            env_dict[BUILD_JOBS_ENV_VAR] = build_jobs
 
         # Make builder name unique for parallel/repeated builds if using Kubernetes driver.
         # Otherwise buildx can fail with:
@@ -811,13 +1024,21 @@ def main(image_key_set: List[str],
             import string
             random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
             builder_name = f'isaaceks-{config.platform_}-{random_suffix}'
+        elif local_registry_name:
+            # Configured for the local registry, unlike the builder of the other local builds
+            builder_name = f'isaaceks-{config.platform_}-local'
         else:
             builder_name = f'isaaceks-{config.platform_}'
+        # Non-push builds load each target into the daemon for the next one to build FROM,
+        # which only the default builder sees. Builds through the local registry push to it
+        # from the builder it is reachable from instead.
+        bake_builder_name = builder_name if push or local_registry_name else 'default'
         no_cache_flag = '--no-cache' if no_cache else ''
         debug_flag = '--debug' if verbose else ''
 
         try:
-            if not build_local and use_kubernetes_driver:
+            # The builder of a local registry build has to run on this host
+            if not local_registry_name and not build_local and use_kubernetes_driver:
                 # Use Kubernetes driver - deploys BuildKit pods on-demand in cluster
                 print("Using Kubernetes driver (bypasses NLB, fixes EOF errors)")
                 k8s_arch = "amd64" if config.platform_ in ["x86_64", "amd64"] else "arm64"
@@ -839,7 +1060,7 @@ def main(image_key_set: List[str],
                     env=env_dict,
                     check=True
                 )
-            elif not build_local and config.remote_builder_:
+            elif not local_registry_name and not build_local and config.remote_builder_:
                 run_shell(
                     f'docker buildx create --driver remote --name {builder_name} '
                     f'{config.remote_builder_}',
@@ -852,13 +1073,39 @@ def main(image_key_set: List[str],
                         "Remote build specification not found in config file.",
                         seconds=5
                     )
-                run_shell(
-                    f'docker buildx create --name {builder_name}',
-                    verbose=True,
-                    env=env_dict
-                )
+                # The default builder is the daemon's own BuildKit, which takes no buildkitd.toml,
+                # so the host's max-parallelism only applies when the bake uses this builder
+                buildkitd_config = ''
+                if host_profile and bake_builder_name == builder_name:
+                    buildkitd_config = host_profile.buildkitd_config()
+                driver_opt_flag = ''
+                if local_registry_name:
+                    # The registry only listens on the loopback interface of this host
+                    buildkitd_config += f'[registry."{local_registry_name}"]\n  http = true\n'
+                    driver_opt_flag = '--driver-opt network=host '
+                buildkitd_config_flag = ''
+                if buildkitd_config:
+                    buildkitd_config_filepath = os.path.join(tempdir, 'buildkitd.toml')
+                    with open(buildkitd_config_filepath, mode='wt') as f:
+                        f.write(buildkitd_config)
+                    buildkitd_config_flag = f'--config {buildkitd_config_filepath} '
+                builder_exists = False
+                if local_registry_name:
+                    # Left behind by a build that did not get to remove it
+                    builder_exists, _, _ = run_shell(f'docker buildx inspect {builder_name}',
+                                                     env=env_dict)
+                if not builder_exists:
+                    run_shell(
+                        f'docker buildx create --name {builder_name} {driver_opt_flag}'
+                        f'{buildkitd_config_flag}',
+                        verbose=True,
+                        env=env_dict,
+                        # Without its options, pushes to the local registry fail in the builder
+                        check=bool(local_registry_name)
+                    )
 
             progress_flag = "--progress=plain"
+            builder_flag = f'--builder {bake_builder_name}'
 
             for target_name in build_target_names:
                 try:
@@ -872,15 +1119,25 @@ def main(image_key_set: List[str],
                     else:
                         platform_flag = ''
 
+                    if push:
+                        output_flag = get_push_output_flag(target_name, get_output_compression(
+                            docker_bake_dict['targets'][target_name]['tags'],
+                            config.output_compression_
+                        ))
+                    elif target_name in local_registry_target_names:
+                        output_flag = '--push'
+                    else:
+                        output_flag = '--load'
                     build_cmd = (
                         f'docker {debug_flag} buildx bake {target_name} '
                         f'{no_cache_flag} {progress_flag} {platform_flag} '
-                        f'--builder {builder_name if push else "default"} '
+                        f'{builder_flag} '
                         f'--provenance=false '
-                        f'{"--push" if push else "--load"} '
+                        f'{output_flag} '
                         f'--file {bake_filepath}'
                     )
-                    run_shell(build_cmd, capture_output=False, env=env_dict, check=True)
+                    with trace_events.span(target_name, "build_target"):
+                        run_shell(build_cmd, capture_output=False, env=env_dict, check=True)
                 except subprocess.CalledProcessError as e:
                     raise e
 
@@ -888,15 +1145,24 @@ def main(image_key_set: List[str],
                 try:
                     print(f"Building image {config.target_image_name_}")
 
+                    if push:
+                        output_flag = get_push_output_flag('final_target', get_output_compression(
+                            docker_bake_dict['targets']['final_target']['tags'],
+                            config.output_compression_
+                        ))
+                    else:
+                        output_flag = '--load'
                     final_cmd = (
                         f'docker {debug_flag} buildx bake final_target '
                         f'{no_cache_flag} {progress_flag} '
-                        f'--builder {builder_name if push else "default"} '
+                        f'{builder_flag} '
                         f'--provenance=false '
-                        f'{"--push" if push else "--load"} '
+                        f'{output_flag} '
                         f'--file {bake_filepath}'
                     )
-                    run_shell(final_cmd, capture_output=False, env=env_dict, check=True)
+                    with trace_events.span('final_target', "build_target",
+                                           image=config.target_image_name_):
+                        run_shell(final_cmd, capture_output=False, env=env_dict, check=True)
                 except subprocess.CalledProcessError as e:
                     raise e
 
@@ -1022,7 +1288,55 @@ if __name__ == "__main__":
              'Defaults to coarse file_arch for backward compatibility.'
     )
 
+    parser.add_argument(
+        '--full-context',
+        action="store_true",
+        dest="full_context",
+        help="Send the full context directory of each target instead of only the files its "
+             "Dockerfile copies.",
+        default=False
+    )
+
+    parser.add_argument(
+        '--local-registry',
+        action="store_true",
+        dest="local_registry",
+        help="Push intermediate images of non-push builds to a local registry instead of "
+             "loading each of them into the Docker daemon.",
+        default=False
+    )
+
+    parser.add_argument(
+        '--analyze-cache',
+        action="store_true",
+        dest="analyze_cache",
+        help="Report the instructions of the resolved Dockerfiles that hurt layer caching, "
+             "instead of building.",
+        default=False
+    )
+    parser.add_argument(
+        '--history-image',
+        type=str,
+        dest='history_image',
+        default=None,
+        help='Image built from the same Dockerfiles whose history gives --analyze-cache the '
+             'duration of each step.'
+    )
+
     args = parser.parse_args()
+    trace_events.enable_tracing()
+
+    if args.analyze_cache:
+        _, _, build_plan = _resolve_image_build_plan(
+            tuple(sorted(part for key in args.image_keys for part in key.split('.'))),
+            args.isaac_ros_platform or platform.uname().machine
+        )
+        if not build_plan:
+            print("Error: Could not resolve all Dockerfiles.")
+            sys.exit(1)
+        print_report(analyze_dockerfiles(
+            [d.dockerfile_path_ for d in build_plan.dockerfiles_], args.history_image))
+        sys.exit(0)
 
     # Ensure that --nvcr and --image_name are not used together.
     assert not (args.nvcr and args.image_name), (
@@ -1048,4 +1362,6 @@ if __name__ == "__main__":
         build_local=args.build_local,
         use_kubernetes_driver=args.use_kubernetes_driver,
         isaac_ros_platform=args.isaac_ros_platform,
+        full_context=args.full_context,
+        local_registry=args.local_registry,
     )
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Static analysis of the layer cache efficiency of the Dockerfiles of a build plan.
+
+Every instruction invalidates the cache of all instructions after it when it changes, so the
+analyzer reports instructions that change often or download without a cache mount, and estimates
+what each costs from the step durations in the history of a previously built image.
+"""
+
+from datetime import datetime
+import json
+from pathlib import Path
+import re
+import subprocess
+from typing import Dict, List, Optional
+
+# Instructions that other instructions may depend on, steps are never moved across them
+BARRIER_INSTRUCTIONS = {'FROM', 'ARG', 'ENV', 'WORKDIR', 'USER', 'SHELL'}
+
+_PIP_INSTALL = re.compile(r'\bpip3?(\.\d+)?\s+install\b|-m\s+pip\s+install\b')
+_PIP_UPGRADE = re.compile(r'\s(-U|--upgrade)\b')
+_APT_INSTALL = re.compile(r'\bapt(-get)?\s+(-\S+\s+)*install\b')
+_REMOTE_SCRIPT = re.compile(r'\b(curl|wget)\b[^|;&]*\|\s*(sudo\s+)?(-E\s+)?(ba)?sh\b')
+_SOURCE_BUILD = re.compile(
+    r'(\./configure\b|\bmake\s+(-j|install\b)|\bcmake\s+(--build|-S|-B|\.\.)|'
+    r'\bninja\s+(-C|install\b)|\bcolcon\s+build\b)')
+_SOURCE_FETCH = re.compile(r'\b(git\s+clone|wget|curl)\b')
+_VARIABLE = re.compile(r'\$\{?(\w+)[^}]*\}?')
+
+
+class Instruction:
+    def __init__(self, dockerfile: Path, line: int, keyword: str, arguments: str, stage: str):
+        self.dockerfile_ = dockerfile
+        self.line_ = line
+        self.keyword_ = keyword
+        self.arguments_ = arguments
+        self.stage_ = stage
+        # Seconds the instruction took in the history image, if it was found there
+        self.duration_: Optional[float] = None
+
+    def flags(self) -> List[str]:
+        flags = []
+        for token in self.arguments_.split():
+            if not token.startswith('--'):
+                break
+            flags.append(token)
+        return flags
+
+    def command(self) -> str:
+        """Return the arguments without the leading --flags."""
+        return ' '.join(self.arguments_.split()[len(self.flags()):])
+
+    def has_cache_mount(self, target: str) -> bool:
+        return any(flag.startswith('--mount=') and 'type=cache' in flag and target in flag
+                   for flag in self.flags())
+
+    def location(self) -> str:
+        return f"{self.dockerfile_.name}:{self.line_}"
+
+    def is_copy_from_context(self) -> bool:
+        return self.keyword_ in ('COPY', 'ADD') and not any(
+            flag.startswith('--from=') for flag in self.flags())
+
+    def copy_sources(self) -> List[str]:
+        """Return the source arguments of a COPY or ADD, without its destination."""
+        command = self.command()
+        arguments = json.loads(command) if command.startswith('[') else command.split()
+        return arguments[:-1]
+
+    def is_volatile(self) -> bool:
+        """Whether the instruction's cache is likely invalidated by changes outside of it."""
+        if self.is_copy_from_context():
+            return True
+        if self.keyword_ != 'RUN':
+            return False
+        command = self.command()
+        return bool(_REMOTE_SCRIPT.search(command)
+                    or (_PIP_INSTALL.search(command) and _PIP_UPGRADE.search(command)))
+
+    def weight(self) -> int:
+        """Heuristic build cost of the instruction, used when there is no history."""
+        if self.keyword_ != 'RUN':
+            return 0
+        command = self.command()
+        if _SOURCE_BUILD.search(command) and _SOURCE_FETCH.search(command):
+            return 3
+        if _PIP_INSTALL.search(command) or _APT_INSTALL.search(command):
+            return 2 if 'torch' in command or command.count(' ') > 20 else 1
+        return 0
+
+
+class Finding:
+    def __init__(self, instruction: Instruction, code: str, message: str):
+        self.instruction_ = instruction
+        self.code_ = code
+        self.message_ = message
+        self.downstream_seconds_: Optional[float] = None
+        self.downstream_steps_ = 0
+        self.downstream_expensive_steps_ = 0
+
+    def cost(self) -> str:
+        if self.downstream_seconds_ is not None:
+            duration = self.instruction_.duration_
+            own = f"the step took ~{duration:.0f}s, " if duration is not None else ""
+            return (f"{own}~{self.downstream_seconds_:.0f}s of downstream steps rebuild "
+                    "(from history)")
+        return (f"{self.downstream_steps_} downstream steps rebuild, "
+                f"{self.downstream_expensive_steps_} of them expensive (no history)")
+
+
+def parse_dockerfile(path: Path) -> List[Instruction]:
+    """Parse a Dockerfile into instructions, joining continuation lines and dropping comments."""
+    instructions = []
+    stage = ''
+    pending: List[str] = []
+    start_line = 0
+    for number, raw_line in enumerate(path.read_text().splitlines(), start=1):
+        line = raw_line.strip()
+        if not pending and (not line or line.startswith('#')):
+            continue
+        # Empty and comment lines inside a continued instruction are dropped by docker too
+        if pending and (not line or line.startswith('#')):
+            continue
+        if not pending:
+            start_line = number
+        continued = line.endswith('\\')
+        pending.append(line[:-1].strip() if continued else line)
+        if continued:
+            continue
+
+        text = ' '.join(part for part in pending if part)
+        pending = []
+        keyword, _, arguments = text.partition(' ')
+        keyword = keyword.upper()
+        if keyword == 'FROM':
+            match = re.search(r'\s+AS\s+(\S+)\s*$', arguments, re.IGNORECASE)
+            stage = match.group(1) if match else f"{path.name}:{start_line}"
+        instructions.append(Instruction(path, start_line, keyword, arguments.strip(), stage))
+    return instructions
+
+
+def get_stage_parents(instructions: List[Instruction]) -> Dict[str, str]:
+    """Return the base stage or image of each stage, variables replaced by a '*' wildcard."""
+    return {
+        instruction.stage_: _VARIABLE.sub('*', re.split(r'\s+AS\s+', instruction.arguments_,
+                                                        flags=re.IGNORECASE)[0].split()[-1])
+        for instruction in instructions if instruction.keyword_ == 'FROM'
+    }
+
+
+def _stage_depends_on(stage: str, ancestor: str, parents: Dict[str, str]) -> bool:
+    seen = set()
+    while stage in parents and stage not in seen:
+        seen.add(stage)
+        parent = parents[stage]
+        if re.fullmatch(re.escape(parent).replace(r'\*', '.*'), ancestor):
+            return True
+        stage = next((name for name in parents
+                      if re.fullmatch(re.escape(parent).replace(r'\*', '.*'), name)), None)
+    return False
+
+
+def _normalize_command(text: str) -> str:
+    text = re.sub(r'\s*# buildkit$', '', text.strip())
+    text = re.sub(r'^(RUN\s+)?(\|\d+(\s+\w+=\S*)*\s+)?(/bin/(ba)?sh\s+-c\s+)?', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def load_history_durations(image: str) -> Dict[str, float]:
+    """
+    Return the build duration of each RUN step of an image by normalized command.
+
+    Durations are the differences between the creation times of consecutive layers, so they
+    are only meaningful for steps that were not cached when the image was built.
+    """
+    result = subprocess.run(
+        ['docker', 'history', '--no-trunc', '--format', '{{json .}}', image],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return {}
+    entries = [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+    durations = {}
+    previous_time = None
+    # docker history lists the newest layer first
+    for entry in reversed(entries):
+        try:
+            created = datetime.fromisoformat(entry['CreatedAt'])
+        except (KeyError, ValueError):
+            previous_time = None
+            continue
+        if previous_time is not None and entry.get('CreatedBy'):
+            durations[_normalize_command(entry['CreatedBy'])] = max(
+                0.0, (created - previous_time).total_seconds())
+        previous_time = created
+    return durations
+
+
+def _apply_history(instructions: List[Instruction], durations: Dict[str, float]):
+    for instruction in instructions:
+        if instruction.keyword_ == 'RUN':
+            instruction.duration_ = durations.get(_normalize_command(instruction.command()))
+
+
+def _find_issues(instruction: Instruction, downstream: List[Instruction]) -> List[Finding]:
+    findings = []
+    if instruction.keyword_ == 'RUN':
+        command = instruction.command()
+        if _PIP_INSTALL.search(command) and not instruction.has_cache_mount('/root/.cache/pip'):
+            findings.append(Finding(
+                instruction, 'pip-cache-mount',
+                "pip install without --mount=type=cache,target=/root/.cache/pip downloads every "
+                "package again whenever the step reruns"))
+        if _APT_INSTALL.search(command) and not instruction.has_cache_mount('/var/cache/apt'):
+            findings.append(Finding(
+                instruction, 'apt-cache-mount',
+                "apt-get install without --mount=type=cache,target=/var/cache/apt downloads every "
+                "package again whenever the step reruns"))
+        if _REMOTE_SCRIPT.search(command):
+            findings.append(Finding(
+                instruction, 'remote-script',
+                "piping a downloaded script into a shell is not part of the cache key: the layer "
+                "goes stale silently, and refreshing it rebuilds every later step"))
+        if _PIP_INSTALL.search(command) and _PIP_UPGRADE.search(command):
+            findings.append(Finding(
+                instruction, 'unpinned-upgrade',
+                "pip install --upgrade resolves to whatever is newest when the step reruns, pin "
+                "the versions or move the step after the stable ones"))
+        if instruction.weight() >= 3:
+            later_steps = sum(1 for step in downstream if step.keyword_ == 'RUN')
+            if later_steps:
+                findings.append(Finding(
+                    instruction, 'inline-source-build',
+                    f"source build followed by {later_steps} dependent steps, build it "
+                    "in a dedicated stage and COPY --from the result so that it builds in "
+                    "parallel and changing it does not rebuild the other steps"))
+    elif instruction.is_copy_from_context():
+        expensive = [step for step in downstream if step.keyword_ == 'RUN' and step.weight()]
+        if expensive:
+            findings.append(Finding(
+                instruction, 'early-copy',
+                f"{instruction.keyword_} {' '.join(instruction.copy_sources())} from the build "
+                f"context precedes {len(expensive)} expensive steps (first at line "
+                f"{expensive[0].line_}) that rebuild whenever the copied files change"))
+    return findings
+
+
+def _uses_output_of(step: Instruction, earlier: Instruction) -> bool:
+    """Whether step refers to the destination of an earlier COPY or ADD."""
+    if earlier.keyword_ not in ('COPY', 'ADD'):
+        return False
+    destination = earlier.command().split()[-1].rstrip('/')
+    return bool(destination) and destination in step.arguments_
+
+
+def _suggest_reordering(instructions: List[Instruction]) -> List[Dict]:
+    """Suggest moving volatile steps after the stable ones between the same barriers."""
+    suggestions = []
+    segment: List[Instruction] = []
+    for instruction in instructions + [None]:
+        if instruction is not None and instruction.keyword_ not in BARRIER_INSTRUCTIONS:
+            segment.append(instruction)
+            continue
+        # Volatile steps that later steps of the segment use stay in place
+        movable = [step for index, step in enumerate(segment) if step.is_volatile() and not any(
+            _uses_output_of(later, step) for later in segment[index + 1:])]
+        suggested = [step for step in segment if step not in movable] + movable
+        # Only worth it if a volatile step is followed by a stable step with a real cost
+        if suggested != segment and any(
+                step.weight() or step.duration_ for step in segment[segment.index(movable[0]):]
+                if step not in movable):
+            suggestions.append({
+                'dockerfile': str(segment[0].dockerfile_),
+                'current': [step.line_ for step in segment],
+                'suggested': [step.line_ for step in suggested],
+            })
+        segment = []
+    return suggestions
+
+
+def analyze_dockerfiles(dockerfiles: List[Path], history_image: Optional[str] = None) -> Dict:
+    """
+    Analyze the Dockerfiles of a build plan, in build order.
+
+    Args:
+        dockerfiles (List[Path]): Dockerfiles of the plan, each building on the previous one
+        history_image (str): Image built from the plan whose history provides step durations
+
+    Returns:
+        dict: 'findings', 'reordering' suggestions and whether 'history' was available
+    """
+    per_file = [parse_dockerfile(path) for path in dockerfiles]
+    durations = load_history_durations(history_image) if history_image else {}
+    for instructions in per_file:
+        _apply_history(instructions, durations)
+
+    findings = []
+    reordering = []
+    for index, instructions in enumerate(per_file):
+        parents = get_stage_parents(instructions)
+        later_files = [step for later in per_file[index + 1:] for step in later]
+        for position, instruction in enumerate(instructions):
+            downstream = [
+                step for step in instructions[position + 1:]
+                if step.stage_ == instruction.stage_
+                or _stage_depends_on(step.stage_, instruction.stage_, parents)
+            ] + later_files
+            issues = _find_issues(instruction, downstream)
+            if not issues:
+                continue
+            run_steps = [step for step in downstream if step.keyword_ == 'RUN']
+            for issue in issues:
+                issue.downstream_steps_ = len(run_steps)
+                issue.downstream_expensive_steps_ = sum(1 for step in run_steps if step.weight())
+                if durations:
+                    issue.downstream_seconds_ = sum(step.duration_ or 0 for step in run_steps)
+            findings.extend(issues)
+        reordering.extend(_suggest_reordering(instructions))
+
+    findings.sort(key=lambda finding: -(finding.downstream_seconds_
+                                        if finding.downstream_seconds_ is not None
+                                        else finding.downstream_expensive_steps_))
+    return {'findings': findings, 'reordering': reordering, 'history': bool(durations)}
+
+
+def print_report(report: Dict):
+    findings = report['findings']
+    if not report['history']:
+        print("No build history available, costs are counted in downstream steps.")
+    if not findings:
+        print("No cache efficiency issues found.")
+    for finding in findings:
+        print(f"{finding.instruction_.location()}: [{finding.code_}] {finding.message_}")
+        print(f"    cost: {finding.cost()}")
+    for suggestion in report['reordering']:
+        print(f"{suggestion['dockerfile']}: consider reordering lines "
+              f"{', '.join(map(str, suggestion['current']))} to "
+              f"{', '.join(map(str, suggestion['suggested']))} if the steps are independent")
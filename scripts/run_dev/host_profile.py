@@ -0,0 +1,215 @@
+# Copyright (c) 2026, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Probe of host build capacity: CPUs, memory and disk, honoring cgroup limits."""
+
+import json
+import math
+import os
+import shutil
+import time
+
+CACHE_PATH = os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "isaac-ros-cli", "host-profile.json")
+
+# Available memory and free disk drift, so cached probes are only trusted for a short while
+CACHE_TTL_SECONDS = 300
+
+# Memory budget for a single C++ compile job
+DEFAULT_MEMORY_PER_JOB_MB = 2048
+
+# Below this, a full image build is likely to run out of space
+LOW_DISK_WARNING_MB = 40 * 1024
+
+DOCKER_DATA_ROOT = "/var/lib/docker"
+
+
+def _read_text(path):
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _get_cgroup_dirs(controller):
+    """Returns candidate cgroup directories of this process for a controller (v2 and v1)."""
+    dirs = []
+    cgroup_info = _read_text("/proc/self/cgroup") or ""
+    for line in cgroup_info.splitlines():
+        _, controllers, path = line.split(":", 2)
+        if controllers == "":
+            dirs.append(os.path.join("/sys/fs/cgroup", path.lstrip("/")))
+        elif controller in controllers.split(","):
+            dirs.append(os.path.join("/sys/fs/cgroup", controllers, path.lstrip("/")))
+            dirs.append(os.path.join("/sys/fs/cgroup", controller, path.lstrip("/")))
+    # Inside containers the cgroup namespace root is mounted directly
+    dirs.extend(["/sys/fs/cgroup", os.path.join("/sys/fs/cgroup", controller)])
+    return dirs
+
+
+def get_cgroup_cpu_limit():
+    """Returns the cgroup CPU quota in CPUs, or None if unlimited."""
+    for cgroup_dir in _get_cgroup_dirs("cpu"):
+        cpu_max = _read_text(os.path.join(cgroup_dir, "cpu.max"))
+        if cpu_max:
+            quota, _, period = cpu_max.partition(" ")
+            if quota == "max":
+                return None
+            return int(quota) / int(period or 100000)
+        quota = _read_text(os.path.join(cgroup_dir, "cpu.cfs_quota_us"))
+        period = _read_text(os.path.join(cgroup_dir, "cpu.cfs_period_us"))
+        if quota and period:
+            return None if int(quota) < 0 else int(quota) / int(period)
+    return None
+
+
+def get_cgroup_memory_limit_mb():
+    """Returns the memory still available under the cgroup limit in MB, or None if unlimited."""
+    for cgroup_dir in _get_cgroup_dirs("memory"):
+        memory_max = _read_text(os.path.join(cgroup_dir, "memory.max"))
+        memory_current = _read_text(os.path.join(cgroup_dir, "memory.current"))
+        if memory_max is None:
+            memory_max = _read_text(os.path.join(cgroup_dir, "memory.limit_in_bytes"))
+            memory_current = _read_text(os.path.join(cgroup_dir, "memory.usage_in_bytes"))
+        if memory_max is None:
+            continue
+        # cgroup v1 reports "unlimited" as a huge page-aligned number
+        if memory_max == "max" or int(memory_max) >= 2 ** 60:
+            return None
+        used = int(memory_current) if memory_current else 0
+        return max(0, int(memory_max) - used) // (1024 * 1024)
+    return None
+
+
+def get_meminfo_mb():
+    """Returns (total, available) system memory in MB from /proc/meminfo."""
+    values = {}
+    for line in (_read_text("/proc/meminfo") or "").splitlines():
+        key, _, value = line.partition(":")
+        values[key] = int(value.split()[0]) // 1024 if value.split() else 0
+    return values.get("MemTotal"), values.get("MemAvailable", values.get("MemFree"))
+
+
+class HostProfile:
+    def __init__(self, cpu_count, cgroup_cpu_limit, memory_total_mb, memory_available_mb,
+                 cgroup_memory_limit_mb, disk_path, disk_free_mb):
+        self.cpu_count_ = cpu_count
+        self.cgroup_cpu_limit_ = cgroup_cpu_limit
+        self.memory_total_mb_ = memory_total_mb
+        self.memory_available_mb_ = memory_available_mb
+        self.cgroup_memory_limit_mb_ = cgroup_memory_limit_mb
+        self.disk_path_ = disk_path
+        self.disk_free_mb_ = disk_free_mb
+
+    @classmethod
+    def probe(cls, disk_path=None):
+        if disk_path is None:
+            disk_path = DOCKER_DATA_ROOT if os.path.isdir(DOCKER_DATA_ROOT) else "/"
+        try:
+            cpu_count = len(os.sched_getaffinity(0))
+        except AttributeError:
+            cpu_count = os.cpu_count() or 1
+        memory_total_mb, memory_available_mb = get_meminfo_mb()
+        try:
+            disk_free_mb = shutil.disk_usage(disk_path).free // (1024 * 1024)
+        except OSError:
+            disk_free_mb = None
+        return cls(
+            cpu_count=cpu_count,
+            cgroup_cpu_limit=get_cgroup_cpu_limit(),
+            memory_total_mb=memory_total_mb,
+            memory_available_mb=memory_available_mb,
+            cgroup_memory_limit_mb=get_cgroup_memory_limit_mb(),
+            disk_path=disk_path,
+            disk_free_mb=disk_free_mb,
+        )
+
+    def to_dict(self):
+        return {key.rstrip("_"): value for key, value in self.__dict__.items()}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(**values)
+
+    def effective_cpus(self) -> int:
+        cpus = self.cpu_count_
+        if self.cgroup_cpu_limit_:
+            cpus = min(cpus, math.ceil(self.cgroup_cpu_limit_))
+        return max(1, cpus)
+
+    def effective_memory_mb(self):
+        limits = [m for m in (self.memory_available_mb_, self.cgroup_memory_limit_mb_)
+                  if m is not None]
+        return min(limits) if limits else None
+
+    def build_jobs(self, memory_per_job_mb=DEFAULT_MEMORY_PER_JOB_MB) -> int:
+        """Returns the number of parallel compile jobs the host can sustain without swapping."""
+        jobs = self.effective_cpus()
+        memory_mb = self.effective_memory_mb()
+        if memory_mb is not None and memory_per_job_mb:
+            jobs = min(jobs, memory_mb // memory_per_job_mb)
+        return max(1, jobs)
+
+    def buildkitd_config(self) -> str:
+        """Returns a buildkitd.toml limiting concurrently executed build steps to this host."""
+        return f"[worker.oci]\n  max-parallelism = {self.effective_cpus()}\n"
+
+    def warn_if_low_disk(self):
+        if self.disk_free_mb_ is not None and self.disk_free_mb_ < LOW_DISK_WARNING_MB:
+            print(f"Warning: Only {self.disk_free_mb_ // 1024} GB free at {self.disk_path_}. "
+                  "Image builds may run out of disk space.")
+
+    def __str__(self):
+        memory_mb = self.effective_memory_mb()
+        return (f"cpus={self.effective_cpus()}/{self.cpu_count_} "
+                f"memory_available={memory_mb}MB/{self.memory_total_mb_}MB "
+                f"disk_free={self.disk_free_mb_}MB ({self.disk_path_})")
+
+
+def _get_boot_id():
+    return _read_text("/proc/sys/kernel/random/boot_id")
+
+
+def get_host_profile(use_cache=True) -> HostProfile:
+    """Returns the host profile, reusing a recent probe from the same boot if available."""
+    boot_id = _get_boot_id()
+    if use_cache:
+        try:
+            with open(CACHE_PATH, "r") as f:
+                cached = json.load(f)
+            if (cached.get("boot_id") == boot_id
+                    and time.time() - cached.get("timestamp", 0) < CACHE_TTL_SECONDS):
+                return HostProfile.from_dict(cached["profile"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    profile = HostProfile.probe()
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "boot_id": boot_id,
+                "timestamp": time.time(),
+                "profile": profile.to_dict(),
+            }, f)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError:
+        pass
+    return profile
+
+
+if __name__ == "__main__":
+    host_profile = get_host_profile(use_cache=False)
+    print(json.dumps({
+        **host_profile.to_dict(),
+        "effective_cpus": host_profile.effective_cpus(),
+        "build_jobs": host_profile.build_jobs(),
+    }, indent=2))
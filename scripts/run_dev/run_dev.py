@@ -8,19 +8,94 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
+import contextlib
+import getpass
+import hashlib
+import json
 import os
 import sys
 import subprocess
+import re
 import shlex
+import time
 from build_image_layers import (
     main as build_image_layers,
     check_docker_logins,
+    get_build_plan_fingerprint,
     get_image_name)
 from isaac_ros_common_config_utils import (
     get_isaac_ros_common_config_path,
     get_isaac_ros_common_config_values,
     get_build_order)
 
+# The image a dev container runs is tagged <repository>:<container name>, so that dev containers
+# of other workspaces do not retag it. Shared by all dev containers before that.
+CACHED_IMAGE_REPOSITORY = "cached_isaac_run_dev_image_local"
+CACHED_IMAGE_NAME = f"{CACHED_IMAGE_REPOSITORY}:latest"
+
+# Container name replaced by one derived from the host user, workspace and image
+AUTO_CONTAINER_NAME = "auto"
+CONTAINER_WORKSPACE = "/workspaces/isaac_ros-dev"
+
+# Labels recorded on the dev container at creation time, read back with a single inspect call
+CONTAINER_LABEL_PREFIX = "com.nvidia.isaac-ros"
+CONTAINER_LABEL_WORKSPACE = f"{CONTAINER_LABEL_PREFIX}.workspace"
+CONTAINER_LABEL_HOST_WORKSPACE = f"{CONTAINER_LABEL_PREFIX}.host-workspace"
+CONTAINER_LABEL_IMAGE_ID = f"{CONTAINER_LABEL_PREFIX}.image-id"
+CONTAINER_LABEL_PLAN_FINGERPRINT = f"{CONTAINER_LABEL_PREFIX}.plan-fingerprint"
+CONTAINER_LABEL_PLATFORM = f"{CONTAINER_LABEL_PREFIX}.platform"
+CONTAINER_LABEL_USER = f"{CONTAINER_LABEL_PREFIX}.user"
+CONTAINER_LABEL_RESOURCES = f"{CONTAINER_LABEL_PREFIX}.resources"
+
+# docker run options of the resource settings of the dev container
+RESOURCE_OPTIONS = {
+    "cpuset": "--cpuset-cpus",
+    "cpus": "--cpus",
+    "cpu_shares": "--cpu-shares",
+    "memory": "--memory",
+    "memory_reservation": "--memory-reservation",
+    "shm_size": "--shm-size",
+    # Memory is only allocated from these NUMA nodes
+    "numa_nodes": "--cpuset-mems",
+}
+
+# Set for the docker client so that colors survive in the container session
+DOCKER_CLIENT_ENV = {
+    "TERM": "xterm-256color",
+    "COLORTERM": "truecolor",
+    "FORCE_COLOR": "true"
+}
+
+# Fast DDS profiles generated on the host for the dev container are mounted here
+MIDDLEWARE_PROFILES_MOUNT = "/usr/local/share/middleware_profiles/generated"
+
+# Files the entrypoint shares with the CLI. Not in /tmp, which is shared with the host and every
+# other dev container on aarch64.
+CONTAINER_RUNTIME_DIR = "/run/isaac-ros-cli"
+
+# Created by the background container once its entrypoint has set up the user
+EXEC_READY_FILE = f"{CONTAINER_RUNTIME_DIR}/exec_ready"
+EXEC_READY_TIMEOUT_SECONDS = 120
+
+# Derived images with the container user already set up for a host user, tagged
+# <base image ID>-<uid>-<gid>
+USER_LAYER_IMAGE_REPOSITORY = "isaac_ros_dev_user_layer"
+IMAGE_LABEL_USER_LAYER_BASE = f"{CONTAINER_LABEL_PREFIX}.user-layer.base-image-id"
+USER_LAYER_DOCKERFILE = """\
+FROM {base_name}
+RUN HOST_USER_UID={uid} HOST_USER_GID={gid} ISAAC_ROS_ENTRYPOINT_USER_SETUP_ONLY=1 \\
+    /usr/local/bin/scripts/workspace-entrypoint.sh
+LABEL {label}={base_image_id}
+"""
+
+# Step timings written by the entrypoint, one "<start> <end> <step>" line per step
+ENTRYPOINT_PROFILE_FILE = f"{CONTAINER_RUNTIME_DIR}/entrypoint_profile"
+
+# /etc/bash.bashrc holds the ROS setup but returns early in non-interactive shells without PS1
+EXEC_ENVIRONMENT_WRAPPER = [
+    "/bin/bash", "-c", 'PS1="$0" source /etc/bash.bashrc >&2; exec "$@"', "isaac-ros-exec"
+]
+
 
 def validate_isaac_dir(isaac_dir):
     if not os.path.isdir(isaac_dir):
@@ -110,77 +185,387 @@ def check_lfs_files(isaac_dir):
         pass
 
 
-def remove_exited_container(container_name):
-    output = subprocess.check_output(
-        [
-            "docker",
-            "ps",
-            "-a",
-            "--quiet",
-            "--filter",
-            "status=exited",
-            "--filter",
-            f"name={container_name}"
-        ]
+def inspect_dev_container(container_name, image_name):
+    """
+    Inspect the dev container and the image it should be running in a single docker call.
+
+    Returns:
+        tuple: (container, image_id) where container is the inspect dict of the container
+            (or None if it does not exist) and image_id is the ID of image_name (or None).
+    """
+    result = subprocess.run(
+        ["docker", "inspect", container_name, image_name],
+        capture_output=True,
+        text=True
     )
-    if output:
-        subprocess.run(["docker", "rm", container_name], stdout=subprocess.DEVNULL)
+    # docker inspect exits non-zero if any object is missing but still reports the others
+    try:
+        objects = json.loads(result.stdout) if result.stdout.strip() else []
+    except json.JSONDecodeError:
+        objects = []
+
+    container = None
+    image_id = None
+    for obj in objects:
+        if "State" in obj:
+            if obj.get("Name", "").lstrip("/") == container_name:
+                container = obj
+        else:
+            image_id = obj.get("Id")
+    return container, image_id
+
+
+def get_container_workspace(container):
+    """Returns the workspace path inside the container, preferring the container label."""
+    config = container.get("Config") or {}
+    labels = config.get("Labels") or {}
+    if labels.get(CONTAINER_LABEL_WORKSPACE):
+        return labels[CONTAINER_LABEL_WORKSPACE]
+    # Containers created before labels were added carry the workspace in their environment
+    for env in config.get("Env") or []:
+        key, _, value = env.partition("=")
+        if key == "ISAAC_ROS_WS":
+            return value
+    return config.get("WorkingDir") or CONTAINER_WORKSPACE
+
+
+def get_dev_container_name(isaac_dir, env_list, isaac_ros_platform, user=None):
+    """
+    Returns the name of the dev container of a host user, workspace and image.
+
+    Users and workspaces sharing a host each get their own container, named
+    isaac_ros_dev_<user>_<hash of user, workspace path, image keys and platform>.
+    """
+    user = user or getpass.getuser()
+    fingerprint = "\n".join(
+        [user, os.path.realpath(isaac_dir), ".".join(sorted(env_list)), isaac_ros_platform or ""])
+    digest = hashlib.sha256(fingerprint.encode()).hexdigest()[:12]
+    return f"isaac_ros_dev_{re.sub(r'[^a-zA-Z0-9_.-]', '_', user)}_{digest}"
 
 
-def attach_to_running_container(container_name):
-    output = subprocess.check_output(
-        [
-            "docker",
-            "ps",
-            "-a",
-            "--quiet",
-            "--filter",
-            "status=running",
-            "--filter",
-            f"name={container_name}"
-        ]
+def list_dev_containers(include_stopped=False):
+    """
+    List the dev containers of all users and workspaces on this host.
+
+    Returns:
+        list: Dicts with the name, state, user, host workspace and image of each container and,
+            for running containers, their CPU and memory usage.
+    """
+    fields = ["name", "state", "status", "user", "workspace", "image"]
+    command = [
+        "docker", "ps", "--filter", f"label={CONTAINER_LABEL_WORKSPACE}",
+        "--format", "\t".join([
+            "{{.Names}}", "{{.State}}", "{{.Status}}",
+            f'{{{{.Label "{CONTAINER_LABEL_USER}"}}}}',
+            f'{{{{.Label "{CONTAINER_LABEL_HOST_WORKSPACE}"}}}}',
+            "{{.Image}}",
+        ])
+    ]
+    if include_stopped:
+        command.append("--all")
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"Error: Failed to list containers: {result.stderr.strip()}")
+        sys.exit(1)
+
+    containers = []
+    for line in result.stdout.splitlines():
+        values = line.split("\t")
+        if len(values) == len(fields):
+            containers.append({field: value or None for field, value in zip(fields, values)})
+
+    running = [container["name"] for container in containers if container["state"] == "running"]
+    if running:
+        result = subprocess.run(
+            ["docker", "stats", "--no-stream", "--format", "{{json .}}", *running],
+            capture_output=True,
+            text=True
+        )
+        stats = {}
+        for line in result.stdout.splitlines() if result.returncode == 0 else []:
+            entry = json.loads(line)
+            stats[entry["Name"]] = entry
+        for container in containers:
+            if container["name"] in stats:
+                container["cpu"] = stats[container["name"]]["CPUPerc"]
+                container["memory"] = stats[container["name"]]["MemUsage"]
+    return containers
+
+
+def get_entrypoint_profile(container_name):
+    """
+    Read the step timings recorded by the entrypoint of a running container.
+
+    Returns:
+        list: Dicts with the step name, its start relative to the entrypoint's start and its
+            duration, in seconds, in the order the steps started. Empty if nothing was recorded.
+    """
+    result = subprocess.run(
+        ["docker", "exec", container_name, "cat", ENTRYPOINT_PROFILE_FILE],
+        capture_output=True,
+        text=True
     )
-    if output:
-        print(f"Attaching to running container: {container_name}")
-        isaac_ros_ws = subprocess.check_output(
-            ["docker", "exec", container_name, "printenv", "ISAAC_ROS_WS"],
-            universal_newlines=True
-        ).strip()
-        print(f"Docker workspace: {isaac_ros_ws}")
-        subprocess.run(
-            [
-                "docker", "exec", "-i", "-t",
-                "-e", "TERM=xterm-256color",
-                "-e", "COLORTERM=truecolor",
-                "-e", "FORCE_COLOR=true",
-                "-u", "admin",
-                "--workdir", isaac_ros_ws,
-                container_name, "/bin/bash"
-            ],
-            env={
-                **os.environ,
-                "TERM": "xterm-256color",
-                "COLORTERM": "truecolor",
-                "FORCE_COLOR": "true"
-            }
+    return parse_entrypoint_profile(result.stdout if result.returncode == 0 else "")
+
+
+def parse_entrypoint_profile(text):
+    """Parse the step timings of an entrypoint profile file, see get_entrypoint_profile()."""
+    steps = []
+    for line in text.splitlines():
+        try:
+            start, end, step = line.split(" ", 2)
+            start, end = float(start), float(end)
+        except ValueError:
+            continue
+        steps.append({"step": step, "start": start, "duration": end - start})
+    if not steps:
+        return []
+    origin = min(step["start"] for step in steps)
+    for step in steps:
+        step["start"] = round(step["start"] - origin, 2)
+        step["duration"] = round(step["duration"], 2)
+    return sorted(steps, key=lambda step: (step["start"], step["step"] != "entrypoint"))
+
+
+def remove_exited_container(container_name, container):
+    if container and container["State"].get("Status") in ("exited", "created", "dead"):
+        subprocess.run(["docker", "rm", container_name], stdout=subprocess.DEVNULL)
+        return True
+    return False
+
+
+def get_resource_args(resources):
+    """
+    Returns the docker run arguments shaping the resources of the dev container.
+
+    Args:
+        resources (dict): Values of RESOURCE_OPTIONS keys, and ulimits mapping limit names to a
+            value or a 'soft:hard' pair
+
+    Raises:
+        ValueError: If a setting is unknown
+    """
+    resource_args = []
+    for key, value in (resources or {}).items():
+        if value is None:
+            continue
+        if key == "ulimits":
+            if not isinstance(value, dict):
+                raise ValueError(f"Resource setting ulimits must map limit names to values, "
+                                 f"got {value!r}")
+            for name, limit in value.items():
+                resource_args.extend(["--ulimit", f"{name}={limit}"])
+        elif key in RESOURCE_OPTIONS:
+            resource_args.extend([RESOURCE_OPTIONS[key], str(value)])
+        else:
+            raise ValueError(f"Unknown resource setting {key}, expected one of "
+                             f"{', '.join([*RESOURCE_OPTIONS, 'ulimits'])}")
+    return resource_args
+
+
+def warn_if_stale_container(container, image_id, isaac_ros_platform, resources=None):
+    labels = (container.get("Config") or {}).get("Labels") or {}
+    container_image_id = labels.get(CONTAINER_LABEL_IMAGE_ID) or container.get("Image")
+    if image_id and container_image_id and container_image_id != image_id:
+        print(
+            "Warning: The running container was created from an older image. "
+            "Exit all shells in the container and re-run activate to use the latest image."
+        )
+    container_platform = labels.get(CONTAINER_LABEL_PLATFORM)
+    if container_platform and isaac_ros_platform and container_platform != isaac_ros_platform:
+        print(
+            f"Warning: The running container was created for platform {container_platform}, "
+            f"but {isaac_ros_platform} was requested."
+        )
+    container_resources = labels.get(CONTAINER_LABEL_RESOURCES)
+    if resources is not None and container_resources is not None \
+            and container_resources != json.dumps(resources, sort_keys=True):
+        print(
+            "Warning: The running container was created with other resource settings. "
+            "Exit all shells in the container and re-run activate to apply them."
         )
-        sys.exit(0)
 
 
-def make_docker_image_available(base_name, cached_image_name):
-    pull_result = subprocess.run(
-        [f"docker pull {base_name}"],
-        shell=True,
-        env={**os.environ, "TERM": "xterm-256color", "COLORTERM": "truecolor"}
+def get_environment_args(container_env):
+    """Returns the docker arguments setting the KEY=VALUE variables of container_env."""
+    return [arg for variable in container_env or [] for arg in ("-e", variable)]
+
+
+def get_attach_command(container_name, container, container_env=None):
+    """Returns the docker command starting an interactive shell in the running container."""
+    return [
+        "docker", "exec", "-i", "-t",
+        "-e", "TERM=xterm-256color",
+        "-e", "COLORTERM=truecolor",
+        "-e", "FORCE_COLOR=true",
+        *get_environment_args(container_env),
+        "-u", "admin",
+        "--workdir", get_container_workspace(container),
+        container_name, "/bin/bash"
+    ]
+
+
+def get_exec_command(container_name, container, command, container_env=None):
+    """Returns the docker command running command non-interactively in the running container."""
+    return [
+        "docker", "exec", "-i",
+        *get_environment_args(container_env),
+        "-u", "admin",
+        "--workdir", get_container_workspace(container),
+        container_name,
+        *EXEC_ENVIRONMENT_WRAPPER,
+        *command
+    ]
+
+
+def get_running_container_command(args, container, image_id=None):
+    """Returns the docker command reusing the running container for a shell or args.command."""
+    if args.command:
+        warn_if_stale_container(container, image_id, args.isaac_ros_platform, args.resources)
+        docker_command = get_exec_command(
+            args.container_name, container, args.command, args.container_env)
+    else:
+        print(f"Attaching to running container: {args.container_name}")
+        warn_if_stale_container(container, image_id, args.isaac_ros_platform, args.resources)
+        print(f"Docker workspace: {get_container_workspace(container)}")
+        docker_command = get_attach_command(args.container_name, container, args.container_env)
+    if args.verbose:
+        print(shlex.join(docker_command))
+    return docker_command
+
+
+@contextlib.contextmanager
+def stdout_to_stderr():
+    """Send everything written to stdout, including by subprocesses, to stderr."""
+    sys.stdout.flush()
+    saved_stdout = os.dup(1)
+    os.dup2(2, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved_stdout, 1)
+        os.close(saved_stdout)
+
+
+def get_image_id(image_name):
+    result = subprocess.run(
+        ["docker", "image", "inspect", "--format", "{{.Id}}", image_name],
+        capture_output=True,
+        text=True
     )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def get_user_layer_image(base_name, base_image_id, verbose=False):
+    """
+    Return the image of base_name with the container user set up for the current host user.
 
-    local_image_result = subprocess.run(
-        ["docker", "image", "inspect", base_name],
+    The image is built once per base image ID, uid and gid, so containers started from it skip
+    remapping the user in their entrypoint. Images of older base images are removed.
+
+    Returns:
+        str: The name of the derived image, or None if it could not be built.
+    """
+    uid, gid = os.getuid(), os.getgid()
+    base_tag = base_image_id.split(":")[-1][:12]
+    image_name = f"{USER_LAYER_IMAGE_REPOSITORY}:{base_tag}-{uid}-{gid}"
+    if get_image_id(image_name):
+        return image_name
+
+    print(f"Building {image_name} with the container user set up for uid={uid}:gid={gid}")
+    dockerfile = USER_LAYER_DOCKERFILE.format(
+        base_name=base_name, uid=uid, gid=gid, label=IMAGE_LABEL_USER_LAYER_BASE,
+        base_image_id=base_image_id)
+    result = subprocess.run(
+        ["docker", "build", "--tag", image_name, "-"],
+        input=dockerfile,
+        text=True,
+        stdout=None if verbose else subprocess.DEVNULL,
+        stderr=None if verbose else subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        print(f"Warning: Failed to build {image_name}, setting up the user at container start")
+        if result.stderr:
+            print(result.stderr.strip())
+        return None
+
+    # Derived images of previous base images for this user are no longer used
+    result = subprocess.run(
+        ["docker", "image", "ls", USER_LAYER_IMAGE_REPOSITORY, "--format", "{{.Tag}}"],
         capture_output=True,
+        text=True
+    )
+    stale_images = [
+        f"{USER_LAYER_IMAGE_REPOSITORY}:{tag}" for tag in result.stdout.split()
+        if tag.endswith(f"-{uid}-{gid}") and tag != f"{base_tag}-{uid}-{gid}"
+    ]
+    if stale_images:
+        subprocess.run(["docker", "rmi", *stale_images],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return image_name
+
+
+def get_container_labels(isaac_dir, image_id, plan_fingerprint, isaac_ros_platform,
+                         resources=None):
+    """Returns the labels describing how the dev container was created."""
+    labels = {
+        CONTAINER_LABEL_WORKSPACE: CONTAINER_WORKSPACE,
+        CONTAINER_LABEL_HOST_WORKSPACE: isaac_dir,
+        CONTAINER_LABEL_IMAGE_ID: image_id,
+        CONTAINER_LABEL_PLAN_FINGERPRINT: plan_fingerprint,
+        CONTAINER_LABEL_PLATFORM: isaac_ros_platform,
+        CONTAINER_LABEL_USER: getpass.getuser(),
+        CONTAINER_LABEL_RESOURCES: json.dumps(resources or {}, sort_keys=True),
+    }
+    return {key: value for key, value in labels.items() if value}
+
+
+def get_image_layers(image_name):
+    """Returns the ID, size in bytes and layer digests of a local image, or None if missing."""
+    result = subprocess.run(
+        ["docker", "image", "inspect", "--format",
+         "{{.Id}} {{.Size}} {{join .RootFS.Layers \" \"}}", image_name],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    image_id, size, *layers = result.stdout.split()
+    return image_id, int(size), layers
+
+
+def print_pull_throughput(image_name, seconds, layers_before, layers_after):
+    """Prints how much of an image a pull downloaded and how fast."""
+    if layers_after is None or layers_before == layers_after:
+        return
+    _, size, layers = layers_after
+    new_layers = len(set(layers) - set(layers_before[2] if layers_before else []))
+    message = (f"Pulled {image_name} in {seconds:.1f}s: {new_layers}/{len(layers)} new layers, "
+               f"{size / 1e6:.0f} MB uncompressed")
+    # The sizes of the individual layers are unknown, so throughput is only exact for full pulls
+    if layers_before is None and seconds > 0:
+        message += f", {size / 1e6 / seconds:.1f} MB/s"
+    print(message)
+
+
+def make_docker_image_available(base_name, cached_image_name):
+    """Pulls base_name, tags it as cached_image_name and returns its image ID, or None."""
+    # The layers before the pull are only needed for the pull report, which is for a terminal
+    report_pull = sys.stdout.isatty()
+    layers_before = get_image_layers(base_name) if report_pull else None
+    pull_start = time.monotonic()
+    pull_result = subprocess.run(
+        ["docker", "pull", base_name],
         env={**os.environ, "TERM": "xterm-256color", "COLORTERM": "truecolor"}
     )
+    # Also tells whether the image is available locally when the pull failed
+    layers_after = get_image_layers(base_name)
+    if pull_result.returncode == 0 and report_pull:
+        print_pull_throughput(base_name, time.monotonic() - pull_start, layers_before,
+                              layers_after)
 
-    if pull_result.returncode == 0 or local_image_result.returncode == 0:
+    if layers_after is not None:
         # Remove any existing cached image
         subprocess.run(
             ["docker", "rmi", cached_image_name],
@@ -192,9 +577,10 @@ def make_docker_image_available(base_name, cached_image_name):
             ["docker", "tag", base_name, cached_image_name]
         )
 
-        return tag_result.returncode == 0
+        if tag_result.returncode == 0:
+            return layers_after[0]
 
-    return False
+    return None
 
 
 def get_existing_bash_configs():
@@ -208,44 +594,44 @@ def get_existing_bash_configs():
 
 
 def get_docker_args(platform):
-    # Return arguments as complete flag-value pairs for shell=True usage
+    # Return arguments as an argv list for direct exec
     home_path = os.path.expanduser('~')
     docker_args = [
-        "-v /tmp/.X11-unix:/tmp/.X11-unix",
-        f"-v {shlex.quote(home_path)}/.Xauthority:/home/admin/.Xauthority:rw",
+        "-v", "/tmp/.X11-unix:/tmp/.X11-unix",
+        "-v", f"{home_path}/.Xauthority:/home/admin/.Xauthority:rw",
     ]
     # Add existing bash config files
     for config in get_existing_bash_configs():
-        docker_args.append(
-            f"-v {shlex.quote(home_path)}/{config}:/home/admin/{config}:ro"
-        )
+        docker_args.extend([
+            "-v", f"{home_path}/{config}:/home/admin/{config}:ro"
+        ])
     docker_args.extend([
-        "-e DISPLAY",
-        "-e NVIDIA_VISIBLE_DEVICES=all",
-        "-e NVIDIA_DRIVER_CAPABILITIES=all",
-        "-e ROS_DOMAIN_ID",
-        "-e USER",
-        "-e ISAAC_ROS_WS=/workspaces/isaac_ros-dev",
-        f"-e HOST_USER_UID={os.getuid()}",
-        f"-e HOST_USER_GID={os.getgid()}",
+        "-e", "DISPLAY",
+        "-e", "NVIDIA_VISIBLE_DEVICES=all",
+        "-e", "NVIDIA_DRIVER_CAPABILITIES=all",
+        "-e", "ROS_DOMAIN_ID",
+        "-e", "USER",
+        "-e", f"ISAAC_ROS_WS={CONTAINER_WORKSPACE}",
+        "-e", f"HOST_USER_UID={os.getuid()}",
+        "-e", f"HOST_USER_GID={os.getgid()}",
     ])
     if platform == "aarch64":
         if "SSH_AUTH_SOCK" in os.environ:
             ssh_auth_sock = os.environ['SSH_AUTH_SOCK']
             docker_args.extend([
-                f"-v {shlex.quote(ssh_auth_sock)}:/ssh-agent",
-                "-e SSH_AUTH_SOCK=/ssh-agent",
+                "-v", f"{ssh_auth_sock}:/ssh-agent",
+                "-e", "SSH_AUTH_SOCK=/ssh-agent",
             ])
         docker_args.extend([
-            "-v /usr/bin/tegrastats:/usr/bin/tegrastats",
-            "-v /sys/kernel/debug:/sys/kernel/debug:ro",  # Required for tegrastats
-            "-v /tmp/:/tmp/",
-            "-v /usr/lib/aarch64-linux-gnu/tegra:/usr/lib/aarch64-linux-gnu/tegra",
-            "-v /usr/src/jetson_multimedia_api:/usr/src/jetson_multimedia_api",
+            "-v", "/usr/bin/tegrastats:/usr/bin/tegrastats",
+            "-v", "/sys/kernel/debug:/sys/kernel/debug:ro",  # Required for tegrastats
+            "-v", "/tmp/:/tmp/",
+            "-v", "/usr/lib/aarch64-linux-gnu/tegra:/usr/lib/aarch64-linux-gnu/tegra",
+            "-v", "/usr/src/jetson_multimedia_api:/usr/src/jetson_multimedia_api",
             "--pid=host",
-            "-v /usr/share/vpi3:/usr/share/vpi3",
-            "-v /dev/input:/dev/input",
-            "-v /dev/bus/usb:/dev/bus/usb",
+            "-v", "/usr/share/vpi3:/usr/share/vpi3",
+            "-v", "/dev/input:/dev/input",
+            "-v", "/dev/bus/usb:/dev/bus/usb",
         ])
         try:
             output = subprocess.check_output(
@@ -254,8 +640,8 @@ def get_docker_args(platform):
             if output:
                 group_id = output.split(":")[2]
                 docker_args.extend([
-                    "-v /run/jtop.sock:/run/jtop.sock:ro",
-                    f"--group-add {group_id}",
+                    "-v", "/run/jtop.sock:/run/jtop.sock:ro",
+                    "--group-add", group_id,
                 ])
         except subprocess.CalledProcessError:
             pass
@@ -267,6 +653,14 @@ def realpath(path):
     return subprocess.check_output(['realpath', os.path.expanduser(path)]).decode().strip()
 
 
+def split_docker_args_line(line):
+    """Split a dockerargs file line into argv tokens the way the shell would."""
+    return [
+        os.path.expanduser(token) if token.startswith("~") else token
+        for token in shlex.split(line)
+    ]
+
+
 def load_docker_args_from_file():
     docker_args_files = [os.getenv("DOCKER_ARGS_FILE", "")]
     docker_args_files.append("~/.isaac_ros_dev-dockerargs")
@@ -313,72 +707,137 @@ def load_docker_args_from_file():
                         # Quote the resolved path to handle spaces
                         quoted_path = shlex.quote(resolved_path)
                         line = line.replace(f"`realpath {path}`", quoted_path)
-                    # Make sure each line is a complete argument for shell=True
-                    docker_args.append(os.path.expandvars(line))
+                    # Split each line into argv tokens as the shell would have
+                    docker_args.extend(split_docker_args_line(os.path.expandvars(line)))
         print(docker_args)
         return docker_args
     return []
 
 
-def run_docker_container(args, container_name, base_name, isaac_dir):
+def get_docker_env():
+    return {**os.environ, **DOCKER_CLIENT_ENV}
+
+
+def exec_docker(docker_command):
+    """Replace the current process with docker so the session has no Python ancestors."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvpe(docker_command[0], docker_command, get_docker_env())
+
+
+def get_docker_run_command(args, container_name, base_name, isaac_dir, labels=None,
+                           detach=False, command=None):
+    """Returns the docker command starting a new container with a shell, or running command."""
     docker_args = get_docker_args(args.platform)
     file_args = load_docker_args_from_file()
 
     docker_args.extend(file_args)
 
-    # Build the command as a single string for shell=True
-    # Use proper shell quoting for arguments that might contain spaces
-    docker_command_parts = [
-        "docker run -it --rm",
+    if detach:
+        run_flags = ["--detach"]
+    elif command:
+        run_flags = []
+    else:
+        run_flags = ["-it"]
+    resources = args.resources or {}
+    docker_command = [
+        "docker", "run", *run_flags, "--rm",
         "--privileged",
-        "--network host",
-        "--ipc=host",
-        "-e TERM=xterm-256color",
-        "-e COLORTERM=truecolor",
-        "-e FORCE_COLOR=true",
-        "--workdir /workspaces/isaac_ros-dev",
+        "--network", "host",
+        # A container sized /dev/shm needs its own IPC namespace
+        "--ipc=private" if resources.get("shm_size") else "--ipc=host",
+        "-e", "TERM=xterm-256color",
+        "-e", "COLORTERM=truecolor",
+        "-e", "FORCE_COLOR=true",
+        "--workdir", CONTAINER_WORKSPACE,
     ]
 
+    # Background containers only sleep, let an init forward docker stop to them
+    if detach:
+        docker_command.append("--init")
+
+    for key, value in (labels or {}).items():
+        docker_command.extend(["--label", f"{key}={value}"])
+
+    docker_command.extend(get_resource_args(resources))
+
     # Pass ISAAC_ROS_PLATFORM if specified
     if args.isaac_ros_platform:
-        docker_command_parts.append(
-            f"-e ISAAC_ROS_PLATFORM={shlex.quote(args.isaac_ros_platform)}"
-        )
+        docker_command.extend(["-e", f"ISAAC_ROS_PLATFORM={args.isaac_ros_platform}"])
 
-    # Add Docker arguments as strings
-    docker_command_parts.extend(docker_args)
+    docker_command.extend(docker_args)
+    docker_command.extend(get_environment_args(args.container_env))
+    if args.middleware_profiles_dir:
+        # Created here so that docker does not create it owned by root
+        os.makedirs(args.middleware_profiles_dir, exist_ok=True)
+        docker_command.extend(
+            ["-v", f"{args.middleware_profiles_dir}:{MIDDLEWARE_PROFILES_MOUNT}:ro"])
 
     # Add remaining arguments
-    docker_command_parts.extend([
-        f"-v {shlex.quote(isaac_dir)}:/workspaces/isaac_ros-dev",
-        "-v /etc/localtime:/etc/localtime:ro",
-        f"--name {shlex.quote(container_name)}",
-        "--runtime nvidia",
-        "--entrypoint /usr/local/bin/scripts/workspace-entrypoint.sh",
-        shlex.quote(base_name),
-        "/bin/bash"
+    docker_command.extend([
+        "-v", f"{isaac_dir}:{CONTAINER_WORKSPACE}",
+        "-v", "/etc/localtime:/etc/localtime:ro",
+        "--name", container_name,
+        "--runtime", "nvidia",
+        "--entrypoint", "/usr/local/bin/scripts/workspace-entrypoint.sh",
+        base_name,
     ])
+    if detach:
+        docker_command.extend(
+            ["/bin/bash", "-c", f"touch {EXEC_READY_FILE} && exec sleep infinity"])
+    else:
+        docker_command.extend(command or ["/bin/bash"])
+    return docker_command
 
-    # Join all command parts with spaces to create a single command string
-    docker_command_str = " ".join(docker_command_parts)
+
+def run_docker_container(args, container_name, base_name, isaac_dir, labels=None):
+    docker_command = get_docker_run_command(args, container_name, base_name, isaac_dir, labels)
 
     print(f"Running {container_name}")
     if args.verbose:
-        print(docker_command_str)
-
-    subprocess.run(
-        docker_command_str,
-        shell=True,
-        env={
-            **os.environ,
-            "TERM": "xterm-256color",
-            "COLORTERM": "truecolor",
-            "FORCE_COLOR": "true"
-        }
-    )
+        print(shlex.join(docker_command))
 
+    exec_docker(docker_command)
 
-def parse_args():
+
+def start_background_container(args, container_name, base_name, isaac_dir, labels=None):
+    """Start the dev container in the background and wait for its entrypoint to finish.
+
+    Later 'isaac-ros exec' calls and activations reuse it until it is stopped.
+
+    Returns:
+        dict: The inspect dict of the running container.
+    """
+    docker_command = get_docker_run_command(
+        args, container_name, base_name, isaac_dir, labels, detach=True)
+
+    print(f"Starting {container_name} in the background, stop it with "
+          f"'docker stop {container_name}'")
+    if args.verbose:
+        print(shlex.join(docker_command))
+    if subprocess.run(docker_command, env=get_docker_env()).returncode != 0:
+        print(f"Error: Failed to start {container_name}")
+        sys.exit(1)
+
+    deadline = time.monotonic() + EXEC_READY_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if subprocess.run(
+            ["docker", "exec", container_name, "test", "-e", EXEC_READY_FILE],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        ).returncode == 0:
+            return inspect_dev_container(container_name, args.cached_image_name)[0]
+        container, _ = inspect_dev_container(container_name, args.cached_image_name)
+        if not container or not container["State"].get("Running"):
+            break
+        time.sleep(0.2)
+
+    subprocess.run(["docker", "logs", container_name])
+    print(f"Error: {container_name} did not become ready")
+    sys.exit(1)
+
+
+def parse_args(argv=None):
     import argparse
 
     parser = argparse.ArgumentParser()
@@ -422,8 +881,9 @@ def parse_args():
     )
     parser.add_argument(
         "--container-name",
-        default="isaac_ros_dev_container",
-        help="Name of the Docker container"
+        default=AUTO_CONTAINER_NAME,
+        help=f"Name of the Docker container, '{AUTO_CONTAINER_NAME}' (default) to derive it from "
+             "the host user, the workspace and the image"
     )
     parser.add_argument(
         "-b", "--use-cached-build-image",
@@ -447,7 +907,42 @@ def parse_args():
         default=None,
         help="Isaac ROS platform identifier (e.g., amd64, arm64-jetpack, arm64-fastos)"
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--user-layer",
+        action="store_true",
+        required=False,
+        default=False,
+        help="Run a cached image derived from the dev image with the container user already set "
+             "up for the host user, instead of setting it up at every container start"
+    )
+    parser.add_argument(
+        "--resources",
+        type=json.loads,
+        default=None,
+        help="Resource settings of the container as a JSON object, e.g. "
+             "'{\"cpuset\": \"0-7\", \"memory\": \"32g\", \"ulimits\": {\"memlock\": -1}}'"
+    )
+    parser.add_argument(
+        "--container-env",
+        action="append",
+        default=None,
+        help="KEY=VALUE variable to set in the container, also when attaching to it"
+    )
+    parser.add_argument(
+        "--middleware-profiles-dir",
+        default=None,
+        help=f"Host directory of generated middleware profiles to mount at "
+             f"{MIDDLEWARE_PROFILES_MOUNT}"
+    )
+    parser.add_argument(
+        "--exec",
+        dest="command",
+        nargs=argparse.REMAINDER,
+        default=None,
+        help="Run the remaining arguments as a command in the container instead of a shell, "
+             "starting the container in the background if it is not running"
+    )
+    args = parser.parse_args(argv)
 
     # Apply default env values only if nothing was provided
     if args.env is None:
@@ -473,10 +968,15 @@ def parse_args():
                       "Use --isaac-ros-platform to override.")
                 args.isaac_ros_platform = 'arm64-jetpack'
 
+    if args.container_name == AUTO_CONTAINER_NAME:
+        args.container_name = get_dev_container_name(
+            get_isaac_dir(args), args.env, args.isaac_ros_platform)
+    args.cached_image_name = f"{CACHED_IMAGE_REPOSITORY}:{args.container_name}"
+
     return args
 
 
-def get_isaac_dir():
+def get_isaac_dir(args):
     """
     Returns the absolute path of the ISAAC directory.
 
@@ -485,10 +985,12 @@ def get_isaac_dir():
     2. ISAAC_DIR environment variable if set
     3. Auto-detection by walking up from script location
 
+    Args:
+        args (argparse.Namespace): Parsed run_dev arguments
+
     Returns:
         str: The absolute path of the ISAAC directory.
     """
-    args = parse_args()
     if args.isaac_dir:
         isaac_dir = args.isaac_dir
     elif "ISAAC_DIR" in os.environ:
@@ -507,8 +1009,25 @@ def get_isaac_dir():
     return os.path.abspath(isaac_dir)
 
 
-def main():
-    args = parse_args()
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command:
+        # Keep stdout for the command's own output
+        with stdout_to_stderr():
+            docker_command = start_dev_container(args)
+        exec_docker(docker_command)
+    else:
+        start_dev_container(args)
+
+
+def start_dev_container(args):
+    """Attach to or run the dev container, building its image if needed.
+
+    Unless a command is given, this does not return: the process is replaced with docker.
+
+    Returns:
+        list: The docker command running args.command in the dev container.
+    """
     config_path = get_isaac_ros_common_config_path()
     config = get_isaac_ros_common_config_values(config_path)
 
@@ -516,7 +1035,7 @@ def main():
         str(config['image_key_order'][0]).split('.'),
         args.env
     )
-    isaac_dir = get_isaac_dir()
+    isaac_dir = get_isaac_dir(args)
     container_name = args.container_name
 
     validate_isaac_dir(isaac_dir)
@@ -525,8 +1044,14 @@ def main():
     check_git_lfs_installed()
     check_lfs_files(isaac_dir)
 
-    remove_exited_container(container_name)
-    attach_to_running_container(container_name)
+    container, cached_image_id = inspect_dev_container(container_name, args.cached_image_name)
+    if remove_exited_container(container_name, container):
+        container = None
+    if container and container["State"].get("Running"):
+        docker_command = get_running_container_command(args, container, cached_image_id)
+        if args.command:
+            return docker_command
+        exec_docker(docker_command)
 
     if args.no_cache:
         cache_from_registry_name = "local"
@@ -537,53 +1062,69 @@ def main():
 
     print(env_list)
 
-    cached_image_name = "cached_isaac_run_dev_image_local:latest"
+    cached_image_name = args.cached_image_name
     base_name = get_image_name(
         cache_from_registry_name, env_list, args.isaac_ros_platform, include_hash=True)
     if args.use_cached_build_image:
-        # Check if cached image exists before using it
-
-        cached_image_exists = subprocess.run(
-            ["docker", "image", "inspect", cached_image_name],
-            capture_output=True
-        ).returncode == 0
+        # Check if cached image exists before using it, falling back to the formerly shared tag
+        for cached_image_name in (args.cached_image_name, CACHED_IMAGE_NAME):
+            base_image_id = get_image_id(cached_image_name)
+            if base_image_id:
+                break
 
-        if not cached_image_exists:
+        if not base_image_id:
             print("No cached image found. "
                   "Perhaps you cleaned docker cache, or you haven't yet "
                   "run run_dev.py on this system?")
             sys.exit(1)
         base_name = cached_image_name
 
-    elif not make_docker_image_available(base_name, cached_image_name):
-        if not (args.build or args.build_local):
-            print(f"Error: Docker image {base_name} not found.")
-            print("Use --build to build remotely or --build-local to build locally.")
-            sys.exit(1)
-
-        build_args = {
-            'image_key_set': env_list,
-            'config_file': config_path,
-            'target_image_name': base_name,
-            'verbose': args.verbose,
-            'no_cache': args.no_cache,
-            'isaac_ros_platform': args.isaac_ros_platform,
-        }
+    else:
+        base_image_id = make_docker_image_available(base_name, cached_image_name)
+        if not base_image_id:
+            if not (args.build or args.build_local):
+                print(f"Error: Docker image {base_name} not found.")
+                print("Use --build to build remotely or --build-local to build locally.")
+                sys.exit(1)
+
+            build_args = {
+                'image_key_set': env_list,
+                'config_file': config_path,
+                'target_image_name': base_name,
+                'verbose': args.verbose,
+                'no_cache': args.no_cache,
+                'isaac_ros_platform': args.isaac_ros_platform,
+            }
 
-        if args.build_local:
-            build_args['build_local'] = True
+            if args.build_local:
+                build_args['build_local'] = True
 
-        if args.push:
-            build_args['push'] = True
+            if args.push:
+                build_args['push'] = True
 
-        build_image_layers(**build_args)
-        if not make_docker_image_available(base_name, cached_image_name):
-            print(f"Error: Failed to build or pull image {base_name}")
-            sys.exit(1)
+            build_image_layers(**build_args)
+            base_image_id = make_docker_image_available(base_name, cached_image_name)
+            if not base_image_id:
+                print(f"Error: Failed to build or pull image {base_name}")
+                sys.exit(1)
 
     print(f"Using image: {base_name}")
 
-    run_docker_container(args, container_name, base_name, isaac_dir)
+    labels = get_container_labels(
+        isaac_dir,
+        base_image_id,
+        get_build_plan_fingerprint(env_list, args.isaac_ros_platform),
+        args.isaac_ros_platform,
+        args.resources
+    )
+    run_image_name = base_name
+    if args.user_layer and base_image_id:
+        run_image_name = get_user_layer_image(base_name, base_image_id, args.verbose) or base_name
+    if args.command:
+        container = start_background_container(
+            args, container_name, run_image_name, isaac_dir, labels)
+        return get_running_container_command(args, container)
+    run_docker_container(args, container_name, run_image_name, isaac_dir, labels)
 
 
 if __name__ == "__main__":
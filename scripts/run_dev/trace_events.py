@@ -0,0 +1,147 @@
+# Copyright (c) 2026, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Chrome trace events of a run, enabled with ISAAC_ROS_TRACE=<path>.
+
+Every subprocess, YAML load and explicitly traced step of the process becomes a span in the
+trace file, which chrome://tracing and ui.perfetto.dev open. Spans are appended to the file as
+they end, in the JSON array format whose closing bracket is optional, so the traces of nested
+isaac-ros and build_image_layers processes share one file and an exec() loses nothing.
+
+Nothing is patched unless tracing is enabled, and span() is a no-op then.
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+TRACE_ENV_VAR = "ISAAC_ROS_TRACE"
+
+# File descriptor of the trace file, None while tracing is off
+_trace_fd = None
+_process_span = None
+
+
+def _now_us():
+    return time.time_ns() / 1000
+
+
+def _write_event(event):
+    # One write per event, the file is opened with O_APPEND so processes do not interleave
+    os.write(_trace_fd, (json.dumps(event, default=str) + ",\n").encode())
+
+
+def _write_span(name, category, start_us, args):
+    _write_event({
+        'name': name,
+        'cat': category,
+        'ph': 'X',
+        'ts': start_us,
+        'dur': _now_us() - start_us,
+        'pid': os.getpid(),
+        'tid': threading.get_native_id(),
+        'args': args,
+    })
+
+
+def span(name, category="step", **args):
+    """Return a context manager recording its block as a span, or doing nothing when off."""
+    if _trace_fd is None:
+        return contextlib.nullcontext()
+    return _span(name, category, args)
+
+
+@contextlib.contextmanager
+def _span(name, category, args):
+    start_us = _now_us()
+    try:
+        yield
+    except BaseException as e:
+        args['error'] = repr(e)
+        raise
+    finally:
+        _write_span(name, category, start_us, args)
+
+
+class _TracedPopen(subprocess.Popen):
+    """Popen recording the subprocess as a span from its start until it is waited for.
+
+    subprocess.run(), check_output(), getoutput() and run_shell() all go through Popen.
+    """
+
+    def __init__(self, args, *posargs, **kwargs):
+        self.trace_start_us_ = _now_us()
+        self.trace_recorded_ = False
+        super().__init__(args, *posargs, **kwargs)
+
+    def wait(self, timeout=None):
+        returncode = super().wait(timeout)
+        if not self.trace_recorded_:
+            self.trace_recorded_ = True
+            argv = [self.args] if isinstance(self.args, (str, bytes)) else list(self.args)
+            name = os.path.basename(str(argv[0]).split()[0]) if argv and argv[0] else "?"
+            _write_span(name, "subprocess", self.trace_start_us_,
+                        {'argv': argv, 'exit_code': returncode})
+        return returncode
+
+
+def _traced_yaml_load(load):
+    def traced_load(stream, *args, **kwargs):
+        with _span("yaml.load", "yaml", {'path': getattr(stream, 'name', None)}):
+            return load(stream, *args, **kwargs)
+    return traced_load
+
+
+def _traced_execvpe(execvpe):
+    def traced_execvpe(file, args, env):
+        _end_process_span(exec_argv=list(args))
+        return execvpe(file, args, env)
+    return traced_execvpe
+
+
+def _end_process_span(**args):
+    global _process_span
+    if _process_span is None:
+        return
+    name, start_us, process_args = _process_span
+    _process_span = None
+    _write_span(name, "process", start_us, {**process_args, **args})
+
+
+def enable_tracing(name=None, path=None):
+    """Start tracing the process to path, ISAAC_ROS_TRACE by default, if it is set.
+
+    The whole process is recorded as a span named name, its program name by default.
+    """
+    global _trace_fd, _process_span
+    path = path or os.environ.get(TRACE_ENV_VAR)
+    if not path or _trace_fd is not None:
+        return
+    _trace_fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    if os.fstat(_trace_fd).st_size == 0:
+        os.write(_trace_fd, b"[\n")
+
+    name = name or os.path.basename(sys.argv[0])
+    _write_event({'name': 'process_name', 'ph': 'M', 'pid': os.getpid(),
+                  'args': {'name': f"{name} ({os.getpid()})"}})
+    _process_span = (name, _now_us(), {'argv': sys.argv})
+    atexit.register(_end_process_span)
+
+    subprocess.Popen = _TracedPopen
+    os.execvpe = _traced_execvpe(os.execvpe)
+    try:
+        import yaml
+    except ImportError:
+        return
+    # yaml.safe_load() goes through yaml.load()
+    yaml.load = _traced_yaml_load(yaml.load)
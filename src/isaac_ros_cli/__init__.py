@@ -8,14 +8,18 @@
 
 """Isaac ROS CLI package."""
 
-from .config_loader import (
-    ConfigScope,
-    load_environment_mode,
-    update_environment_mode,
-    load_config,
-    update_config,
-)
-from .cli import main
+import importlib
+
+# Public names are resolved on first access so that importing the package (and running
+# `isaac-ros --help`) does not pay for importing every submodule.
+_LAZY_EXPORTS = {
+    'ConfigScope': 'config_loader',
+    'load_environment_mode': 'config_loader',
+    'update_environment_mode': 'config_loader',
+    'load_config': 'config_loader',
+    'update_config': 'config_loader',
+    'main': 'cli',
+}
 
 __all__ = [
     'ConfigScope',
@@ -25,3 +29,14 @@ __all__ = [
     'update_config',
     'main',
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(f'.{_LAZY_EXPORTS[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
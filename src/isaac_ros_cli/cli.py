@@ -7,25 +7,100 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
+import importlib
+import os
+import sys
+
 import click
 
-from isaac_ros_cli.commands.init import init
-from isaac_ros_cli.commands.activate import activate
+
+class LazyGroup(click.Group):
+    """Click group that imports subcommand modules only when they are looked up."""
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Mapping of command name to ("module.path:attribute", short help)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            self.add_command(self._load_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        # Same as click's, but with the short help of the map instead of importing every command
+        commands = []
+        for cmd_name in self.list_commands(ctx):
+            command = self.commands.get(cmd_name) or click.Command(
+                cmd_name, help=self.lazy_subcommands[cmd_name][1])
+            if not command.hidden:
+                commands.append((cmd_name, command))
+        if commands:
+            limit = formatter.width - 6 - max(len(cmd_name) for cmd_name, _ in commands)
+            with formatter.section("Commands"):
+                formatter.write_dl([(cmd_name, command.get_short_help_str(limit))
+                                    for cmd_name, command in commands])
+
+    def _load_command(self, cmd_name):
+        import_path, _ = self.lazy_subcommands[cmd_name]
+        module_name, _, attribute = import_path.partition(':')
+        command = getattr(importlib.import_module(module_name), attribute)
+        if not isinstance(command, click.Command):
+            raise ValueError(
+                f"Lazy loading of {import_path} did not return a click command.")
+        return command
 
 
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    # The short help repeats the first sentence of each command's docstring, 'make
+    # check-startup' fails when they differ
+    lazy_subcommands={
+        'activate': ('isaac_ros_cli.commands.activate:activate',
+                     'Activate Isaac ROS development environment based on saved configuration.'),
+        'bench': ('isaac_ros_cli.commands.bench:bench',
+                  'Measure where the time of the CLI commands goes.'),
+        'daemon': ('isaac_ros_cli.commands.daemon:daemon',
+                   'Manage the optional per-user daemon that keeps CLI state warm.'),
+        'deactivate': ('isaac_ros_cli.commands.activate:deactivate',
+                       "Print the environment changes reverting 'isaac-ros activate "
+                       "--print-env'."),
+        'exec': ('isaac_ros_cli.commands.exec:exec_command',
+                 'Run COMMAND non-interactively in the Isaac ROS environment.'),
+        'init': ('isaac_ros_cli.commands.init:init',
+                 'Initialize Isaac ROS development environment mode.'),
+        'pip': ('isaac_ros_cli.commands.pip:pip',
+                'Manage Isaac ROS pip shim packages.'),
+        'ps': ('isaac_ros_cli.commands.ps:ps',
+               'List the dev containers of all users and workspaces with their resource usage.'),
+        'rosdep': ('isaac_ros_cli.commands.rosdep:rosdep',
+                   'Look up the extra Isaac ROS rosdep definitions.'),
+        'status': ('isaac_ros_cli.commands.status:status',
+                   'Show the state of the Isaac ROS environment.'),
+        'venv': ('isaac_ros_cli.commands.venv:venv',
+                 'Manage the Isaac ROS virtual environment.'),
+    },
+)
 def cli():
     """Isaac ROS CLI - Manage your Isaac ROS development environment."""
     pass
 
 
-# Register commands
-cli.add_command(activate)
-cli.add_command(init)
+def _enable_tracing():
+    # The trace module is shared with build_image_layers and patches subprocess and yaml, so
+    # it is only imported when a trace is asked for
+    from isaac_ros_cli.commands.activate.docker import _import_run_dev_module
+    _import_run_dev_module('trace_events').enable_tracing(
+        name=' '.join(['isaac-ros', *sys.argv[1:2]]))
 
 
 def main():
     """Main entry point for console script."""
+    if os.environ.get('ISAAC_ROS_TRACE'):
+        _enable_tracing()
     cli()
 
 
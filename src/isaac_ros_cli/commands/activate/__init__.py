@@ -7,15 +7,19 @@
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
 import click
+import os
 import sys
 
-from isaac_ros_cli.config_loader import load_environment_mode
+from isaac_ros_cli.config_loader import load_config, load_environment_mode
 from isaac_ros_cli.platform import detect_platform
 
 # Import mode-specific implementations
-from .docker import activate_docker
-from .venv import activate_venv, is_venv_activated
-from .baremetal import activate_baremetal, is_baremetal_activated
+from .docker import activate_docker, get_resources
+from .middleware import get_middleware_environment
+from .venv import activate_venv, get_venv_activation_changes, is_venv_activated
+from .baremetal import activate_baremetal, get_baremetal_environment, is_baremetal_activated
+from .print_env import (OUTPUT_FORMATS, format_changes, get_activation_changes,
+                        get_deactivation_changes)
 
 
 def _docker_only_validator(_ctx, _param, value):
@@ -27,6 +31,11 @@ def _docker_only_validator(_ctx, _param, value):
 
 @click.command()
 @click.option('--verbose', is_flag=True, help='Enable verbose output.')
+@click.option('--print-env', is_flag=True,
+              help='Venv and baremetal only: Print the environment changes for eval instead '
+                   'of starting a shell.')
+@click.option('--format', 'output_format', type=click.Choice(OUTPUT_FORMATS), default='sh',
+              show_default=True, help='Output format of --print-env.')
 # Docker only options
 @click.option('--build', is_flag=True,
               help='Docker only: Build the requested Docker image remotely if missing.',
@@ -43,15 +52,32 @@ def _docker_only_validator(_ctx, _param, value):
 @click.option('--no-cache', is_flag=True,
               help='Docker only: Do not use Docker layer cache.',
               callback=_docker_only_validator)
+@click.option('--profile', 'resource_profile', metavar='PROFILE',
+              help='Docker only: Resource profile of a newly started container: default, '
+                   'realtime, build or another one of docker.run.resource_profiles.',
+              callback=_docker_only_validator)
+@click.option('--middleware', metavar='PROFILE',
+              help='Docker only: Fast DDS profile for the container: udp, shm_udp (shared memory '
+                   'and UDP), shm (shared memory only) or data_sharing (zero-copy).',
+              callback=_docker_only_validator)
 def activate(
         build: bool,
         build_local: bool,
         push: bool,
         use_cached_build_image: bool,
         no_cache: bool,
-        verbose: bool
+        resource_profile: str,
+        middleware: str,
+        verbose: bool,
+        print_env: bool,
+        output_format: str
 ):
-    """Activate Isaac ROS development environment based on saved configuration."""
+    """Activate Isaac ROS development environment based on saved configuration.
+
+    With --print-env, nothing is started. Apply the printed changes to the current shell with
+    'eval "$(isaac-ros activate --print-env)"' and revert them with
+    'eval "$(isaac-ros deactivate)"'.
+    """
 
     mode = load_environment_mode()
 
@@ -75,8 +101,31 @@ def activate(
     # Detect platform to forward as ISAAC_ROS_PLATFORM environment variable
     platform = detect_platform()
 
+    if print_env:
+        match mode:
+            case 'venv':
+                changes = get_venv_activation_changes(platform, os.environ)
+            case 'baremetal':
+                changes = get_baremetal_environment(platform)
+            case _:
+                click.echo("Error: --print-env is only supported in the venv and baremetal "
+                           "environment modes.", err=True)
+                sys.exit(1)
+        click.echo(format_changes(get_activation_changes(changes, os.environ), output_format),
+                   nl=False)
+        return
+
     match mode:
         case 'docker':
+            if resource_profile or middleware:
+                try:
+                    cfg = load_config()
+                    resources = get_resources(cfg, resource_profile)
+                    if middleware:
+                        get_middleware_environment(cfg, middleware, resources)
+                except ValueError as e:
+                    click.echo(f"Error: {e}", err=True)
+                    sys.exit(1)
             activate_docker(
                 platform=platform,
                 build=build,
@@ -84,7 +133,9 @@ def activate(
                 push=push,
                 use_cached_build_image=use_cached_build_image,
                 no_cache=no_cache,
-                verbose=verbose
+                verbose=verbose,
+                resource_profile=resource_profile,
+                middleware=middleware
             )
         case 'venv':
             activate_venv(platform)
@@ -93,3 +144,19 @@ def activate(
         case _:
             click.echo(f"Error: Invalid environment configuration: {mode}", err=True)
             sys.exit(1)
+
+
+@click.command()
+@click.option('--format', 'output_format', type=click.Choice(OUTPUT_FORMATS), default='sh',
+              show_default=True, help='Output format.')
+def deactivate(output_format: str):
+    """Print the environment changes reverting 'isaac-ros activate --print-env'.
+
+    Apply them with 'eval "$(isaac-ros deactivate)"'. Environments activated in a shell are
+    left by exiting that shell.
+    """
+    changes = get_deactivation_changes(os.environ)
+    if changes is None:
+        click.echo("Error: No Isaac ROS environment was activated with --print-env.", err=True)
+        sys.exit(1)
+    click.echo(format_changes(changes, output_format), nl=False)
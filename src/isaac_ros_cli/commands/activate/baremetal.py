@@ -9,6 +9,7 @@
 import click
 import subprocess
 import os
+from typing import Dict
 
 from isaac_ros_cli.platform import Platform
 
@@ -20,6 +21,14 @@ def is_baremetal_activated():
     return os.environ.get(BAREMETAL_ACTIVATED_ENV_VAR) == "1"
 
 
+def get_baremetal_environment(platform: Platform) -> Dict[str, str]:
+    """Variables set for the baremetal Isaac ROS environment."""
+    return {
+        BAREMETAL_ACTIVATED_ENV_VAR: "1",
+        'ISAAC_ROS_PLATFORM': str(platform),
+    }
+
+
 def activate_baremetal(platform: Platform):
     """Activate baremetal Isaac ROS environment (directly on host system)."""
 
@@ -29,8 +38,7 @@ def activate_baremetal(platform: Platform):
 
     # Set environment variables
     env = os.environ.copy()
-    env[BAREMETAL_ACTIVATED_ENV_VAR] = "1"
-    env['ISAAC_ROS_PLATFORM'] = str(platform)
+    env.update(get_baremetal_environment(platform))
 
     # Spawn a new bash shell with the environment variables set
     subprocess.call(['bash'], env=env)
@@ -6,16 +6,60 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
-import subprocess
+import contextlib
+import copy
+import importlib
+import io
+import json
 import os
+import sys
+from typing import Any, Callable, Dict, List, Mapping, Optional
 
+import click
+
+from isaac_ros_cli import daemon_client
 from isaac_ros_cli.config_loader import load_config
 from isaac_ros_cli.platform import Platform
 
-RUN_DEV_SCRIPT = '/usr/lib/isaac-ros-cli/run_dev.py'
+RUN_DEV_DIR = '/usr/lib/isaac-ros-cli'
+
+
+def _import_run_dev_module(module_name: str):
+    """Import a module of the installed script directory, e.g. run_dev or its siblings."""
+    if RUN_DEV_DIR not in sys.path:
+        sys.path.insert(0, RUN_DEV_DIR)
+    return importlib.import_module(module_name)
+
+
+def _import_run_dev():
+    """Import run_dev.py (and its sibling modules) from the installed script directory."""
+    return _import_run_dev_module('run_dev')
 
 
-def _build_run_dev_command(
+def get_resources(cfg, resource_profile: Optional[str] = None) -> Dict[str, Any]:
+    """Return the resource settings of the dev container for a profile.
+
+    The settings of docker.run.resource_profiles[profile] are applied over docker.run.resources,
+    except for the 'default' profile that uses docker.run.resources alone.
+    """
+    run_cfg = cfg['docker']['run']
+    resource_profile = resource_profile or run_cfg.get('resource_profile') or 'default'
+    resources = copy.deepcopy(run_cfg.get('resources') or {})
+    if resource_profile == 'default':
+        return resources
+    profiles = run_cfg.get('resource_profiles') or {}
+    if resource_profile not in profiles:
+        raise ValueError(f"Unknown resource profile '{resource_profile}', expected one of "
+                         f"{', '.join(['default', *profiles])}")
+    overrides = profiles[resource_profile] or {}
+    ulimits = {**(resources.get('ulimits') or {}), **(overrides.get('ulimits') or {})}
+    resources.update(overrides)
+    if ulimits:
+        resources['ulimits'] = ulimits
+    return resources
+
+
+def _build_run_dev_args(
     cfg,
     build: bool,
     build_local: bool,
@@ -23,51 +67,67 @@ def _build_run_dev_command(
     use_cached_build_image: bool,
     no_cache: bool,
     verbose: bool,
-    isaac_ros_platform: Platform
+    isaac_ros_platform: Platform,
+    environ: Mapping[str, str] = os.environ,
+    resource_profile: Optional[str] = None,
+    middleware: Optional[str] = None
 ):
-    cmd = [
-        RUN_DEV_SCRIPT,
-    ]
+    # Imported on first use to keep CLI startup fast
+    from .middleware import get_generated_profiles_dir, get_middleware_environment
+
+    args = []
 
     env_keys = cfg['docker']['image']['base_image_keys'] + \
         cfg['docker']['image']['additional_image_keys']
 
     for key in env_keys:
-        cmd.extend(["--env", key])
+        args.extend(["--env", key])
 
     container_name = cfg['docker']['run']['container_name']
-    cmd.extend(["--container-name", container_name])
+    args.extend(["--container-name", container_name])
 
     platform = cfg['docker']['run']['platform']
     if platform == 'auto':
         platform = os.uname().machine
-    cmd.extend(["--platform", platform])
+    args.extend(["--platform", platform])
 
     # Pass the Isaac ROS platform for setting inside the container (convert to string)
-    cmd.extend(["--isaac-ros-platform", str(isaac_ros_platform)])
+    args.extend(["--isaac-ros-platform", str(isaac_ros_platform)])
 
-    if "ISAAC_DIR" in os.environ:
-        isaac_dir = os.environ['ISAAC_DIR']
-    elif "ISAAC_ROS_WS" in os.environ:
-        isaac_dir = os.environ['ISAAC_ROS_WS']
+    if "ISAAC_DIR" in environ:
+        isaac_dir = environ['ISAAC_DIR']
+    elif "ISAAC_ROS_WS" in environ:
+        isaac_dir = environ['ISAAC_ROS_WS']
     else:
         raise ValueError("ISAAC_DIR or ISAAC_ROS_WS environment variable is not set")
-    cmd.extend(["--isaac-dir", isaac_dir])
+    args.extend(["--isaac-dir", isaac_dir])
 
     # Forward runtime flags
     if build:
-        cmd.append("--build")
+        args.append("--build")
     if build_local:
-        cmd.append("--build-local")
+        args.append("--build-local")
     if push:
-        cmd.append("--push")
+        args.append("--push")
     if use_cached_build_image:
-        cmd.append("--use-cached-build-image")
+        args.append("--use-cached-build-image")
     if no_cache:
-        cmd.append("--no-cache")
+        args.append("--no-cache")
     if verbose:
-        cmd.append("--verbose")
-    return cmd
+        args.append("--verbose")
+    if cfg['docker']['run'].get('user_layer'):
+        args.append("--user-layer")
+    resources = get_resources(cfg, resource_profile)
+    # Reject unknown settings here rather than when run_dev builds the docker run command
+    _import_run_dev().get_resource_args(resources)
+    args.extend(["--resources", json.dumps(resources)])
+
+    middleware = middleware or (cfg['docker']['run'].get('middleware') or {}).get('profile')
+    args.extend(["--middleware-profiles-dir", str(get_generated_profiles_dir())])
+    if middleware:
+        for name, value in get_middleware_environment(cfg, middleware, resources).items():
+            args.extend(["--container-env", f"{name}={value}"])
+    return args
 
 
 def activate_docker(
@@ -77,14 +137,116 @@ def activate_docker(
     push: bool,
     use_cached_build_image: bool,
     no_cache: bool,
-    verbose: bool
+    verbose: bool,
+    resource_profile: Optional[str] = None,
+    middleware: Optional[str] = None
 ):
-    """Activate Docker-based Isaac ROS environment by delegating to run_dev.py."""
+    """Activate Docker-based Isaac ROS environment by running run_dev in-process.
+
+    On success this does not return: run_dev replaces the current process with docker.
+    """
+    _exec_through_daemon(platform, {
+        'build': build,
+        'build_local': build_local,
+        'push': push,
+        'use_cached_build_image': use_cached_build_image,
+        'no_cache': no_cache,
+        'verbose': verbose,
+        'resource_profile': resource_profile,
+        'middleware': middleware,
+    })
+
+    cfg = load_config()
+
+    try:
+        args = _build_run_dev_args(
+            cfg, build, build_local, push, use_cached_build_image, no_cache, verbose,
+            platform, resource_profile=resource_profile, middleware=middleware)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+    run_dev = _import_run_dev()
+    run_dev.main(args)
+
+
+def exec_in_docker(platform: Platform, command: List[str], verbose: bool):
+    """Run a command non-interactively in the Docker-based Isaac ROS environment.
+
+    The running dev container is reused, or started in the background so that later commands
+    reuse it. On success this does not return: run_dev replaces the current process with docker.
+    """
+    _exec_through_daemon(platform, {
+        'build': False,
+        'build_local': False,
+        'push': False,
+        'use_cached_build_image': False,
+        'no_cache': False,
+        'verbose': verbose,
+    }, command)
+
     cfg = load_config()
 
-    cmd = _build_run_dev_command(
-        cfg, build, build_local, push, use_cached_build_image, no_cache, verbose,
-        platform)
+    try:
+        args = _build_run_dev_args(
+            cfg, False, False, False, False, False, verbose, platform)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    args.extend(["--exec", *command])
+
+    run_dev = _import_run_dev()
+    run_dev.main(args)
 
-    # run run_dev.py
-    subprocess.run(cmd, check=False)
+
+def get_running_container_plan(
+    run_dev,
+    cfg: Dict[str, Any],
+    platform: Platform,
+    options: Dict[str, bool],
+    command: Optional[List[str]],
+    environ: Mapping[str, str],
+    inspect_dev_container: Callable
+) -> Optional[Dict[str, Any]]:
+    """Resolve an activation or exec that reuses the running dev container, without running it.
+
+    Returns:
+        dict: The docker 'command' to run with 'env' added, and the 'output' to show first, or
+            None if the dev container is not running and has to be started by run_dev.
+    """
+    args = _build_run_dev_args(cfg, isaac_ros_platform=platform, environ=environ, **options)
+    if command:
+        args.extend(["--exec", *command])
+    args = run_dev.parse_args(args)
+
+    container, image_id = inspect_dev_container(args.container_name, args.cached_image_name)
+    if not container or not container["State"].get("Running"):
+        return None
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        docker_command = run_dev.get_running_container_command(args, container, image_id)
+    return {'command': docker_command, 'env': run_dev.DOCKER_CLIENT_ENV,
+            'output': output.getvalue()}
+
+
+def _exec_through_daemon(platform: Platform, options: Dict[str, bool],
+                         command: Optional[List[str]] = None):
+    """Reuse the running dev container through the daemon's warm state, if it is running.
+
+    Returns only if the daemon is not running or the container has to be started first.
+    """
+    plan = daemon_client.request('docker_plan', {
+        **daemon_client.get_client_context(),
+        'platform': str(platform),
+        'options': options,
+        'command': command,
+    })
+    if not plan:
+        return
+
+    # Keep stdout for the command's own output
+    print(plan['output'], end='', file=sys.stderr if command else sys.stdout)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvpe(plan['command'][0], plan['command'], {**os.environ, **plan['env']})
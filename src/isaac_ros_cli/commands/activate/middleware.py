@@ -0,0 +1,179 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Fast DDS profiles selected with 'isaac-ros activate --middleware'.
+
+The shared memory profiles are generated on the host, sized to the /dev/shm of the dev
+container, and mounted into it. The UDP profile is the one shipped in the image.
+"""
+
+import os
+from pathlib import Path
+import re
+from typing import Any, Dict
+
+# Profiles shipped in the image, and the directory the generated ones are mounted at
+CONTAINER_PROFILES_DIR = "/usr/local/share/middleware_profiles"
+CONTAINER_GENERATED_PROFILES_DIR = f"{CONTAINER_PROFILES_DIR}/generated"
+SHIPPED_PROFILES = {'udp': 'rtps_udp_profile.xml'}
+
+# Generated profiles: whether they keep UDP for other hosts and use data sharing
+GENERATED_PROFILES = {
+    'shm_udp': {'udp': True, 'data_sharing': False},
+    'shm': {'udp': False, 'data_sharing': False},
+    'data_sharing': {'udp': True, 'data_sharing': True},
+}
+MIDDLEWARE_PROFILES = [*SHIPPED_PROFILES, *GENERATED_PROFILES]
+
+DEFAULT_SEGMENT_SIZE_MB = 32
+DEFAULT_MAX_PARTICIPANTS = 16
+
+_SIZE_UNITS = {'': 1, 'b': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+
+_PROFILE_TEMPLATE = """\
+<?xml version="1.0" encoding="UTF-8" ?>
+<!-- {name} profile generated by isaac-ros activate for a /dev/shm of {shm_mb} MB -->
+<profiles xmlns="http://www.eprosima.com/XMLSchemas/fastRTPS_Profiles" >
+    <transport_descriptors>
+        <transport_descriptor>
+            <transport_id>ShmTransport</transport_id>
+            <type>SHM</type>
+            <segment_size>{segment_size}</segment_size>
+        </transport_descriptor>{udp_descriptor}
+    </transport_descriptors>
+
+    <participant profile_name="{name}_transport_profile" is_default_profile="true">
+        <rtps>
+            <userTransports>
+                <transport_id>ShmTransport</transport_id>{udp_transport}
+            </userTransports>
+            <useBuiltinTransports>false</useBuiltinTransports>
+        </rtps>
+    </participant>{data_sharing}
+</profiles>
+"""
+
+_UDP_DESCRIPTOR = """
+        <transport_descriptor>
+            <transport_id>UdpTransport</transport_id>
+            <type>UDPv4</type>
+            <maxInitialPeersRange>400</maxInitialPeersRange>
+        </transport_descriptor>"""
+
+_UDP_TRANSPORT = """
+                <transport_id>UdpTransport</transport_id>"""
+
+_DATA_SHARING = """
+
+    <data_writer profile_name="{name}_writer_profile" is_default_profile="true">
+        <qos>
+            <data_sharing>
+                <kind>AUTOMATIC</kind>
+            </data_sharing>
+        </qos>
+        <historyMemoryPolicy>PREALLOCATED_WITH_REALLOC</historyMemoryPolicy>
+    </data_writer>
+
+    <data_reader profile_name="{name}_reader_profile" is_default_profile="true">
+        <qos>
+            <data_sharing>
+                <kind>AUTOMATIC</kind>
+            </data_sharing>
+        </qos>
+        <historyMemoryPolicy>PREALLOCATED_WITH_REALLOC</historyMemoryPolicy>
+    </data_reader>"""
+
+
+def get_generated_profiles_dir() -> Path:
+    """Return the per-user directory of generated profiles, mounted into the dev container."""
+    cache_home = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "isaac-ros-cli" / "middleware_profiles"
+
+
+def parse_size(size: Any) -> int:
+    """Return the bytes of a docker style size, e.g. 8g or 512m."""
+    match = re.fullmatch(r'\s*(\d+)\s*([bkmg]?)b?\s*', str(size).lower())
+    if not match:
+        raise ValueError(f"Invalid size '{size}', expected a number with an optional b, k, m or "
+                         "g suffix")
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2)]
+
+
+def get_container_shm_size(resources: Dict[str, Any]) -> int:
+    """Return the size of the dev container's /dev/shm, which is the host's unless sized."""
+    if resources.get('shm_size'):
+        return parse_size(resources['shm_size'])
+    shm = os.statvfs('/dev/shm')
+    return shm.f_blocks * shm.f_frsize
+
+
+def generate_profile(name: str, segment_size: int, shm_size: int) -> str:
+    """Return the Fast DDS profile XML of a generated profile."""
+    options = GENERATED_PROFILES[name]
+    return _PROFILE_TEMPLATE.format(
+        name=name,
+        shm_mb=shm_size // 1024 ** 2,
+        segment_size=segment_size,
+        udp_descriptor=_UDP_DESCRIPTOR if options['udp'] else '',
+        udp_transport=_UDP_TRANSPORT if options['udp'] else '',
+        data_sharing=_DATA_SHARING.format(name=name) if options['data_sharing'] else '',
+    )
+
+
+def check_segment_size(segment_size: int, max_participants: int, shm_size: int) -> None:
+    """Raise ValueError if the segments of max_participants participants do not fit in /dev/shm.
+
+    Every participant using the SHM transport allocates a segment of segment_size.
+    """
+    needed = segment_size * max_participants
+    if needed > shm_size:
+        raise ValueError(
+            f"{max_participants} participants with {segment_size // 1024 ** 2} MB shared memory "
+            f"segments need {needed // 1024 ** 2} MB, but the container's /dev/shm has "
+            f"{shm_size // 1024 ** 2} MB. Lower docker.run.middleware.shm_segment_size_mb or "
+            "max_participants, or raise docker.run.resources.shm_size.")
+
+
+def get_middleware_environment(cfg: Dict[str, Any], name: str,
+                               resources: Dict[str, Any]) -> Dict[str, str]:
+    """Write the profile if it is generated and return the container variables selecting it.
+
+    Raises:
+        ValueError: If the profile is unknown or its segments do not fit in /dev/shm
+    """
+    if name in SHIPPED_PROFILES:
+        return {'FASTRTPS_DEFAULT_PROFILES_FILE':
+                f"{CONTAINER_PROFILES_DIR}/{SHIPPED_PROFILES[name]}"}
+    if name not in GENERATED_PROFILES:
+        raise ValueError(f"Unknown middleware profile '{name}', expected one of "
+                         f"{', '.join(MIDDLEWARE_PROFILES)}")
+
+    middleware_cfg = cfg['docker']['run'].get('middleware') or {}
+    segment_size = int(middleware_cfg.get('shm_segment_size_mb', DEFAULT_SEGMENT_SIZE_MB)
+                       * 1024 ** 2)
+    shm_size = get_container_shm_size(resources)
+    check_segment_size(segment_size,
+                       middleware_cfg.get('max_participants', DEFAULT_MAX_PARTICIPANTS),
+                       shm_size)
+
+    filename = f"{name}_profile.xml"
+    profiles_dir = get_generated_profiles_dir()
+    profiles_dir.mkdir(parents=True, exist_ok=True)
+    profile = generate_profile(name, segment_size, shm_size)
+    path = profiles_dir / filename
+    # Left untouched when unchanged, the running container may be reading it
+    if not path.exists() or path.read_text() != profile:
+        path.write_text(profile)
+
+    environment = {
+        'FASTRTPS_DEFAULT_PROFILES_FILE': f"{CONTAINER_GENERATED_PROFILES_DIR}/{filename}"}
+    if GENERATED_PROFILES[name]['data_sharing']:
+        # Let rmw_fastrtps keep the history policy of the profile and loan messages to nodes
+        environment.update({'RMW_FASTRTPS_USE_QOS_FROM_XML': '1',
+                            'ROS_DISABLE_LOANED_MESSAGES': '0'})
+    return environment
@@ -0,0 +1,73 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Activation as a set of environment variable changes that callers can apply themselves."""
+
+import json
+import os
+import shlex
+from typing import Dict, Mapping, Optional
+
+# Variable name to new value, or None to unset it
+EnvironmentChanges = Dict[str, Optional[str]]
+
+OUTPUT_FORMATS = ['sh', 'json', 'dotenv']
+
+# Records what an activation changed so that deactivation can revert it
+ACTIVATED_ENV_VAR = "ISAAC_ROS_ACTIVATED_ENV"
+
+
+def prepend_path(entry: str, environ: Mapping[str, str]) -> str:
+    path = environ.get('PATH')
+    return f"{entry}{os.pathsep}{path}" if path else entry
+
+
+def get_activation_changes(changes: EnvironmentChanges,
+                           environ: Mapping[str, str]) -> EnvironmentChanges:
+    """Return the changes along with a record of the values they replace."""
+    record = {'saved': {name: environ.get(name) for name in changes if name != 'PATH'}}
+    # PATH is reverted by removing the entry, keeping whatever else was added since
+    if 'PATH' in changes:
+        record['path_entry'] = changes['PATH'].split(os.pathsep)[0]
+    return {**changes, ACTIVATED_ENV_VAR: json.dumps(record, sort_keys=True)}
+
+
+def get_deactivation_changes(environ: Mapping[str, str]) -> Optional[EnvironmentChanges]:
+    """Return the changes reverting an activation, or None if none is recorded."""
+    try:
+        record = json.loads(environ[ACTIVATED_ENV_VAR])
+    except (KeyError, ValueError):
+        return None
+
+    changes: EnvironmentChanges = dict(record['saved'])
+    path_entry = record.get('path_entry')
+    if path_entry:
+        entries = environ.get('PATH', '').split(os.pathsep)
+        if path_entry in entries:
+            entries.remove(path_entry)
+        changes['PATH'] = os.pathsep.join(entries)
+    changes[ACTIVATED_ENV_VAR] = None
+    return changes
+
+
+def format_changes(changes: EnvironmentChanges, output_format: str) -> str:
+    """Render changes as sh commands for eval, a JSON object or a dotenv file."""
+    match output_format:
+        case 'sh':
+            return "".join(
+                f"unset {name}\n" if value is None else f"export {name}={shlex.quote(value)}\n"
+                for name, value in changes.items())
+        case 'json':
+            return json.dumps(changes, indent=2) + "\n"
+        case 'dotenv':
+            # dotenv cannot unset variables, so they are emptied instead
+            return "".join(
+                f"{name}=\n" if value is None else f"{name}={json.dumps(value)}\n"
+                for name, value in changes.items())
+        case _:
+            raise ValueError(f"Unknown output format: {output_format}")
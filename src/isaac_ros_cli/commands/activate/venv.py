@@ -11,8 +11,10 @@ import subprocess
 import sys
 import os
 from pathlib import Path
+from typing import Dict, Mapping
 
 from isaac_ros_cli.platform import Platform
+from .print_env import EnvironmentChanges, prepend_path
 
 VENV_PATH = Path("/var/lib/isaac-ros-cli/isaac-ros")
 
@@ -26,6 +28,34 @@ def is_venv_activated():
         return False
 
 
+def get_venv_environment(platform: Platform) -> Dict[str, str]:
+    """Variables set for the Isaac ROS virtual environment on top of its activate script."""
+    return {
+        'ISAAC_ROS_VENV_PATH': str(VENV_PATH),
+        'ISAAC_ROS_PLATFORM': str(platform),
+        'PYTHONEXECUTABLE': str(VENV_PATH / "bin/python3"),
+    }
+
+
+def get_venv_activation_changes(platform: Platform,
+                                environ: Mapping[str, str]) -> EnvironmentChanges:
+    """Environment changes equivalent to activating the venv, without spawning a shell."""
+    if not (VENV_PATH / "bin").is_dir():
+        click.echo(f"Error: Isaac ROS virtual environment not found at '{VENV_PATH}'", err=True)
+        click.echo("Please reinstall the isaac-ros-cli package.", err=True)
+        sys.exit(1)
+
+    # Mirrors the venv's bin/activate
+    changes: EnvironmentChanges = {
+        'VIRTUAL_ENV': str(VENV_PATH),
+        'PATH': prepend_path(str(VENV_PATH / "bin"), environ),
+    }
+    if 'PYTHONHOME' in environ:
+        changes['PYTHONHOME'] = None
+    changes.update(get_venv_environment(platform))
+    return changes
+
+
 def activate_venv(platform: Platform):
     """Activate Python virtual environment for Isaac ROS."""
 
@@ -58,9 +88,7 @@ def activate_venv(platform: Platform):
 
     # Set environment variables for the script to use
     env = os.environ.copy()
-    env['ISAAC_ROS_VENV_PATH'] = str(VENV_PATH)
-    env['ISAAC_ROS_PLATFORM'] = str(platform)
-    env['PYTHONEXECUTABLE'] = str(VENV_PATH / "bin/python3")
+    env.update(get_venv_environment(platform))
 
     # Run the activation script
     subprocess.call(['bash', '--rcfile', activation_script], env=env)
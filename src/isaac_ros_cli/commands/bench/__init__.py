@@ -0,0 +1,51 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+import json
+import subprocess
+
+import click
+
+from .activate import bench_activation
+
+COLUMNS = ['PHASE', 'MIN', 'MEDIAN', 'P95', 'SUBPROCESSES']
+
+
+@click.group()
+def bench():
+    """Measure where the time of the CLI commands goes."""
+    pass
+
+
+@bench.command()
+@click.option('--runs', type=click.IntRange(min=1), default=5, show_default=True,
+              help='Number of times to run the activation pipeline.')
+@click.option('--json', 'as_json', is_flag=True,
+              help='Print the results as JSON, to compare them across versions.')
+def activate(runs: int, as_json: bool):
+    """Time each phase of the Docker activation, from loading the config to the entrypoint.
+
+    Starts a separate container running 'true' on every run, the dev container is left alone.
+    """
+    try:
+        result = bench_activation(runs)
+    except (RuntimeError, ValueError, subprocess.CalledProcessError) as e:
+        raise click.ClickException(str(e))
+    if as_json:
+        click.echo(json.dumps(result, indent=2))
+        return
+
+    rows = [COLUMNS]
+    for name, stats in result['phases'].items():
+        rows.append([name, *[f"{stats[key] * 1000:.1f} ms" for key in ('min', 'median', 'p95')],
+                     str(stats.get('subprocesses', '-'))])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(COLUMNS))]
+    for row in rows:
+        click.echo('  '.join([row[0].ljust(widths[0])]
+                             + [value.rjust(width) for value, width in zip(row[1:], widths[1:])]))
+    click.echo(f"{result['runs']} runs")
@@ -0,0 +1,224 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Phase timings of the Docker activation pipeline.
+
+Each run goes through the steps of 'isaac-ros activate' in order, without the state a previous
+run memoized in the process, and ends with a container running 'true' instead of a shell. The
+container is created and started separately, so that its creation and its entrypoint are timed
+apart, and the entrypoint's own step timings are read from the stopped container.
+"""
+
+import contextlib
+import math
+import os
+import platform as host_platform
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List
+
+from isaac_ros_cli import config_loader
+from isaac_ros_cli.platform import detect_platform
+from ..activate.docker import _build_run_dev_args, _import_run_dev
+
+BENCH_RESULT_VERSION = 1
+
+# Appended to the dev container name, so that benchmarks leave the dev container alone
+BENCH_CONTAINER_SUFFIX = "_bench"
+
+
+class _PhaseTimer:
+    """Times the phases of one run and counts the subprocesses each of them starts.
+
+    Phases may nest, the time and subprocesses of a nested phase only count for that phase.
+    """
+
+    def __init__(self):
+        self.durations_: Dict[str, float] = {}
+        self.subprocesses_: Dict[str, int] = {}
+        self.subprocess_count_ = 0
+        # Time and subprocesses of the nested phases of each running phase
+        self.stack_: List[List[float]] = []
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        nested = [0.0, 0]
+        self.stack_.append(nested)
+        subprocess_count = self.subprocess_count_
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            spawned = self.subprocess_count_ - subprocess_count
+            self.stack_.pop()
+            self.durations_[name] = self.durations_.get(name, 0.0) + elapsed - nested[0]
+            self.subprocesses_[name] = self.subprocesses_.get(name, 0) + spawned - nested[1]
+            if self.stack_:
+                self.stack_[-1][0] += elapsed
+                self.stack_[-1][1] += spawned
+
+    @contextlib.contextmanager
+    def timing_calls(self, module, function_name: str, name: str) -> Iterator[None]:
+        """Time every call of a module's function as the phase name."""
+        function = getattr(module, function_name)
+
+        def timed_function(*args, **kwargs):
+            with self.phase(name):
+                return function(*args, **kwargs)
+
+        setattr(module, function_name, timed_function)
+        try:
+            yield
+        finally:
+            setattr(module, function_name, function)
+
+    @contextlib.contextmanager
+    def counting_subprocesses(self) -> Iterator[None]:
+        """Count every subprocess started through subprocess.Popen, which run() uses too."""
+        timer = self
+
+        class CountingPopen(subprocess.Popen):
+            def __init__(self, *args, **kwargs):
+                timer.subprocess_count_ += 1
+                super().__init__(*args, **kwargs)
+
+        original_popen = subprocess.Popen
+        subprocess.Popen = CountingPopen
+        try:
+            yield
+        finally:
+            subprocess.Popen = original_popen
+
+
+def run_activation(run_dev, environ, timer: _PhaseTimer) -> None:
+    """Go through the activation pipeline once, recording its phases in timer."""
+    import build_image_layers
+
+    with timer.phase('config'):
+        config_loader._memoized_config = None
+        cfg = config_loader.load_config()
+
+    with timer.phase('platform'):
+        platform = detect_platform()
+
+    args = run_dev.parse_args(_build_run_dev_args(
+        cfg, False, False, False, False, False, False, platform, environ))
+    args.container_name += BENCH_CONTAINER_SUFFIX
+    args.cached_image_name += BENCH_CONTAINER_SUFFIX
+
+    with timer.phase('common_config'):
+        common_config = run_dev.get_isaac_ros_common_config_values(
+            run_dev.get_isaac_ros_common_config_path())
+        env_list = run_dev.get_build_order(
+            str(common_config['image_key_order'][0]).split('.'), args.env)
+
+    # Resolved once per process by activate, sourcing the bash config on the way
+    build_image_layers._resolve_image_build_plan.cache_clear()
+    with timer.timing_calls(build_image_layers, 'extract_env_vars', 'bash_config'), \
+            timer.phase('dockerfile_hashing'):
+        plan_fingerprint = run_dev.get_build_plan_fingerprint(env_list, args.isaac_ros_platform)
+
+    with timer.phase('docker_checks'):
+        run_dev.check_docker_running()
+
+    with timer.phase('login'):
+        cache_from_registry_name = build_image_layers.check_docker_logins(
+            common_config['cache_from_registry_names'], fail_on_anon=False) or "local"
+
+    with timer.phase('pull'):
+        base_name = run_dev.get_image_name(
+            cache_from_registry_name, env_list, args.isaac_ros_platform, include_hash=True)
+        base_image_id = run_dev.make_docker_image_available(base_name, args.cached_image_name)
+        if not base_image_id:
+            raise RuntimeError(f"Docker image {base_name} is not available. Run "
+                               "'isaac-ros activate --build' first.")
+
+    isaac_dir = run_dev.get_isaac_dir(args)
+    labels = run_dev.get_container_labels(
+        isaac_dir, base_image_id, plan_fingerprint, args.isaac_ros_platform, args.resources)
+    run_command = run_dev.get_docker_run_command(
+        args, args.container_name, base_name, isaac_dir, labels, command=["true"])
+    # Created and started in two steps, and only removed once its timings are read
+    create_command = ["docker", "create",
+                      *[arg for arg in run_command[2:] if arg != "--rm"]]
+
+    subprocess.run(["docker", "rm", "--force", args.container_name],
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with timer.phase('container_create'):
+            subprocess.run(create_command, stdout=subprocess.DEVNULL, check=True,
+                           env=run_dev.get_docker_env())
+        with timer.phase('container_run'):
+            subprocess.run(["docker", "start", "--attach", args.container_name], check=True)
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            profile_path = os.path.join(tempdir, "profile")
+            result = subprocess.run(
+                ["docker", "cp", f"{args.container_name}:{run_dev.ENTRYPOINT_PROFILE_FILE}",
+                 profile_path],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if result.returncode == 0:
+                with open(profile_path, "r") as f:
+                    for step in run_dev.parse_entrypoint_profile(f.read()):
+                        timer.durations_[f"entrypoint:{step['step']}"] = step['duration']
+    finally:
+        subprocess.run(["docker", "rm", "--force", args.container_name],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Return the nearest-rank percentile of values."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percentile / 100 * len(ordered)) - 1)]
+
+
+def bench_activation(runs: int, environ=os.environ) -> Dict[str, Any]:
+    """Run the activation pipeline runs times and return the statistics of each phase."""
+    run_dev = _import_run_dev()
+    samples: Dict[str, List[float]] = {}
+    subprocesses: Dict[str, List[int]] = {}
+    totals = []
+    # Keep stdout for the results, everything the pipeline prints goes to stderr
+    with run_dev.stdout_to_stderr():
+        for _ in range(runs):
+            timer = _PhaseTimer()
+            start = time.perf_counter()
+            with timer.counting_subprocesses():
+                run_activation(run_dev, environ, timer)
+            totals.append(time.perf_counter() - start)
+            for name, duration in timer.durations_.items():
+                samples.setdefault(name, []).append(duration)
+                subprocesses.setdefault(name, []).append(timer.subprocesses_.get(name, 0))
+
+    phases = {}
+    for name, durations in [*samples.items(), ('total', totals)]:
+        phases[name] = {
+            'min': round(min(durations), 4),
+            'median': round(statistics.median(durations), 4),
+            'p95': round(_percentile(durations, 95), 4),
+        }
+        if name in subprocesses:
+            phases[name]['subprocesses'] = max(subprocesses[name])
+
+    try:
+        from importlib.metadata import version
+        cli_version = version('isaac-ros-cli')
+    except Exception:
+        cli_version = None
+    return {
+        'version': BENCH_RESULT_VERSION,
+        'benchmark': 'activate',
+        'cli_version': cli_version,
+        'host': {'hostname': host_platform.node(), 'machine': host_platform.machine(),
+                 'kernel': host_platform.release(), 'cpus': os.cpu_count()},
+        'runs': runs,
+        'phases': phases,
+    }
@@ -0,0 +1,95 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+import click
+
+from isaac_ros_cli import daemon_client
+
+START_TIMEOUT_SECONDS = 10
+
+
+def _get_log_path() -> Path:
+    cache_home = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "isaac-ros-cli" / "daemon.log"
+
+
+@click.group()
+def daemon():
+    """Manage the optional per-user daemon that keeps CLI state warm.
+
+    While the daemon is running, activating or running commands in an already running Docker
+    container takes a single request to it. Every command works without the daemon. Set
+    ISAAC_ROS_NO_DAEMON=1 to bypass it.
+    """
+    pass
+
+
+@daemon.command()
+def run():
+    """Run the daemon in the foreground, e.g. from a systemd user service."""
+    from .server import serve
+
+    serve()
+
+
+@daemon.command()
+def start():
+    """Start the daemon in the background."""
+    if daemon_client.request('ping') is not None:
+        click.echo("The daemon is already running.")
+        return
+
+    log_path = _get_log_path()
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, 'a') as log:
+        subprocess.Popen(
+            [sys.executable, "-c", "from isaac_ros_cli.commands.daemon.server import serve; "
+                                   "serve()"],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        info = daemon_client.request('ping')
+        if info is not None:
+            click.echo(f"Started the daemon (pid {info['pid']}) on "
+                       f"{daemon_client.get_socket_path()}")
+            return
+        time.sleep(0.1)
+    click.echo(f"Error: The daemon did not start, see {log_path}", err=True)
+    sys.exit(1)
+
+
+@daemon.command()
+def stop():
+    """Stop the daemon."""
+    if daemon_client.request('ping') is None:
+        click.echo("The daemon is not running.")
+        return
+    daemon_client.request('shutdown')
+    click.echo("Stopped the daemon.")
+
+
+@daemon.command()
+def status():
+    """Show whether the daemon is running."""
+    info = daemon_client.request('ping')
+    if info is None:
+        click.echo("The daemon is not running.")
+        sys.exit(1)
+    click.echo(f"The daemon (pid {info['pid']}) is running on {daemon_client.get_socket_path()}, "
+               f"up {time.time() - info['started']:.0f}s, served {info['requests']} requests")
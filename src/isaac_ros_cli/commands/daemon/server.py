@@ -0,0 +1,246 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Per-user daemon keeping the CLI's state warm between invocations.
+
+The daemon holds the imported run_dev modules, the parsed configuration (re-read only when a
+source file changes) and a persistent connection to the Docker Engine API, so resolving an
+activation or exec into a running container is a single socket round trip.
+"""
+
+import contextlib
+import http.client
+import json
+import os
+from pathlib import Path
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from isaac_ros_cli import daemon_client
+from isaac_ros_cli.config_loader import load_config
+from isaac_ros_cli.platform import Platform
+from ..activate.docker import _import_run_dev, _import_run_dev_module, get_running_container_plan
+from ..status import get_status
+
+DOCKER_SOCKET_PATH = "/var/run/docker.sock"
+
+# Read once when the daemon starts, requests of clients with other values are done in-process
+DAEMON_ENV_VARS = ("HOME", "USER", "DOCKER_HOST", "DOCKER_CONTEXT", "DOCKER_CONFIG")
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str):
+        super().__init__("localhost")
+        self.socket_path_ = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path_)
+
+
+class DockerEngineClient:
+    """Minimal Docker Engine API client reusing one connection to the local docker socket."""
+
+    def __init__(self, socket_path: str):
+        self.socket_path_ = socket_path
+        self.connection_: Optional[_UnixHTTPConnection] = None
+
+    @classmethod
+    def from_environment(cls) -> Optional['DockerEngineClient']:
+        """Return a client for the local socket, or None if docker is configured elsewhere."""
+        docker_host = os.getenv("DOCKER_HOST", f"unix://{DOCKER_SOCKET_PATH}")
+        if not docker_host.startswith("unix://"):
+            return None
+        try:
+            with open(Path.home() / ".docker" / "config.json", "r") as f:
+                current_context = json.load(f).get("currentContext", "default")
+        except (OSError, ValueError):
+            current_context = "default"
+        # Other contexts may point at remote engines, leave those to the docker CLI
+        if current_context != "default":
+            return None
+        return cls(docker_host[len("unix://"):])
+
+    def get(self, path: str) -> Optional[Any]:
+        """GET a path of the API and return the decoded JSON, or None if it does not exist."""
+        for attempt in range(2):
+            if self.connection_ is None:
+                self.connection_ = _UnixHTTPConnection(self.socket_path_)
+            try:
+                self.connection_.request("GET", path)
+                response = self.connection_.getresponse()
+                body = response.read()
+                break
+            except (OSError, http.client.HTTPException):
+                # The engine closed the idle connection (or restarted), reconnect once
+                self.connection_.close()
+                self.connection_ = None
+                if attempt:
+                    raise
+        if response.status == 404:
+            return None
+        if response.status != 200:
+            raise RuntimeError(f"Docker Engine API returned {response.status} for {path}")
+        return json.loads(body)
+
+    def inspect_container(self, name: str) -> Optional[Dict]:
+        return self.get(f"/containers/{quote(name, safe='')}/json")
+
+    def inspect_image(self, name: str) -> Optional[Dict]:
+        return self.get(f"/images/{quote(name, safe='/:')}/json")
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Serves one request per connection, one at a time."""
+
+    def __init__(self, socket_path: Path):
+        self.socket_path_ = socket_path
+        self.started_ = time.time()
+        self.requests_ = 0
+        self.run_dev_ = _import_run_dev()
+        self.docker_ = DockerEngineClient.from_environment()
+        self.environ_ = {name: os.environ.get(name) for name in DAEMON_ENV_VARS}
+        self.workspace_ = None
+        # Reinstalling the CLI changes these, after which this daemon runs outdated code
+        self.code_files_ = [Path(__file__), Path(self.run_dev_.__file__)]
+        self.code_signature_ = self._get_code_signature()
+        super().__init__(str(socket_path), _RequestHandler)
+
+    def _get_code_signature(self):
+        return [path.stat().st_mtime_ns for path in self.code_files_]
+
+    def is_outdated(self) -> bool:
+        try:
+            return self._get_code_signature() != self.code_signature_
+        except OSError:
+            return True
+
+    def inspect_dev_container(self, container_name: str,
+                              image_name: str) -> Tuple[Optional[Dict], Optional[str]]:
+        if self.docker_ is None:
+            return self.run_dev_.inspect_dev_container(container_name, image_name)
+        image = self.docker_.inspect_image(image_name)
+        return self.docker_.inspect_container(container_name), image and image.get("Id")
+
+    @contextlib.contextmanager
+    def client_context(self, params) -> Iterator[bool]:
+        """Resolve a request in the working directory and environment of its client.
+
+        Yields whether the request can be answered by this daemon.
+        """
+        environ = params.get('environ')
+        if environ is None:
+            yield True
+            return
+        if any(environ.get(name) != value for name, value in self.environ_.items()):
+            yield False
+            return
+
+        workspace = (params.get('cwd'), environ.get('ISAAC_DIR'), environ.get('ISAAC_ROS_WS'))
+        if workspace != self.workspace_:
+            # The Dockerfiles are resolved from the common config of the workspace
+            _import_run_dev_module('build_image_layers')._resolve_image_build_plan.cache_clear()
+            self.workspace_ = workspace
+        saved_environ, saved_cwd = dict(os.environ), os.getcwd()
+        try:
+            os.environ.clear()
+            os.environ.update(environ)
+            if params.get('cwd'):
+                os.chdir(params['cwd'])
+            yield True
+        finally:
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_environ)
+
+    def handle_ping(self, params) -> Dict[str, Any]:
+        return {
+            'pid': os.getpid(),
+            'started': self.started_,
+            'requests': self.requests_,
+            'docker_api': self.docker_ is not None,
+        }
+
+    def handle_shutdown(self, params) -> None:
+        # shutdown() waits for serve_forever() to return, so it cannot run on this thread
+        threading.Thread(target=self.shutdown).start()
+
+    def handle_docker_plan(self, params) -> Optional[Dict[str, Any]]:
+        return get_running_container_plan(
+            self.run_dev_,
+            load_config(),
+            Platform(params['platform']),
+            params['options'],
+            params['command'],
+            params['environ'],
+            self.inspect_dev_container,
+        )
+
+    def handle_status(self, params) -> Dict[str, Any]:
+        status = get_status(lambda: self.run_dev_, self.inspect_dev_container, os.environ)
+        status['daemon'] = self.handle_ping(params)
+        return status
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server: DaemonServer = self.server
+        try:
+            if daemon_client.get_peer_uid(self.connection) != os.getuid():
+                raise PermissionError("Requests are only served to the user of the daemon")
+            message = json.loads(self.rfile.readline())
+            if message.get('protocol') != daemon_client.PROTOCOL_VERSION:
+                raise ValueError(f"Unsupported protocol version {message.get('protocol')}")
+            if server.is_outdated():
+                server.handle_shutdown({})
+                raise RuntimeError("The daemon is outdated and shutting down")
+            handler = getattr(server, f"handle_{message['method']}", None)
+            if handler is None:
+                raise ValueError(f"Unknown method {message['method']}")
+            server.requests_ += 1
+            params = message.get('params') or {}
+            with server.client_context(params) as answerable:
+                # None lets the client do the work itself
+                response = {'result': handler(params) if answerable else None}
+        except Exception as e:
+            response = {'error': f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+def serve(socket_path: Optional[Path] = None):
+    """Serve requests on the per-user socket until stopped."""
+    socket_path = socket_path or daemon_client.get_socket_path()
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    try:
+        daemon_client.check_socket_dir(socket_path.parent)
+    except PermissionError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if daemon_client.request('ping') is not None:
+        print(f"Error: The daemon is already running on {socket_path}", file=sys.stderr)
+        sys.exit(1)
+    # Left behind by a daemon that did not exit cleanly
+    socket_path.unlink(missing_ok=True)
+
+    # Warm the configuration before taking requests
+    load_config()
+    server = DaemonServer(socket_path)
+    os.chmod(socket_path, 0o600)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Isaac ROS CLI daemon (pid {os.getpid()}) listening on {socket_path}", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
@@ -0,0 +1,76 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+import os
+import sys
+
+import click
+
+from isaac_ros_cli.config_loader import load_environment_mode
+from isaac_ros_cli.platform import detect_platform
+from .activate.baremetal import get_baremetal_environment
+from .activate.docker import exec_in_docker
+from .activate.venv import get_venv_activation_changes, is_venv_activated
+
+
+def _exec(command, environ):
+    """Replace the current process with command, passing its exit code through."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        os.execvpe(command[0], command, environ)
+    except OSError as e:
+        click.echo(f"Error: Failed to run '{command[0]}': {e.strerror}", err=True)
+        # Same exit codes as the shell for missing and non-executable commands
+        sys.exit(127 if isinstance(e, FileNotFoundError) else 126)
+
+
+@click.command('exec', context_settings={'ignore_unknown_options': True,
+                                         'allow_interspersed_args': False})
+@click.option('--verbose', is_flag=True, help='Enable verbose output.')
+@click.argument('command', nargs=-1, required=True, type=click.UNPROCESSED)
+def exec_command(verbose: bool, command):
+    """Run COMMAND non-interactively in the Isaac ROS environment.
+
+    In Docker mode the command runs in the dev container, which is started in the background
+    if it is not already running so that later commands reuse it. The exit code of the command
+    is passed through, and stdout only carries the command's own output.
+
+    \b
+    Example:
+        isaac-ros exec -- colcon build --symlink-install
+    """
+    command = list(command)
+    mode = load_environment_mode()
+
+    environ = dict(os.environ)
+    match mode:
+        case 'uninitialized':
+            click.echo("Error: Environment mode is not set.", err=True)
+            click.echo("Please run 'sudo isaac-ros init <environment>' first.", err=True)
+            sys.exit(1)
+        case 'docker':
+            exec_in_docker(detect_platform(), command, verbose)
+        case 'docker-activated':
+            # Already inside the container
+            pass
+        case 'venv':
+            if not is_venv_activated():
+                changes = get_venv_activation_changes(detect_platform(), environ)
+                for name, value in changes.items():
+                    if value is None:
+                        environ.pop(name, None)
+                    else:
+                        environ[name] = value
+        case 'baremetal':
+            environ.update(get_baremetal_environment(detect_platform()))
+        case _:
+            click.echo(f"Error: Invalid environment configuration: {mode}", err=True)
+            sys.exit(1)
+
+    _exec(command, environ)
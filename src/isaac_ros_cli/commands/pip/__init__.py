@@ -0,0 +1,158 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+import os
+from pathlib import Path
+import sys
+
+import click
+
+from isaac_ros_cli.platform import Platform, detect_platform
+from .lock import (LOCK_DIR, SHIM_REQUIREMENTS_FILE, compile_lock as _compile_lock,
+                   file_sha256, get_lock_path, load_fresh_lock, PipShimLock,
+                   read_constraint_pins, read_shim_requirements)
+from .shims import CONSTRAINT_FILE, DEFAULT_DOWNLOAD_JOBS, install_shims as _install_shims
+
+PLATFORM_CHOICES = [str(platform) for platform in Platform]
+
+
+def _lock_file_options(command):
+    """Options locating the constraints, shim requirements and lock files."""
+    options = [
+        click.option('--constraints', type=click.Path(exists=True, dir_okay=False,
+                                                      path_type=Path),
+                     default=CONSTRAINT_FILE, show_default=True,
+                     help='Pip shim constraints file.'),
+        click.option('--requirements', type=click.Path(exists=True, dir_okay=False,
+                                                       path_type=Path),
+                     default=SHIM_REQUIREMENTS_FILE, show_default=True,
+                     help='File listing the pip shim packages to lock.'),
+        click.option('--lock-dir', type=click.Path(file_okay=False, path_type=Path),
+                     default=LOCK_DIR, show_default=True,
+                     help='Directory holding one lock file per platform.'),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+@click.group()
+def pip():
+    """Manage Isaac ROS pip shim packages."""
+    pass
+
+
+@pip.command('install-shims')
+@click.argument('specs', nargs=-1)
+@click.option('-r', '--requirement', 'requirement_files', multiple=True,
+              type=click.Path(exists=True, dir_okay=False),
+              help='Read package specifications from the given file.')
+@click.option('--jobs', type=click.IntRange(min=1), default=DEFAULT_DOWNLOAD_JOBS,
+              show_default=True, help='Number of parallel downloads.')
+@click.option('--offline', is_flag=True,
+              help='Install only from the local wheelhouse, without querying the index.')
+def install_shims(specs, requirement_files, jobs, offline):
+    """Install many pip shim packages in a single resolver pass.
+
+    Packages are downloaded in parallel into the shared wheelhouse and installed from it, so
+    later installs of the same packages work offline.
+    """
+    specs = list(specs)
+    for requirement_file in requirement_files:
+        with open(requirement_file, 'r') as f:
+            for line in f:
+                line = line.partition('#')[0].strip()
+                if line:
+                    specs.append(line)
+
+    if not specs:
+        click.echo("Error: No pip shim package specification provided", err=True)
+        sys.exit(1)
+
+    sys.exit(_install_shims(specs, jobs=jobs, offline=offline))
+
+
+@pip.command('compile-lock')
+@click.option('--platform', 'platforms', multiple=True, type=click.Choice(PLATFORM_CHOICES),
+              help='Platform to lock for. Defaults to all platforms.')
+@_lock_file_options
+@click.option('--index-url', help='Base URL of the package index to resolve against.')
+@click.option('--extra-index-url', 'extra_index_urls', multiple=True,
+              help='Extra package index to resolve against.')
+@click.option('--jobs', type=click.IntRange(min=1), default=DEFAULT_DOWNLOAD_JOBS,
+              show_default=True, help='Number of parallel resolutions.')
+def compile_lock(platforms, constraints, requirements, lock_dir, index_url, extra_index_urls,
+                 jobs):
+    """Compile the pip shims into a hash-pinned lock for each platform.
+
+    Shims installed from a lock skip pip's resolver entirely.
+    """
+    pip_args = ['--index-url', index_url] if index_url else []
+    for extra_index_url in extra_index_urls:
+        pip_args.extend(['--extra-index-url', extra_index_url])
+
+    shims = read_shim_requirements(requirements)
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    for platform in platforms or PLATFORM_CHOICES:
+        lock = _compile_lock(Platform(platform), constraints, shims, pip_args, jobs)
+        lock_path = get_lock_path(Platform(platform), lock_dir)
+        lock_path.write_text(lock.dump())
+        click.echo(f"Locked {len(lock.packages_)} packages in {lock_path}")
+
+
+@pip.command('check-lock')
+@click.option('--platform', 'platforms', multiple=True, type=click.Choice(PLATFORM_CHOICES),
+              help='Platform to check. Defaults to all platforms.')
+@_lock_file_options
+def check_lock(platforms, constraints, requirements, lock_dir):
+    """Check that the pip shim locks still match the constraints and shims."""
+    constraint_pins = read_constraint_pins(constraints)
+    shims = read_shim_requirements(requirements)
+    constraints_sha256 = file_sha256(constraints)
+
+    drifted = False
+    for platform in platforms or PLATFORM_CHOICES:
+        lock_path = get_lock_path(Platform(platform), lock_dir)
+        if not lock_path.exists():
+            click.echo(f"{platform}: no lock at {lock_path}", err=True)
+            drifted = True
+            continue
+
+        lock = PipShimLock.load(lock_path)
+        problems = lock.check_drift(constraint_pins, shims)
+        for problem in problems:
+            click.echo(f"{platform}: {problem}", err=True)
+        if not problems and lock.constraints_sha256_ != constraints_sha256:
+            click.echo(f"{platform}: constraints changed since the lock was compiled, "
+                       "but all locked pins still match")
+        drifted = drifted or bool(problems)
+        if not problems:
+            click.echo(f"{platform}: {lock_path} is up to date")
+
+    sys.exit(1 if drifted else 0)
+
+
+@pip.command('export-lock')
+@click.argument('spec')
+@click.option('--platform', type=click.Choice(PLATFORM_CHOICES),
+              help='Platform of the lock. Defaults to the current platform.')
+@_lock_file_options
+def export_lock(spec, platform, constraints, requirements, lock_dir):
+    """Print the locked requirements of a single pip shim.
+
+    Exits with an error if the shim is not locked, the lock has drifted or SPEC asks for extras
+    or a version other than the locked one, in which case it has to be installed through the
+    resolver.
+    """
+    platform = Platform(platform or os.getenv('ISAAC_ROS_PLATFORM') or str(detect_platform()))
+    lock = load_fresh_lock(platform, lock_dir, constraints, requirements)
+    locked_requirements = lock.requirements_for(spec) if lock else None
+    if not locked_requirements:
+        click.echo(f"Error: No up to date {platform} lock for {spec}", err=True)
+        sys.exit(1)
+    click.echo("\n".join(locked_requirements))
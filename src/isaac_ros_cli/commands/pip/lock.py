@@ -0,0 +1,237 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Pre-resolved, hash-pinned locks of the pip shim packages for each platform.
+
+A lock records the full dependency closure of every shim package under the shim constraints,
+so shims can be installed with ``--no-deps --require-hashes`` without running pip's resolver.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+from pathlib import Path
+import re
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+import click
+
+from isaac_ros_cli.platform import Platform
+from .shims import CONSTRAINT_FILE
+
+SHIM_REQUIREMENTS_FILE = Path("/usr/share/isaac-ros-cli/pip_shim_requirements.txt")
+LOCK_DIR = Path("/usr/share/isaac-ros-cli/pip_shim_locks")
+
+# Interpreter and wheel platforms targeted on each Isaac ROS platform (Ubuntu 24.04, glibc 2.39)
+PYTHON_VERSION = "3.12"
+PLATFORM_WHEEL_TAGS: Dict[Platform, List[str]] = {
+    Platform.AMD64: ["manylinux_2_39_x86_64", "linux_x86_64"],
+    Platform.ARM64_JETPACK: ["manylinux_2_39_aarch64", "linux_aarch64"],
+    Platform.ARM64_FASTOS: ["manylinux_2_39_aarch64", "linux_aarch64"],
+}
+
+_PIN_PATTERN = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)\s*==\s*([^\s;#]+)")
+_NAME_PATTERN = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+_SPEC_PATTERN = re.compile(
+    r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[([^\]]*)\])?\s*(?:===?\s*([^\s;,]+))?\s*$")
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name as in PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def get_lock_path(platform: Platform, lock_dir: Path = LOCK_DIR) -> Path:
+    return lock_dir / f"{platform}.txt"
+
+
+def file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def read_constraint_pins(path: Path) -> Dict[str, str]:
+    """Return the exact version pins of a constraints file by normalized name."""
+    pins = {}
+    for line in path.read_text().splitlines():
+        match = _PIN_PATTERN.match(line.strip())
+        if match:
+            pins[normalize_name(match.group(1))] = match.group(2)
+    return pins
+
+
+def read_shim_requirements(path: Path) -> List[str]:
+    """Return the normalized names of the shim packages listed in a requirements file."""
+    names = []
+    for line in path.read_text().splitlines():
+        line = line.partition("#")[0].strip()
+        if line:
+            names.append(normalize_name(_NAME_PATTERN.match(line).group(1)))
+    return names
+
+
+class LockedPackage:
+    """A single pinned distribution of a lock and the shims that depend on it."""
+
+    def __init__(self, name: str, version: str, hashes: List[str], shims: List[str]):
+        self.name_ = name
+        self.version_ = version
+        self.hashes_ = hashes
+        self.shims_ = shims
+
+    def requirement(self) -> str:
+        hashes = " ".join(f"--hash=sha256:{digest}" for digest in self.hashes_)
+        return f"{self.name_}=={self.version_} {hashes}"
+
+
+class PipShimLock:
+    """Fully resolved pip shim dependency closure for one platform."""
+
+    def __init__(self, platform: str, constraints_sha256: str, shims: List[str],
+                 packages: Dict[str, LockedPackage]):
+        self.platform_ = platform
+        self.constraints_sha256_ = constraints_sha256
+        self.shims_ = shims
+        self.packages_ = packages
+
+    @classmethod
+    def load(cls, path: Path) -> 'PipShimLock':
+        header = {}
+        packages = {}
+        for line in path.read_text().splitlines():
+            if line.startswith("# ") and ": " in line:
+                key, _, value = line[2:].partition(": ")
+                header[key] = value
+            elif line.strip() and not line.startswith("#"):
+                requirement, _, via = line.partition("  # via: ")
+                pin, *hashes = requirement.split()
+                name, _, version = pin.partition("==")
+                packages[name] = LockedPackage(
+                    name, version,
+                    [digest.removeprefix("--hash=sha256:") for digest in hashes],
+                    via.split(", ") if via else [])
+        return cls(header.get("platform", ""), header.get("constraints-sha256", ""),
+                   header.get("shims", "").split(), packages)
+
+    def dump(self) -> str:
+        lines = [
+            "# Isaac ROS pip shim lock, generated by 'isaac-ros pip compile-lock'. Do not edit.",
+            f"# platform: {self.platform_}",
+            f"# constraints-sha256: {self.constraints_sha256_}",
+            f"# shims: {' '.join(self.shims_)}",
+        ]
+        for name in sorted(self.packages_):
+            package = self.packages_[name]
+            lines.append(f"{package.requirement()}  # via: {', '.join(package.shims_)}")
+        return "\n".join(lines) + "\n"
+
+    def check_drift(self, constraint_pins: Dict[str, str], shims: List[str]) -> List[str]:
+        """Return the differences between this lock and the current constraints and shims."""
+        problems = []
+        for name in sorted(set(shims) - set(self.shims_)):
+            problems.append(f"shim '{name}' is not locked")
+        for name in sorted(set(self.shims_) - set(shims)):
+            problems.append(f"shim '{name}' is locked but no longer required")
+        for name, package in sorted(self.packages_.items()):
+            pinned = constraint_pins.get(name)
+            if pinned is not None and pinned != package.version_:
+                problems.append(
+                    f"'{name}' is locked at {package.version_} but constrained to {pinned}")
+        return problems
+
+    def requirements_for(self, spec: str) -> Optional[List[str]]:
+        """Return the hash-pinned requirements installing a shim spec, or None if not locked.
+
+        The lock holds the closure of the bare shim at one version, so only the name or an exact
+        pin of the locked version match. Extras, ranges and markers go through the resolver.
+        """
+        match = _SPEC_PATTERN.match(spec)
+        if not match or (match.group(2) or "").strip():
+            return None
+        name = normalize_name(match.group(1))
+        package = self.packages_.get(name)
+        if name not in self.shims_ or package is None:
+            return None
+        if match.group(3) is not None and match.group(3) != package.version_:
+            return None
+        return [locked.requirement() for _, locked in sorted(self.packages_.items())
+                if name in locked.shims_]
+
+
+def _resolve(platform: Platform, constraint_files: List[Path], requirements: List[str],
+             pip_args: List[str]) -> List[Dict]:
+    """Resolve requirements for the target platform and return the pip report items."""
+    platform_args = [arg for tag in PLATFORM_WHEEL_TAGS[platform] for arg in ("--platform", tag)]
+    constraint_args = [arg for path in constraint_files for arg in ("--constraint", str(path))]
+    with tempfile.TemporaryDirectory() as target:
+        cmd = [
+            sys.executable, "-m", "pip", "install", "--dry-run", "--quiet", "--report", "-",
+            "--ignore-installed", "--only-binary=:all:", "--target", target,
+            "--python-version", PYTHON_VERSION, "--implementation", "cp",
+            *platform_args, *constraint_args, *pip_args, *requirements,
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        click.echo(result.stderr, err=True)
+        raise click.ClickException(
+            f"Failed to resolve {' '.join(requirements)} for {platform}.")
+    return json.loads(result.stdout).get("install", [])
+
+
+def compile_lock(platform: Platform, constraints: Path, shims: List[str], pip_args: List[str],
+                 jobs: int) -> PipShimLock:
+    """Resolve all shims together, then attribute each locked package to the shims needing it."""
+    click.echo(f"Resolving {len(shims)} pip shims for {platform}")
+    packages = {}
+    for item in _resolve(platform, [constraints], shims, pip_args):
+        name = normalize_name(item["metadata"]["name"])
+        hashes = item["download_info"].get("archive_info", {}).get("hashes", {})
+        if "sha256" not in hashes:
+            raise click.ClickException(f"No sha256 hash available for '{name}'.")
+        packages[name] = LockedPackage(name, item["metadata"]["version"],
+                                       [hashes["sha256"]], [])
+
+    # Per-shim closures, pinned to the joint resolution so they all agree on versions
+    with tempfile.NamedTemporaryFile("w", suffix=".txt") as pins:
+        pins.write("".join(f"{name}=={package.version_}\n"
+                           for name, package in packages.items()))
+        pins.flush()
+
+        def closure(shim):
+            items = _resolve(platform, [constraints, Path(pins.name)], [shim], pip_args)
+            return shim, [normalize_name(item["metadata"]["name"]) for item in items]
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for shim, names in executor.map(closure, shims):
+                for name in names:
+                    if name not in packages:
+                        raise click.ClickException(
+                            f"'{shim}' requires '{name}', which is missing from the lock.")
+                    packages[name].shims_.append(shim)
+
+    return PipShimLock(str(platform), file_sha256(constraints), shims, packages)
+
+
+def load_fresh_lock(platform: Platform, lock_dir: Path = LOCK_DIR,
+                    constraints: Path = CONSTRAINT_FILE,
+                    requirements: Path = SHIM_REQUIREMENTS_FILE) -> Optional[PipShimLock]:
+    """Return the platform lock if it exists and has not drifted from the constraints."""
+    lock_path = get_lock_path(platform, lock_dir)
+    if not lock_path.exists():
+        return None
+    lock = PipShimLock.load(lock_path)
+    # An unchanged constraints file cannot have drifted, skip comparing the pins
+    if lock.constraints_sha256_ == file_sha256(constraints):
+        return lock
+    problems = lock.check_drift(read_constraint_pins(constraints),
+                                read_shim_requirements(requirements))
+    for problem in problems:
+        click.echo(f"Warning: {lock_path}: {problem}", err=True)
+    return None if problems else lock
@@ -0,0 +1,168 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Batch installation of pip shim packages through a shared local wheelhouse."""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+from pathlib import Path
+import subprocess
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import click
+
+from isaac_ros_cli.commands.activate.venv import VENV_PATH as ISAAC_ROS_VENV_PATH
+from isaac_ros_cli.commands.init import ISAAC_ROS_GROUP_NAME
+from isaac_ros_cli.config_loader import load_environment_mode
+
+CONSTRAINT_FILE = Path("/usr/share/isaac-ros-cli/pip_shim_constraints.txt")
+WHEELHOUSE_PATH = Path("/var/lib/isaac-ros-cli/wheelhouse")
+
+DEFAULT_DOWNLOAD_JOBS = 8
+
+
+class PipShimEnvironment:
+    """The pip command and arguments to use for the configured environment mode."""
+
+    def __init__(self, mode: str, pip_command: List[str], install_args: List[str]):
+        self.mode_ = mode
+        self.pip_command_ = pip_command
+        self.install_args_ = install_args
+
+    @classmethod
+    def from_environment_mode(cls, mode: str) -> 'PipShimEnvironment':
+        """Mirror the environment handling of install-pip-shim."""
+        match mode:
+            case 'uninitialized':
+                raise click.ClickException(
+                    "Isaac ROS environment configuration is not set! Please install "
+                    "'isaac-ros-cli' and run 'sudo isaac-ros init <environment>' first.")
+            case 'docker':
+                raise click.ClickException(
+                    "Isaac ROS environment configuration is set to Docker, but this "
+                    "installation appears to be running on the host.")
+            case 'venv':
+                click.echo(f"Using Isaac ROS virtual environment at {ISAAC_ROS_VENV_PATH} "
+                           f"(ISAAC_ROS_ENVIRONMENT={mode})")
+                os.umask(0o002)
+                return cls(mode, [
+                    "runuser", "--group", ISAAC_ROS_GROUP_NAME, "-u", "root", "--",
+                    str(ISAAC_ROS_VENV_PATH / "bin" / "pip3"),
+                ], [])
+            case 'docker-activated' | 'baremetal':
+                click.echo(f"Using system pip3 (ISAAC_ROS_ENVIRONMENT={mode})")
+                # Allow pip install in system environments
+                return cls(mode, ["pip3"], ["--break-system-packages", "--ignore-installed"])
+            case _:
+                raise click.ClickException(
+                    f"Invalid Isaac ROS environment configuration: {mode}")
+
+    def pip(self, *args: str) -> List[str]:
+        return [*self.pip_command_, *args]
+
+
+def resolve_shims(env: PipShimEnvironment, specs: List[str]) -> List[Dict]:
+    """Resolve all specs together and return the pip installation report items."""
+    cmd = env.pip(
+        "install", "--dry-run", "--quiet", "--report", "-",
+        *env.install_args_,
+        "--constraint", str(CONSTRAINT_FILE),
+        "--find-links", str(WHEELHOUSE_PATH),
+        *specs,
+    )
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        click.echo(result.stderr, err=True)
+        raise click.ClickException("Failed to resolve pip shim packages.")
+    return json.loads(result.stdout).get("install", [])
+
+
+def _get_archive_download(item: Dict) -> Optional[Tuple[str, str]]:
+    """Return the (url, filename) of a report item if it is a downloadable archive."""
+    download_info = item.get("download_info", {})
+    url = download_info.get("url", "")
+    # Directories and VCS checkouts are not archives and are installed from the index
+    if "archive_info" not in download_info or not url:
+        return None
+
+    # Let pip verify the download against the hash from the resolver
+    hashes = download_info["archive_info"].get("hashes", {})
+    if "sha256" in hashes:
+        url = f"{url.partition('#')[0]}#sha256={hashes['sha256']}"
+    return url, unquote(os.path.basename(urlparse(url).path))
+
+
+def download_to_wheelhouse(env: PipShimEnvironment, items: List[Dict], jobs: int) -> bool:
+    """Download the resolved archives into the wheelhouse in parallel, skipping cached ones."""
+    downloads = []
+    for item in items:
+        archive = _get_archive_download(item)
+        if archive and not (WHEELHOUSE_PATH / archive[1]).exists():
+            downloads.append(archive)
+
+    click.echo(f"Downloading {len(downloads)} of {len(items)} packages into {WHEELHOUSE_PATH}")
+    if not downloads:
+        return True
+
+    def download(archive):
+        url, filename = archive
+        result = subprocess.run(
+            env.pip("download", "--quiet", "--no-deps", "--dest", str(WHEELHOUSE_PATH), url),
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            click.echo(f"Failed to download {filename}:\n{result.stderr}", err=True)
+        return result.returncode == 0
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return all(executor.map(download, downloads))
+
+
+def install_from_wheelhouse(env: PipShimEnvironment, specs: List[str], offline: bool) -> int:
+    """Install specs from the wheelhouse, falling back to the index unless offline."""
+    install_cmd = env.pip(
+        "install",
+        *env.install_args_,
+        "--constraint", str(CONSTRAINT_FILE),
+        "--find-links", str(WHEELHOUSE_PATH),
+    )
+    result = subprocess.run([*install_cmd, "--no-index", *specs])
+    if result.returncode != 0 and not offline:
+        click.echo("Offline installation from the wheelhouse failed, retrying with the index.")
+        result = subprocess.run([*install_cmd, *specs])
+    return result.returncode
+
+
+def install_shims(specs: List[str], jobs: int = DEFAULT_DOWNLOAD_JOBS,
+                  offline: bool = False) -> int:
+    """Install pip shim packages in one resolver pass through the shared wheelhouse.
+
+    Returns:
+        int: Exit code of the installation.
+    """
+    if not CONSTRAINT_FILE.exists():
+        raise click.ClickException(f"No constraint file found at {CONSTRAINT_FILE}!")
+
+    env = PipShimEnvironment.from_environment_mode(load_environment_mode())
+
+    WHEELHOUSE_PATH.mkdir(mode=0o2775, parents=True, exist_ok=True)
+
+    if not offline:
+        items = resolve_shims(env, specs)
+        if not download_to_wheelhouse(env, items, jobs):
+            click.echo("Some packages could not be downloaded, they will be installed from "
+                       "the index.", err=True)
+
+    click.echo(f"Installing {len(specs)} pip shim packages")
+    returncode = install_from_wheelhouse(env, specs, offline)
+    if returncode == 0:
+        click.echo(f"Successfully installed {' '.join(specs)}")
+    return returncode
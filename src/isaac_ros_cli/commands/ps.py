@@ -0,0 +1,39 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+import json
+
+import click
+
+from .activate.docker import _import_run_dev
+
+COLUMNS = [('NAME', 'name'), ('USER', 'user'), ('STATUS', 'status'), ('CPU %', 'cpu'),
+           ('MEMORY', 'memory'), ('WORKSPACE', 'workspace')]
+
+
+@click.command()
+@click.option('-a', '--all', 'include_stopped', is_flag=True,
+              help='Also list stopped dev containers.')
+@click.option('--json', 'as_json', is_flag=True, help='Print the dev containers as JSON.')
+def ps(include_stopped: bool, as_json: bool):
+    """List the dev containers of all users and workspaces with their resource usage."""
+    containers = _import_run_dev().list_dev_containers(include_stopped)
+    if as_json:
+        click.echo(json.dumps(containers, indent=2))
+        return
+    if not containers:
+        click.echo("No dev containers are running." if not include_stopped
+                   else "No dev containers found.")
+        return
+
+    rows = [[header for header, _ in COLUMNS]]
+    rows.extend([container.get(key) or '-' for _, key in COLUMNS] for container in containers)
+    widths = [max(len(row[i]) for row in rows) for i in range(len(COLUMNS) - 1)]
+    for row in rows:
+        click.echo('  '.join([value.ljust(width) for value, width in zip(row, widths)]
+                             + [row[-1]]))
@@ -0,0 +1,186 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+import json
+from pathlib import Path
+import sys
+
+import click
+
+from .generate import APT_LISTS_DIR, find_packages_files, update_rosdep_file
+from .index import INDEX_FILE, ROSDEP_FILE, resolve_definition, RosdepIndex, verify_index
+
+DEFAULT_OS_NAME = "ubuntu"
+DEFAULT_OS_VERSION = "noble"
+
+
+def _detect_os() -> tuple:
+    """Return the ID and codename of the running OS, defaulting to the Isaac ROS release."""
+    os_release = {}
+    try:
+        with open("/etc/os-release", "r") as f:
+            for line in f:
+                name, _, value = line.strip().partition("=")
+                os_release[name] = value.strip('"')
+    except OSError:
+        pass
+    return (os_release.get("ID", DEFAULT_OS_NAME),
+            os_release.get("VERSION_CODENAME", DEFAULT_OS_VERSION))
+
+
+def _index_file_options(command):
+    """Options locating the rosdep definitions and their index."""
+    options = [
+        click.option('--source', type=click.Path(dir_okay=False, path_type=Path),
+                     default=ROSDEP_FILE, show_default=True,
+                     help='Rosdep definitions the index is compiled from.'),
+        click.option('--index', 'index_path', type=click.Path(dir_okay=False, path_type=Path),
+                     default=INDEX_FILE, show_default=True, help='Compiled rosdep index.'),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def _load_index(index_path: Path) -> RosdepIndex:
+    try:
+        return RosdepIndex.load(index_path)
+    except (OSError, ValueError, KeyError) as e:
+        raise click.ClickException(
+            f"Could not load the rosdep index {index_path}: {e}. "
+            "Run 'isaac-ros rosdep compile' to create it.")
+
+
+@click.group()
+def rosdep():
+    """Look up the extra Isaac ROS rosdep definitions."""
+    pass
+
+
+@rosdep.command('compile')
+@_index_file_options
+def compile_index(source, index_path):
+    """Compile the rosdep definitions into a compact index."""
+    index = RosdepIndex.compile(source)
+    problems = verify_index(index, source)
+    if problems:
+        raise click.ClickException("The compiled index does not expand back to "
+                                   f"{source}: {problems[0]}")
+    index_path.write_text(index.dump())
+    click.echo(f"Indexed {len(index.keys_)} keys with {len(index.exceptions_)} exceptions "
+               f"in {index_path} ({source.stat().st_size} -> {index_path.stat().st_size} bytes)")
+
+
+@rosdep.command()
+@_index_file_options
+def verify(source, index_path):
+    """Check that the index expands back to exactly the rosdep definitions."""
+    problems = verify_index(_load_index(index_path), source)
+    for problem in problems:
+        click.echo(f"{index_path}: {problem}", err=True)
+    if problems:
+        sys.exit(1)
+    click.echo(f"{index_path} matches {source}")
+
+
+@rosdep.command()
+@click.argument('keys', nargs=-1, required=True)
+@click.option('--os', 'os_spec', metavar='OS:VERSION',
+              help='OS to resolve for, e.g. ubuntu:noble. Defaults to the running OS.')
+@click.option('--json', 'as_json', is_flag=True,
+              help='Print the full definition of each key as JSON.')
+@_index_file_options
+def resolve(keys, os_spec, as_json, source, index_path):
+    """Resolve rosdep keys to system packages from the index, without parsing the YAML.
+
+    The output follows 'rosdep resolve'. Exits with an error if any key is not defined.
+    """
+    index = _load_index(index_path)
+    if source.exists() and not index.is_fresh(source):
+        raise click.ClickException(f"The rosdep index {index_path} is out of date with "
+                                   f"{source}. Run 'isaac-ros rosdep compile' to update it.")
+
+    if os_spec:
+        os_name, _, os_version = os_spec.partition(':')
+    else:
+        os_name, os_version = _detect_os()
+
+    definitions = {key: index.lookup(key) for key in keys}
+    failed = False
+    if as_json:
+        click.echo(json.dumps({key: definition for key, definition in definitions.items()
+                               if definition is not None}, indent=2))
+    for key, definition in definitions.items():
+        if definition is None:
+            click.echo(f"Error: No definition of [{key}]", err=True)
+            failed = True
+            continue
+        if as_json:
+            continue
+        resolved = resolve_definition(definition, os_name, os_version)
+        if resolved is None:
+            click.echo(f"Error: No definition of [{key}] for OS [{os_name}:{os_version}]",
+                       err=True)
+            failed = True
+            continue
+        installer, packages = resolved
+        click.echo(f"#ROSDEP[{key}]\n#{installer}\n{' '.join(packages)}")
+    if failed:
+        sys.exit(1)
+
+
+@rosdep.command()
+@click.argument('packages_paths', metavar='PACKAGES...', nargs=-1,
+                type=click.Path(exists=True, path_type=Path))
+@click.option('--ros-distro', default='jazzy', show_default=True,
+              help='ROS distribution whose ros-<distro>-* packages are added.')
+@click.option('--release', default=DEFAULT_OS_VERSION, show_default=True,
+              help='Ubuntu release the Packages files belong to.')
+@click.option('--prune', is_flag=True,
+              help='Remove the release from entries whose ROS packages are not in the Packages '
+                   'files.')
+@click.option('--drop-release', 'drop_releases', multiple=True,
+              help='Remove a release from every entry, e.g. the unused focal and jammy.')
+@click.option('--check', is_flag=True,
+              help='Only report the changes, exiting with an error if there are any.')
+@_index_file_options
+def generate(packages_paths, ros_distro, release, prune, drop_releases, check, source,
+             index_path):
+    """Add the ROS packages of apt Packages files to the rosdep definitions.
+
+    PACKAGES are apt Packages files, optionally compressed, or directories holding them, by
+    default the apt lists of this machine. Only new or changed entries are rewritten, and the
+    file is left untouched if nothing changed. The index is recompiled if it exists.
+    """
+    packages_files = find_packages_files(packages_paths or [APT_LISTS_DIR])
+    if not packages_files:
+        raise click.ClickException("No apt Packages files found")
+    try:
+        update, text = update_rosdep_file(source, packages_files, ros_distro, DEFAULT_OS_NAME,
+                                          release, prune, drop_releases)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    for label, keys in (('Added', update.added_), ('Updated', update.updated_),
+                        ('Removed', update.removed_)):
+        if keys:
+            names = sorted(keys)
+            more = f" and {len(names) - 10} more" if len(names) > 10 else ""
+            click.echo(f"{label} {len(names)}: {', '.join(names[:10])}{more}")
+    if not update.changed:
+        click.echo(f"{source} is up to date with {len(packages_files)} Packages files")
+        return
+    if check:
+        sys.exit(1)
+
+    source.write_text(text)
+    if index_path.exists():
+        index_path.write_text(RosdepIndex.compile(source).dump())
+        click.echo(f"Updated {source} and {index_path}")
+    else:
+        click.echo(f"Updated {source}")
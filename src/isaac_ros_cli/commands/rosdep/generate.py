@@ -0,0 +1,208 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Incremental update of extra_rosdeps.yaml from local apt package indexes.
+
+The package names of the ROS distribution are streamed from apt Packages files (as found in
+/var/lib/apt/lists), so no network access is needed. Entries are only rewritten when their
+definition changes and every other entry keeps its exact text, so an update that changes no
+package leaves the file, and the Docker layers built from it, untouched.
+"""
+
+import bz2
+import gzip
+import lzma
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from isaac_ros_cli.config_loader import _yaml_safe_load
+
+APT_LISTS_DIR = Path("/var/lib/apt/lists")
+
+_OPENERS = {'.gz': gzip.open, '.xz': lzma.open, '.lzma': lzma.open, '.bz2': bz2.open}
+
+
+def find_packages_files(paths: Iterable[Path]) -> List[Path]:
+    """Return the apt Packages files given directly or found in the given directories."""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(
+                child for child in path.iterdir()
+                if child.name.endswith('Packages') or (
+                    child.suffix in _OPENERS and child.stem.endswith('Packages'))))
+        else:
+            files.append(path)
+    return files
+
+
+def iter_package_names(path: Path) -> Iterator[str]:
+    """Yield the package names of an apt Packages file, reading it one line at a time."""
+    opener = _OPENERS.get(path.suffix, open)
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if line.startswith('Package:'):
+                yield line[len('Package:'):].strip()
+
+
+def get_rosdep_key(package: str, prefix: str) -> str:
+    """Return the rosdep key of a ROS package, e.g. foo_bar for ros-jazzy-foo-bar."""
+    return package[len(prefix):].replace('-', '_')
+
+
+def _split_entries(text: str, keys: List[str]) -> Tuple[str, Dict[str, str]]:
+    """Split the text of a rosdep file into its header and the exact text of each entry."""
+    lines = text.splitlines(keepends=True)
+    starts = [i for i, line in enumerate(lines) if line[:1] not in ('', ' ', '\t', '\n', '#')]
+    if len(starts) != len(keys):
+        raise ValueError(f"Found {len(starts)} top level lines for {len(keys)} keys")
+    ends = starts[1:] + [len(lines)]
+    entries = {key: ''.join(lines[start:end]) for key, start, end in zip(keys, starts, ends)}
+    return ''.join(lines[:starts[0]] if starts else lines), entries
+
+
+def _dump_entry(key: str, definition: Any) -> str:
+    # Imported on first use to keep CLI startup fast
+    import yaml
+
+    class NoAliasDumper(yaml.SafeDumper):
+        # Anchors are file-wide, so an entry written on its own must not define any
+        def ignore_aliases(self, data):
+            return True
+
+    # The same style the file was originally written in, with package lists in flow style
+    return yaml.dump({key: definition}, Dumper=NoAliasDumper, default_flow_style=None,
+                     sort_keys=False, width=100)
+
+
+class RosdepUpdate:
+    """Changes to a rosdep file, computed from the packages available on one release."""
+
+    def __init__(self, definitions: Dict[str, Any]):
+        self.definitions_ = definitions
+        self.added_: List[str] = []
+        self.updated_: List[str] = []
+        self.removed_: List[str] = []
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added_ or self.updated_ or self.removed_)
+
+    def _set(self, key: str, definition: Optional[Any]):
+        if definition is None:
+            del self.definitions_[key]
+            if key in self.added_:
+                self.added_.remove(key)
+                return
+            if key in self.updated_:
+                self.updated_.remove(key)
+            self.removed_.append(key)
+        elif key in self.definitions_:
+            self.definitions_[key] = definition
+            if key not in self.added_ and key not in self.updated_:
+                self.updated_.append(key)
+        else:
+            self.definitions_[key] = definition
+            if key in self.removed_:
+                self.removed_.remove(key)
+                self.updated_.append(key)
+            else:
+                self.added_.append(key)
+
+    def add_packages(self, packages: Set[str], prefix: str, os_name: str, release: str):
+        """Add the release to the entries of packages it does not resolve yet."""
+        resolved = set()
+        for definition in self.definitions_.values():
+            value = (definition.get(os_name) or {}).get(release)
+            if isinstance(value, list):
+                resolved.update(value)
+
+        for package in sorted(packages - resolved):
+            key = get_rosdep_key(package, prefix)
+            definition = self.definitions_.get(key) or {}
+            releases = definition.get(os_name) or {}
+            # An existing definition for the release is a deliberate exception, keep it
+            if release in releases:
+                continue
+            self._set(key, {**definition, os_name: {**releases, release: [package]}})
+
+    def prune_packages(self, packages: Set[str], prefix: str, os_name: str, release: str):
+        """Remove the release from entries resolving to ROS packages that no longer exist."""
+        for key, definition in list(self.definitions_.items()):
+            releases = definition.get(os_name) or {}
+            value = releases.get(release)
+            if not isinstance(value, list) or not value:
+                continue
+            if all(package.startswith(prefix) and package not in packages for package in value):
+                self._drop_release(key, os_name, release)
+
+    def drop_release(self, os_name: str, release: str):
+        """Remove a release from every entry."""
+        for key, definition in list(self.definitions_.items()):
+            if release in (definition.get(os_name) or {}):
+                self._drop_release(key, os_name, release)
+
+    def _drop_release(self, key: str, os_name: str, release: str):
+        definition = dict(self.definitions_[key])
+        releases = {name: value for name, value in definition[os_name].items()
+                    if name != release}
+        if releases:
+            definition[os_name] = releases
+        else:
+            del definition[os_name]
+        self._set(key, definition or None)
+
+    def render(self, original_text: str, original_keys: List[str]) -> str:
+        """Return the updated file, keeping the text and order of the unchanged entries.
+
+        New entries are placed before the first entry that sorts after them.
+        """
+        header, entries = _split_entries(original_text, original_keys)
+        changed = set(self.updated_)
+        removed = set(self.removed_)
+        output = [header]
+        added = sorted(self.added_)
+        for key in original_keys:
+            while added and added[0] < key:
+                new_key = added.pop(0)
+                output.append(_dump_entry(new_key, self.definitions_[new_key]))
+            if key in removed:
+                continue
+            if key in changed:
+                output.append(_dump_entry(key, self.definitions_[key]))
+            else:
+                output.append(entries[key])
+        output.extend(_dump_entry(key, self.definitions_[key]) for key in added)
+        return ''.join(output)
+
+
+def update_rosdep_file(source_path: Path, packages_files: List[Path], ros_distro: str,
+                       os_name: str, release: str, prune: bool = False,
+                       drop_releases: Iterable[str] = ()) -> Tuple[RosdepUpdate, str]:
+    """Compute the update of a rosdep file and return it with the updated text."""
+    original_text = source_path.read_text()
+    definitions = _yaml_safe_load(original_text) or {}
+    original_keys = list(definitions)
+
+    prefix = f"ros-{ros_distro}-"
+    packages = set()
+    for path in packages_files:
+        packages.update(name for name in iter_package_names(path) if name.startswith(prefix))
+
+    if prune and not packages:
+        raise ValueError(f"No {prefix}* packages found, refusing to prune every entry")
+
+    update = RosdepUpdate(definitions)
+    for dropped_release in drop_releases:
+        update.drop_release(os_name, dropped_release)
+    update.add_packages(packages, prefix, os_name, release)
+    if prune:
+        update.prune_packages(packages, prefix, os_name, release)
+    if not update.changed:
+        return update, original_text
+    return update, update.render(original_text, original_keys)
@@ -0,0 +1,143 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Compact index of the extra rosdep definitions.
+
+Nearly every key of extra_rosdeps.yaml maps to the ROS package of the same name, so the index
+stores each key with the name of the rule that generates its definition. Only the keys no rule
+generates keep their full definition, in a table of exceptions.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from isaac_ros_cli.config_loader import _yaml_safe_load
+
+ROSDEP_DIR = Path("/etc/isaac-ros-cli/docker/rosdep")
+ROSDEP_FILE = ROSDEP_DIR / "extra_rosdeps.yaml"
+INDEX_FILE = ROSDEP_DIR / "extra_rosdeps.index.json"
+
+INDEX_VERSION = 1
+
+# Templates of the definitions generated by each rule, tried in order. In the strings of a
+# template, {key} is replaced by the rosdep key and {name} by the key with '_' replaced by '-'.
+RULES: Dict[str, Any] = {
+    'ros': {'ubuntu': {'focal': ["ros-humble-{name}"], 'jammy': ["ros-humble-{name}"],
+                       'noble': ["ros-jazzy-{name}"]}},
+    'ros-jazzy': {'ubuntu': {'noble': ["ros-jazzy-{name}"]}},
+    'ros-humble': {'ubuntu': {'focal': ["ros-humble-{name}"], 'jammy': ["ros-humble-{name}"]}},
+    'apt': {'ubuntu': {'focal': ["{key}"], 'jammy': ["{key}"], 'noble': ["{key}"]}},
+    'apt-noble': {'ubuntu': {'noble': ["{key}"]}},
+}
+
+
+def expand_rule(template: Any, key: str) -> Any:
+    """Return the definition a rule template generates for a key."""
+    if isinstance(template, dict):
+        return {name: expand_rule(value, key) for name, value in template.items()}
+    if isinstance(template, list):
+        return [expand_rule(value, key) for value in template]
+    return template.replace("{key}", key).replace("{name}", key.replace("_", "-"))
+
+
+class RosdepIndex:
+    """Rosdep keys in their original order, each with its rule or an exception definition."""
+
+    def __init__(self, source_sha256: str, rules: Dict[str, Any],
+                 keys: Dict[str, Optional[str]], exceptions: Dict[str, Any]):
+        self.source_sha256_ = source_sha256
+        self.rules_ = rules
+        # Key to the name of its rule, or None for exceptions
+        self.keys_ = keys
+        self.exceptions_ = exceptions
+
+    @classmethod
+    def compile(cls, source_path: Path) -> 'RosdepIndex':
+        source = source_path.read_bytes()
+        definitions = _yaml_safe_load(source) or {}
+        keys: Dict[str, Optional[str]] = {}
+        exceptions = {}
+        for key, definition in definitions.items():
+            keys[key] = next((name for name, template in RULES.items()
+                              if expand_rule(template, key) == definition), None)
+            if keys[key] is None:
+                exceptions[key] = definition
+        used_rules = set(keys.values())
+        rules = {name: template for name, template in RULES.items() if name in used_rules}
+        return cls(hashlib.sha256(source).hexdigest(), rules, keys, exceptions)
+
+    @classmethod
+    def load(cls, path: Path) -> 'RosdepIndex':
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported rosdep index version {data.get('version')} in {path}")
+        return cls(data['source_sha256'], data['rules'], data['keys'], data['exceptions'])
+
+    def dump(self) -> str:
+        return json.dumps({
+            'version': INDEX_VERSION,
+            'source_sha256': self.source_sha256_,
+            'rules': self.rules_,
+            'keys': self.keys_,
+            'exceptions': self.exceptions_,
+        }, separators=(',', ':')) + "\n"
+
+    def is_fresh(self, source_path: Path) -> bool:
+        """Return whether the index was compiled from the current content of source_path."""
+        return hashlib.sha256(source_path.read_bytes()).hexdigest() == self.source_sha256_
+
+    def lookup(self, key: str) -> Optional[Any]:
+        """Return the definition of a key, or None if it is not defined."""
+        if key not in self.keys_:
+            return None
+        rule = self.keys_[key]
+        if rule is None:
+            return self.exceptions_[key]
+        return expand_rule(self.rules_[rule], key)
+
+    def expand(self) -> Dict[str, Any]:
+        """Return the full mapping the index was compiled from."""
+        return {key: self.lookup(key) for key in self.keys_}
+
+
+def verify_index(index: RosdepIndex, source_path: Path) -> List[str]:
+    """Return the differences between the expanded index and the source file, if any."""
+    definitions = _yaml_safe_load(source_path.read_bytes()) or {}
+    expanded = index.expand()
+    problems = []
+    if not index.is_fresh(source_path):
+        problems.append(f"the index was compiled from a different version of {source_path}")
+    for key in definitions.keys() - expanded.keys():
+        problems.append(f"{key}: missing from the index")
+    for key in expanded.keys() - definitions.keys():
+        problems.append(f"{key}: not defined in {source_path}")
+    for key, definition in definitions.items():
+        if key in expanded and expanded[key] != definition:
+            problems.append(f"{key}: expands to {expanded[key]}, expected {definition}")
+    if not problems and list(expanded) != list(definitions):
+        problems.append("keys are not in the order of the source file")
+    return sorted(problems)
+
+
+def resolve_definition(definition: Any, os_name: str,
+                       os_version: str) -> Optional[Tuple[str, List[str]]]:
+    """Return the installer and packages of a definition on an OS release, like rosdep."""
+    definition = (definition or {}).get(os_name)
+    if isinstance(definition, dict):
+        definition = definition.get(os_version, definition.get('*'))
+    if definition is None:
+        return None
+    if isinstance(definition, dict):
+        installer, options = next(iter(definition.items()))
+        return installer, list(options.get('packages', []))
+    if isinstance(definition, str):
+        return 'apt', definition.split()
+    return 'apt', list(definition)
@@ -0,0 +1,96 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+import json
+import os
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import click
+
+from isaac_ros_cli import daemon_client
+from isaac_ros_cli.config_loader import load_config, load_environment_mode
+from isaac_ros_cli.platform import detect_platform
+
+
+def get_status(get_run_dev: Callable,
+               inspect_dev_container: Optional[Callable] = None,
+               environ: Mapping[str, str] = os.environ) -> Dict[str, Any]:
+    """Return the environment mode, platform and, in Docker mode, the dev container state.
+
+    run_dev is only loaded through get_run_dev in Docker mode. Containers are inspected with
+    inspect_dev_container, defaulting to run_dev's docker CLI based one. The dev container is
+    the one of the workspace set in environ.
+    """
+    mode = load_environment_mode()
+    platform = detect_platform()
+    status: Dict[str, Any] = {'environment_mode': mode, 'platform': str(platform)}
+    if mode != 'docker':
+        return status
+
+    from .activate.docker import _build_run_dev_args
+
+    run_dev = get_run_dev()
+    inspect_dev_container = inspect_dev_container or run_dev.inspect_dev_container
+    try:
+        args = run_dev.parse_args(_build_run_dev_args(
+            load_config(), False, False, False, False, False, False, platform, environ))
+    except ValueError:
+        # Without a workspace there is no dev container to look up
+        status['container'] = {'name': None, 'state': 'missing'}
+        return status
+    container, image_id = inspect_dev_container(args.container_name, args.cached_image_name)
+    container_status: Dict[str, Any] = {'name': args.container_name, 'state': 'missing'}
+    if container:
+        labels = (container.get('Config') or {}).get('Labels') or {}
+        container_image_id = labels.get(run_dev.CONTAINER_LABEL_IMAGE_ID) or container.get('Image')
+        container_status.update({
+            'state': container['State'].get('Status'),
+            'workspace': run_dev.get_container_workspace(container),
+            'outdated_image': bool(image_id and container_image_id
+                                   and container_image_id != image_id),
+        })
+    status['container'] = container_status
+    return status
+
+
+@click.command()
+@click.option('--json', 'as_json', is_flag=True, help='Print the status as JSON.')
+@click.option('--timings', is_flag=True,
+              help='Show how long each step of the running container\'s entrypoint took.')
+def status(as_json: bool, timings: bool):
+    """Show the state of the Isaac ROS environment."""
+    result = daemon_client.request('status', daemon_client.get_client_context())
+    if result is None:
+        from .activate.docker import _import_run_dev
+
+        result = get_status(_import_run_dev)
+        result['daemon'] = None
+
+    container = result.get('container')
+    if timings and container and container['state'] == 'running':
+        from .activate.docker import _import_run_dev
+
+        container['entrypoint_timings'] = \
+            _import_run_dev().get_entrypoint_profile(container['name'])
+
+    if as_json:
+        click.echo(json.dumps(result, indent=2))
+        return
+
+    click.echo(f"Environment mode: {result['environment_mode']}")
+    click.echo(f"Platform: {result['platform']}")
+    container = result.get('container')
+    if container and not container['name']:
+        click.echo("Container: none, ISAAC_ROS_WS is not set")
+    elif container:
+        outdated = ", outdated image" if container.get('outdated_image') else ""
+        click.echo(f"Container: {container['name']} ({container['state']}{outdated})")
+        for step in container.get('entrypoint_timings') or []:
+            click.echo(f"  {step['start']:6.2f}s  {step['duration']:6.2f}s  {step['step']}")
+    daemon = result['daemon']
+    click.echo(f"Daemon: running (pid {daemon['pid']})" if daemon else "Daemon: not running")
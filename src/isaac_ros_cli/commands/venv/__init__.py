@@ -0,0 +1,62 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+import os
+from pathlib import Path
+import time
+
+import click
+
+from isaac_ros_cli.commands.activate.venv import VENV_PATH
+from .snapshot import create_snapshot, restore_snapshot
+
+DEFAULT_JOBS = os.cpu_count() or 1
+
+
+@click.group()
+def venv():
+    """Manage the Isaac ROS virtual environment."""
+    pass
+
+
+@venv.command('snapshot')
+@click.argument('output', type=click.Path(dir_okay=False, path_type=Path))
+@click.option('--venv-path', type=click.Path(exists=True, file_okay=False, path_type=Path),
+              default=VENV_PATH, show_default=True, help='Virtual environment to snapshot.')
+@click.option('--jobs', type=click.IntRange(min=1), default=DEFAULT_JOBS, show_default=True,
+              help='Number of shards compressed in parallel.')
+def snapshot_command(output, venv_path, jobs):
+    """Write a compressed, relocatable snapshot of the virtual environment to OUTPUT.
+
+    The snapshot records the installed distributions and the pip shim constraints it was
+    populated with, and can be restored on other machines of the same platform.
+    """
+    start = time.monotonic()
+    manifest = create_snapshot(venv_path.absolute(), output, jobs)
+    click.echo(f"Wrote snapshot of {len(manifest['distributions'])} distributions to {output} "
+               f"({output.stat().st_size // (1024 * 1024)} MB) in "
+               f"{time.monotonic() - start:.1f}s")
+
+
+@venv.command()
+@click.argument('archive', type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option('--venv-path', type=click.Path(file_okay=False, path_type=Path),
+              default=VENV_PATH, show_default=True, help='Virtual environment to replace.')
+@click.option('--jobs', type=click.IntRange(min=1), default=DEFAULT_JOBS, show_default=True,
+              help='Number of shards decompressed in parallel.')
+@click.option('--force', is_flag=True,
+              help='Restore even if the snapshot was taken with another Python or platform.')
+def restore(archive, venv_path, jobs, force):
+    """Replace the virtual environment with the snapshot ARCHIVE.
+
+    Requires write access to the virtual environment, usually through sudo.
+    """
+    start = time.monotonic()
+    manifest = restore_snapshot(archive, venv_path.absolute(), jobs, force=force)
+    click.echo(f"Restored {len(manifest['distributions'])} distributions into {venv_path} in "
+               f"{time.monotonic() - start:.1f}s")
@@ -0,0 +1,341 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Snapshots of the populated Isaac ROS virtual environment for fast provisioning.
+
+A snapshot is an uncompressed tar holding a ``manifest.json`` and the venv split into several
+independently compressed shards of similar size, so that restoring decompresses all shards in
+parallel. Files with identical contents are stored once and linked back together on restore.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.parser import HeaderParser
+import grp
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import stat
+import subprocess
+import sys
+import tarfile
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+from isaac_ros_cli.commands.init import ISAAC_ROS_GROUP_NAME
+from isaac_ros_cli.commands.pip.lock import file_sha256, normalize_name
+from isaac_ros_cli.commands.pip.shims import CONSTRAINT_FILE
+from isaac_ros_cli.platform import detect_platform
+
+# Bump when the layout of snapshots changes
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# Identical files smaller than this are not worth linking
+LINK_MIN_SIZE = 4096
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _get_compression() -> Tuple[str, str]:
+    """Return the (compress program, shard suffix), preferring zstd when available."""
+    if shutil.which("zstd"):
+        return "zstd", ".tar.zst"
+    return "gzip", ".tar.gz"
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_COPY_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_installed_distributions(venv_path: Path) -> List[Dict[str, str]]:
+    """Return the name and version of every distribution installed inside the venv."""
+    distributions = []
+    for metadata_path in venv_path.glob("lib/python3*/site-packages/*.dist-info/METADATA"):
+        with metadata_path.open("r", encoding="utf-8", errors="replace") as f:
+            headers = HeaderParser().parse(f)
+        distributions.append({"name": headers["Name"], "version": headers["Version"]})
+    return sorted(distributions, key=lambda dist: normalize_name(dist["name"] or ""))
+
+
+def _scan_venv(venv_path: Path) -> Tuple[List[str], Dict[str, int]]:
+    """Return the directories and the (non-directory) entries of the venv with their sizes."""
+    directories = ["."]
+    entries = {}
+    for root, dirnames, filenames in os.walk(venv_path):
+        relroot = Path(root).relative_to(venv_path)
+        for dirname in list(dirnames):
+            # Symlinked directories (lib64) are stored as links and not descended into
+            if os.path.islink(os.path.join(root, dirname)):
+                dirnames.remove(dirname)
+                filenames.append(dirname)
+            else:
+                directories.append(str(relroot / dirname))
+        for filename in filenames:
+            entries[str(relroot / filename)] = os.lstat(os.path.join(root, filename)).st_size
+    return directories, entries
+
+
+def _find_duplicates(venv_path: Path, entries: Dict[str, int]) -> Dict[str, str]:
+    """Return a mapping of duplicate regular files to the first file with the same contents."""
+    by_size: Dict[int, List[str]] = {}
+    for relpath, size in entries.items():
+        if size >= LINK_MIN_SIZE and stat.S_ISREG(os.lstat(venv_path / relpath).st_mode):
+            by_size.setdefault(size, []).append(relpath)
+
+    links = {}
+    for relpaths in by_size.values():
+        if len(relpaths) < 2:
+            continue
+        # Only files sharing a size can be identical, so only those are hashed
+        originals: Dict[str, str] = {}
+        for relpath in sorted(relpaths):
+            digest = _hash_file(venv_path / relpath)
+            if digest in originals:
+                links[relpath] = originals[digest]
+            else:
+                originals[digest] = relpath
+    return links
+
+
+def _assign_shards(entries: Dict[str, int], count: int) -> List[List[str]]:
+    """Split entries into count shards of similar total size, largest entries first."""
+    shards: List[List[str]] = [[] for _ in range(max(1, min(count, len(entries))))]
+    sizes = [0] * len(shards)
+    for relpath, size in sorted(entries.items(), key=lambda entry: (-entry[1], entry[0])):
+        index = sizes.index(min(sizes))
+        shards[index].append(relpath)
+        sizes[index] += size
+    return shards
+
+
+def _create_shard(venv_path: Path, relpaths: List[str], shard_path: Path,
+                  compress_program: str) -> None:
+    result = subprocess.run(
+        ["tar", "--create", "--file", str(shard_path), "--directory", str(venv_path),
+         "--no-recursion", "--null", "--files-from", "-",
+         "--use-compress-program", compress_program],
+        input="\0".join(relpaths).encode(),
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise click.ClickException(
+            f"Failed to create {shard_path.name}: {result.stderr.decode().strip()}")
+
+
+def create_snapshot(venv_path: Path, output: Path, jobs: int) -> Dict:
+    """Write a snapshot of the venv to output and return its manifest."""
+    if not (venv_path / "pyvenv.cfg").exists():
+        raise click.ClickException(f"No virtual environment found at {venv_path}")
+
+    compress_program, shard_suffix = _get_compression()
+    directories, entries = _scan_venv(venv_path)
+    links = _find_duplicates(venv_path, entries)
+    stored = {relpath: size for relpath, size in entries.items() if relpath not in links}
+    shards = _assign_shards(stored, jobs)
+    # Directories go first so their permissions are restored along with the first shard
+    shards[0][:0] = directories
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "venv_path": str(venv_path),
+        "python_version": f"{sys.version_info.major}.{sys.version_info.minor}",
+        "platform": str(detect_platform()),
+        "constraints_sha256": file_sha256(CONSTRAINT_FILE) if CONSTRAINT_FILE.exists() else None,
+        "compression": compress_program,
+        "size": sum(entries.values()),
+        "distributions": get_installed_distributions(venv_path),
+        "shards": [f"shard-{index:03d}{shard_suffix}" for index in range(len(shards))],
+        "links": links,
+    }
+
+    click.echo(f"Compressing {len(entries)} files ({manifest['size'] // (1024 * 1024)} MB) "
+               f"from {venv_path} into {len(shards)} shards")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=output.parent, prefix=f".{output.name}.") as tmpdir:
+        shard_dir = Path(tmpdir)
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for future in [executor.submit(_create_shard, venv_path, relpaths,
+                                           shard_dir / name, compress_program)
+                           for relpaths, name in zip(shards, manifest["shards"])]:
+                future.result()
+
+        (shard_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n")
+        tmp_output = shard_dir / output.name
+        with tarfile.open(tmp_output, "w") as archive:
+            for name in [MANIFEST_NAME, *manifest["shards"]]:
+                archive.add(shard_dir / name, arcname=name)
+        os.replace(tmp_output, output)
+    return manifest
+
+
+def read_manifest(archive_path: Path) -> Dict:
+    with tarfile.open(archive_path, "r:") as archive:
+        try:
+            manifest = json.load(archive.extractfile(MANIFEST_NAME))
+        except KeyError:
+            raise click.ClickException(f"{archive_path} is not an Isaac ROS venv snapshot")
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise click.ClickException(
+            f"Unsupported snapshot version {manifest.get('version')} in {archive_path}")
+    return manifest
+
+
+def _check_compatible(manifest: Dict, force: bool) -> None:
+    """Refuse snapshots taken with another Python or platform, unless forced."""
+    problems = []
+    python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+    if manifest["python_version"] != python_version:
+        problems.append(f"it was taken with Python {manifest['python_version']}, "
+                        f"this system has Python {python_version}")
+    platform = str(detect_platform())
+    if manifest["platform"] != platform:
+        problems.append(f"it was taken on {manifest['platform']}, this system is {platform}")
+    for problem in problems:
+        click.echo(f"{'Warning' if force else 'Error'}: Snapshot is incompatible: {problem}",
+                   err=True)
+    if problems and not force:
+        raise click.ClickException("Use --force to restore anyway.")
+
+    if (CONSTRAINT_FILE.exists() and manifest.get("constraints_sha256")
+            and manifest["constraints_sha256"] != file_sha256(CONSTRAINT_FILE)):
+        click.echo("Warning: Snapshot was taken with different pip shim constraints than "
+                   f"{CONSTRAINT_FILE}", err=True)
+
+
+def _extract_shard(archive_path: Path, member: tarfile.TarInfo, target: Path,
+                   compress_program: str) -> None:
+    """Stream one shard out of the snapshot into its own decompressing tar process."""
+    # tar's errors go to a file, a pipe nobody reads while stdin is written could fill and block
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(
+            ["tar", "--extract", "--file", "-", "--directory", str(target),
+             "--use-compress-program", compress_program],
+            stdin=subprocess.PIPE,
+            stderr=stderr_file,
+        )
+        with archive_path.open("rb") as f:
+            f.seek(member.offset_data)
+            remaining = member.size
+            try:
+                while remaining:
+                    chunk = f.read(min(_COPY_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    process.stdin.write(chunk)
+                    remaining -= len(chunk)
+                process.stdin.close()
+            except BrokenPipeError:
+                # tar exited early, its stderr says why
+                pass
+        returncode = process.wait()
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode(errors="replace").strip()
+    if returncode != 0 or remaining:
+        raise click.ClickException(f"Failed to extract {member.name}: {stderr or 'truncated'}")
+
+
+def _link_or_copy(source: Path, destination: Path) -> None:
+    """Hardlink destination to source, falling back to a reflink (or plain) copy."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        subprocess.run(["cp", "--reflink=auto", "--preserve=all", str(source),
+                        str(destination)], check=True)
+
+
+def _relocate(root: Path, old_path: str, new_path: str) -> None:
+    """Rewrite the venv path baked into the scripts and pyvenv.cfg under root."""
+    old, new = old_path.encode(), new_path.encode()
+    for path in [root / "pyvenv.cfg", *(root / "bin").iterdir()]:
+        if path.is_symlink() or not path.is_file():
+            continue
+        content = path.read_bytes()
+        # Leave binaries alone
+        if old in content and b"\0" not in content[:1024]:
+            path.write_bytes(content.replace(old, new))
+
+
+def _apply_group_permissions(venv_path: Path, gid: int) -> None:
+    """Match the ownership postinst sets up: group-writable, with setgid directories."""
+    uid = 0 if os.geteuid() == 0 else -1
+    for root, dirnames, filenames in os.walk(venv_path):
+        os.chown(root, uid, gid)
+        os.chmod(root, stat.S_IMODE(os.stat(root).st_mode) | stat.S_IRWXG | stat.S_ISGID)
+        for name in dirnames + filenames:
+            path = os.path.join(root, name)
+            path_stat = os.lstat(path)
+            os.chown(path, uid, gid, follow_symlinks=False)
+            if stat.S_ISREG(path_stat.st_mode):
+                mode = stat.S_IMODE(path_stat.st_mode) | stat.S_IRGRP | stat.S_IWGRP
+                if mode & (stat.S_IXUSR | stat.S_IXOTH):
+                    mode |= stat.S_IXGRP
+                os.chmod(path, mode)
+
+
+def restore_snapshot(archive_path: Path, venv_path: Path, jobs: int,
+                     force: bool = False) -> Dict:
+    """Replace the venv with the contents of a snapshot and return its manifest."""
+    manifest = read_manifest(archive_path)
+    _check_compatible(manifest, force)
+
+    try:
+        gid = grp.getgrnam(ISAAC_ROS_GROUP_NAME).gr_gid
+    except KeyError:
+        raise click.ClickException(
+            f"Group '{ISAAC_ROS_GROUP_NAME}' not found. Please reinstall the isaac-ros-cli "
+            "package.")
+
+    if not shutil.which(manifest["compression"]):
+        raise click.ClickException(
+            f"'{manifest['compression']}' is required to restore {archive_path}")
+
+    with tarfile.open(archive_path, "r:") as archive:
+        members = [archive.getmember(name) for name in manifest["shards"]]
+
+    venv_path.parent.mkdir(parents=True, exist_ok=True)
+    # Extract next to the venv so it can be swapped in with a rename
+    staging = Path(tempfile.mkdtemp(dir=venv_path.parent, prefix=f".{venv_path.name}.restore-"))
+    try:
+        click.echo(f"Extracting {len(members)} shards into {venv_path}")
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for future in [executor.submit(_extract_shard, archive_path, member, staging,
+                                           manifest["compression"])
+                           for member in members]:
+                future.result()
+
+        for relpath, original in manifest["links"].items():
+            _link_or_copy(staging / original, staging / relpath)
+
+        if manifest["venv_path"] != str(venv_path):
+            _relocate(staging, manifest["venv_path"], str(venv_path))
+
+        _apply_group_permissions(staging, gid)
+
+        previous: Optional[Path] = None
+        if venv_path.exists():
+            previous = Path(tempfile.mkdtemp(dir=venv_path.parent,
+                                             prefix=f".{venv_path.name}.previous-"))
+            os.rename(venv_path, previous / venv_path.name)
+        os.rename(staging, venv_path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if previous is not None:
+        shutil.rmtree(previous, ignore_errors=True)
+    return manifest
@@ -6,15 +6,23 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
+import contextlib
+import copy
 from enum import Enum, auto
+import json
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Mapping
-
-import yaml
+import stat
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 
 ENVIRONMENT_MODE_CONFIG_PATH = Path("/etc/isaac-ros-cli/environment.conf")
 
+# Bump when the layout of the merged configuration cache changes
+_CONFIG_CACHE_VERSION = 1
+
+# Signature of a set of source files: (path, mtime_ns, size) for each existing source
+_SourceSignature = Tuple[Tuple[str, int, int], ...]
+
 
 class ConfigScope(Enum):
     # In order of precedence
@@ -24,67 +32,193 @@ class ConfigScope(Enum):
     WORKSPACE = auto()
 
 
-_CONFIG_SOURCE_CANDIDATES: Dict[ConfigScope, Path] = {
-    # Read-only default config, shipped with the package
-    ConfigScope.READ_ONLY: Path("/usr/share/isaac-ros-cli/config.yaml"),
+def _get_config_source_candidates() -> Dict[ConfigScope, Optional[Path]]:
+    """Return the configuration file candidates, resolved against the current environment."""
+    isaac_ros_ws = os.getenv("ISAAC_ROS_WS")
+    return {
+        # Read-only default config, shipped with the package
+        ConfigScope.READ_ONLY: Path("/usr/share/isaac-ros-cli/config.yaml"),
+
+        # System-level overrides, written to by the CLI
+        ConfigScope.SYSTEM: Path("/etc/isaac-ros-cli/config.yaml"),
+
+        # User-level overrides, written to by the user and mentioned in the documentation
+        ConfigScope.USER: Path.home() / ".config" / "isaac-ros-cli" / "config.yaml",
+
+        # Workspace-level overrides, for power users
+        ConfigScope.WORKSPACE: (
+            Path(isaac_ros_ws) / ".isaac-ros-cli" / "config.yaml"
+        ) if isaac_ros_ws else None,
+    }
+
+
+def _get_config_cache_path() -> Path:
+    """Return the per-user cache file for the merged configuration."""
+    cache_home = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "isaac-ros-cli" / "config-cache.json"
+
+
+# In-process memoization, keyed on the signature of the files they were read from
+_memoized_config: Optional[Tuple[_SourceSignature, Dict[str, Any]]] = None
+_memoized_environment_mode: Optional[Tuple[_SourceSignature, str]] = None
+
+
+def _source_signature(paths: List[Path]) -> _SourceSignature:
+    """Return the (path, mtime, size) signature of the given paths, skipping missing ones."""
+    signature = []
+    for path in paths:
+        try:
+            path_stat = path.stat()
+        except FileNotFoundError:
+            continue
+        signature.append((str(path), path_stat.st_mtime_ns, path_stat.st_size))
+    return tuple(signature)
+
+
+def _yaml_safe_load(stream) -> Any:
+    """Safe-load YAML, using the libyaml C loader when available."""
+    # Imported on first use to keep CLI startup fast
+    import yaml
+
+    return yaml.load(stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+@contextlib.contextmanager
+def _locked_directory(directory: Path) -> Iterator[None]:
+    """Hold an exclusive lock on a directory to serialize writers of the files inside it.
+
+    Readers never take this lock: writers replace files atomically, so a reader always sees
+    either the previous or the new contents.
+    """
+    import fcntl
 
-    # System-level overrides, written to by the CLI
-    ConfigScope.SYSTEM: Path("/etc/isaac-ros-cli/config.yaml"),
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
 
-    # User-level overrides, written to by the user and mentioned in the documentation
-    ConfigScope.USER: Path.home() / ".config" / "isaac-ros-cli" / "config.yaml",
 
-    # Workspace-level overrides, for power users
-    ConfigScope.WORKSPACE: (
-        Path(os.getenv("ISAAC_ROS_WS", "")) / ".isaac-ros-cli" / "config.yaml"
-    ) if os.getenv("ISAAC_ROS_WS") else None,
-}
+def _atomic_write_text(target: Path, content: str) -> None:
+    """Atomically replace target with content, keeping its permissions and ownership.
+
+    The content is written to a temporary file in the same directory, fsynced and renamed over
+    the target, so readers never observe a partially written file.
+    """
+    import tempfile
+
+    try:
+        original_stat = target.stat()
+    except FileNotFoundError:
+        original_stat = None
+
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if original_stat is not None:
+            os.chmod(tmp_path, stat.S_IMODE(original_stat.st_mode))
+            try:
+                os.chown(tmp_path, original_stat.st_uid, original_stat.st_gid)
+            except PermissionError:
+                # Only root can give the file away; ownership is already ours otherwise
+                pass
+        else:
+            # mkstemp creates files as 0600, match what open() would have created
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    # Persist the rename itself
+    dir_fd = os.open(target.parent, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
 
 
 def load_environment_mode() -> str:
     """Load the environment mode from the environment mode configuration file."""
-    if not ENVIRONMENT_MODE_CONFIG_PATH.exists():
+    global _memoized_environment_mode
+
+    signature = _source_signature([ENVIRONMENT_MODE_CONFIG_PATH])
+    if not signature:
         raise FileNotFoundError(
             f"Environment mode configuration file not found at {ENVIRONMENT_MODE_CONFIG_PATH}.")
+    if _memoized_environment_mode and _memoized_environment_mode[0] == signature:
+        return _memoized_environment_mode[1]
+
     with open(ENVIRONMENT_MODE_CONFIG_PATH, "r") as f:
         for line in f:
             key, _, value = line.strip().partition("=")
             if key == "ISAAC_ROS_ENVIRONMENT":
+                _memoized_environment_mode = (signature, value)
                 return value
     raise KeyError("ISAAC_ROS_ENVIRONMENT not found in environment mode configuration file.")
 
 
 def update_environment_mode(mode: str) -> None:
     """Update the environment mode in the environment mode configuration file."""
+    global _memoized_environment_mode
+
     if not ENVIRONMENT_MODE_CONFIG_PATH.exists():
         raise FileNotFoundError(
             f"Environment mode configuration file not found at {ENVIRONMENT_MODE_CONFIG_PATH}.")
-    with open(ENVIRONMENT_MODE_CONFIG_PATH, "w") as f:
-        f.write(f"ISAAC_ROS_ENVIRONMENT={mode}\n")
+    with _locked_directory(ENVIRONMENT_MODE_CONFIG_PATH.parent):
+        _atomic_write_text(ENVIRONMENT_MODE_CONFIG_PATH, f"ISAAC_ROS_ENVIRONMENT={mode}\n")
+    _memoized_environment_mode = None
 
 
 def load_config() -> Dict[str, Any]:
-    """Load the merged Isaac ROS CLI configuration."""
-    sources: List[Path] = []
-    for path in _CONFIG_SOURCE_CANDIDATES.values():
-        # Skip unavailable paths
-        if path is None:
-            continue
+    """Load the merged Isaac ROS CLI configuration.
 
-        if path.exists():
-            sources.append(path)
+    The merged result is memoized within the process and cached per user, keyed on the
+    (path, mtime, size) of every source, so YAML is only parsed when a source changes.
+    """
+    global _memoized_config
 
-    if not sources:
+    candidates = _get_config_source_candidates()
+    sources: List[Path] = [path for path in candidates.values() if path is not None]
+    signature = _source_signature(sources)
+
+    if not signature:
         raise FileNotFoundError(
             "No Isaac ROS CLI configuration files found. Tried: "
-            + ", ".join(str(path) for path in _CONFIG_SOURCE_CANDIDATES.values())
+            + ", ".join(str(path) for path in candidates.values())
         )
 
+    if _memoized_config and _memoized_config[0] == signature:
+        return copy.deepcopy(_memoized_config[1])
+
+    merged = _read_config_cache(signature)
+    if merged is None:
+        merged = _merge_config_sources([Path(path) for path, _, _ in signature])
+        _write_config_cache(signature, merged)
+
+    _memoized_config = (signature, merged)
+    return copy.deepcopy(merged)
+
+
+def _merge_config_sources(sources: List[Path]) -> Dict[str, Any]:
+    """Parse and deep merge the given configuration files in order of precedence."""
     merged: Dict[str, Any] = {}
     for path in sources:
 
         with path.open("r", encoding="utf-8") as f:
-            overlay = yaml.safe_load(f)
+            overlay = _yaml_safe_load(f)
 
         if not isinstance(overlay, Mapping):
             raise ValueError(
@@ -96,6 +230,41 @@ def load_config() -> Dict[str, Any]:
     return merged
 
 
+def _read_config_cache(signature: _SourceSignature) -> Optional[Dict[str, Any]]:
+    """Return the cached merged configuration if it was built from the same sources."""
+    try:
+        with _get_config_cache_path().open("r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cache, dict) or cache.get("version") != _CONFIG_CACHE_VERSION:
+        return None
+    if [tuple(source) for source in cache.get("sources", [])] != list(signature):
+        return None
+    config = cache.get("config")
+    return config if isinstance(config, dict) else None
+
+
+def _write_config_cache(signature: _SourceSignature, config: Dict[str, Any]) -> None:
+    """Store the merged configuration in the per-user cache, ignoring any failure."""
+    cache_path = _get_config_cache_path()
+    try:
+        payload = json.dumps({
+            "version": _CONFIG_CACHE_VERSION,
+            "sources": signature,
+            "config": config,
+        })
+        # Skip configs JSON would not round-trip exactly (e.g. non-string keys)
+        if json.loads(payload)["config"] != config:
+            return
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write_text(cache_path, payload)
+    except (OSError, TypeError, ValueError):
+        # Configs with values JSON cannot represent, or an unwritable cache, are not cached
+        pass
+
+
 def update_config(overlay: Dict[str, Any], scope: ConfigScope) -> Path:
     """Update requested scope configuration with the given overlay.
 
@@ -111,31 +280,33 @@ def update_config(overlay: Dict[str, Any], scope: ConfigScope) -> Path:
     target
         Path to the updated configuration file.
     """
+    global _memoized_config
 
     if scope == ConfigScope.READ_ONLY:
         raise ValueError("Cannot write to read-only config.")
 
-    target = _CONFIG_SOURCE_CANDIDATES[scope]
-    target.parent.mkdir(parents=True, exist_ok=True)
+    import yaml
 
-    # Load the existing configuration if it exists
-    config = {}
-    original_permissions = None
-    if target.exists():
-        original_permissions = target.stat().st_mode
-        with target.open("r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+    target = _get_config_source_candidates()[scope]
+    if target is None:
+        raise ValueError(f"No configuration file available for scope {scope.name}.")
+    target.parent.mkdir(parents=True, exist_ok=True)
 
-    # Merge the overlay with the existing configuration
-    config = _deep_merge(config, overlay)
+    # Hold the lock across read-modify-write so concurrent updates are not lost
+    with _locked_directory(target.parent):
+        # Load the existing configuration if it exists
+        config = {}
+        if target.exists():
+            with target.open("r", encoding="utf-8") as f:
+                config = _yaml_safe_load(f) or {}
 
-    # Write the updated configuration to the target
-    with target.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(config, f, sort_keys=False)
+        # Merge the overlay with the existing configuration
+        config = _deep_merge(config, overlay)
 
-    if original_permissions is not None:
-        target.chmod(original_permissions)
+        # Atomically replace the target, keeping its permissions
+        _atomic_write_text(target, yaml.safe_dump(config, sort_keys=False))
 
+    _memoized_config = None
     return target
 
 
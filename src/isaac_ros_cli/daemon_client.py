@@ -0,0 +1,92 @@
+# Copyright (c) 2026, NVIDIA CORPORATION. All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto. Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+
+"""Client of the optional per-user 'isaac-ros daemon'.
+
+Requests are single JSON lines over a unix socket. Any failure to reach the daemon returns None,
+so callers fall back to doing the work in-process.
+"""
+
+import json
+import os
+from pathlib import Path
+import socket
+import stat
+import struct
+from typing import Any, Dict, Optional
+
+# Bump when requests or responses change incompatibly
+PROTOCOL_VERSION = 2
+
+DEFAULT_TIMEOUT_SECONDS = 10
+
+# Set to disable forwarding to a running daemon
+NO_DAEMON_ENV_VAR = "ISAAC_ROS_NO_DAEMON"
+
+
+def get_socket_path() -> Path:
+    """Return the per-user socket of the daemon."""
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "isaac-ros-cli" / "daemon.sock"
+    return Path("/tmp") / f"isaac-ros-cli-{os.getuid()}" / "daemon.sock"
+
+
+def check_socket_dir(socket_dir: Path) -> None:
+    """Raise PermissionError unless socket_dir is a directory of this user that only it can use.
+
+    The /tmp fallback has a predictable name, another user creating it first could otherwise
+    answer the requests, and activate and exec run the commands the daemon answers with.
+    """
+    info = os.lstat(socket_dir)
+    if (not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid()
+            or stat.S_IMODE(info.st_mode) != 0o700):
+        raise PermissionError(f"{socket_dir} must be a directory owned by uid {os.getuid()} with "
+                              "mode 0700")
+
+
+def get_peer_uid(sock: socket.socket) -> int:
+    """Return the uid of the process at the other end of a unix socket."""
+    credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", credentials)
+    return uid
+
+
+def get_client_context() -> Dict[str, Any]:
+    """Return the working directory and environment a request is resolved in by the daemon."""
+    return {"cwd": os.getcwd(), "environ": dict(os.environ)}
+
+
+def request(method: str, params: Optional[Dict[str, Any]] = None,
+            timeout: float = DEFAULT_TIMEOUT_SECONDS) -> Optional[Any]:
+    """Send a request to the daemon and return its result, or None if it is not available."""
+    if os.getenv(NO_DAEMON_ENV_VAR):
+        return None
+    socket_path = get_socket_path()
+    # Skip the connection attempt entirely when no daemon was ever started
+    if not socket_path.exists():
+        return None
+
+    message = {"protocol": PROTOCOL_VERSION, "method": method, "params": params or {}}
+    try:
+        check_socket_dir(socket_path.parent)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            # Only a daemon of this user is trusted
+            if get_peer_uid(sock) != os.getuid():
+                return None
+            sock.sendall(json.dumps(message).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                response = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(response, dict) or "error" in response:
+        return None
+    return response.get("result")